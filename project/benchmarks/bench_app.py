@@ -0,0 +1,67 @@
+"""Cold-start and rerun timing for each dashboard page.
+
+Each page is measured in a fresh interpreter so import costs are attributed
+to the page that pays them.
+
+    python -m benchmarks.bench_app
+"""
+import json
+import os
+import subprocess
+import sys
+from typing import Dict
+
+from views import PAGES
+
+# Modules the app itself may pull in (streamlit already imports plotly.graph_objects)
+HEAVY_MODULES = ('folium', 'plotly.express', 'pandas')
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+start = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.query_params['page'] = {slug!r}
+at.run()
+cold = time.perf_counter() - start
+
+reruns = []
+for _ in range({reruns}):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+
+print(json.dumps({{
+    'cold_start_ms': cold * 1000,
+    'rerun_ms': sum(reruns) / len(reruns) * 1000,
+    'errors': len(at.exception),
+    'heavy_imports': [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def measure_page(slug: str, reruns: int = 5) -> Dict[str, float]:
+    """Measure one page in a subprocess"""
+    code = _PROBE.format(app=APP_PATH, slug=slug, reruns=reruns, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(APP_PATH)
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(reruns: int = 5) -> Dict[str, Dict[str, float]]:
+    return {slug: measure_page(slug, reruns) for slug in PAGES}
+
+
+if __name__ == '__main__':
+    print(f"{'page':>10} {'cold start':>11} {'rerun':>9} {'errors':>7}  heavy imports")
+    for slug, result in run().items():
+        print(
+            f"{slug:>10} {result['cold_start_ms']:>9.0f}ms {result['rerun_ms']:>7.1f}ms "
+            f"{result['errors']:>7}  {', '.join(result['heavy_imports']) or '-'}"
+        )
@@ -0,0 +1,75 @@
+"""Micro-benchmark for analyze_trend against analyze_trend_async.
+
+Times single analyses and a burst of concurrent ones, first as the engine is
+today (every stage CPU-bound) and then with a fixed delay added to retrieval
+and the cultural-context lookup to model disk- or network-backed stores.
+
+    python -m benchmarks.bench_async
+"""
+import asyncio
+import time
+from typing import Callable, Dict
+
+from src.mock_data import MockDataGenerator
+from src.rag_engine import RAGEngine
+
+QUERIES = ["Analyze the cultural impact of #AIethics", "ClimateAction policy backlash",
+           "Why is #TechDebate trending", "viral meme around CryptoFuture"]
+
+# Concurrent analyses per burst
+BURST = 8
+
+# Modeled I/O latency per retrieval and context lookup, in milliseconds
+IO_DELAYS_MS = (0, 20)
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _with_delay(fn: Callable, seconds: float) -> Callable:
+    def delayed(*args):
+        time.sleep(seconds)
+        return fn(*args)
+    return delayed
+
+
+def run(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Sync vs async, one query and a burst, at each modeled I/O delay"""
+    results = {}
+    for delay_ms in IO_DELAYS_MS:
+        engine = RAGEngine(MockDataGenerator())
+        engine._retrieve = _with_delay(engine._retrieve, delay_ms / 1000)
+        engine._get_cultural_context = _with_delay(engine._get_cultural_context, delay_ms / 1000)
+        engine.analyze_trend(QUERIES[0])
+        burst = [QUERIES[i % len(QUERIES)] for i in range(BURST)]
+        
+        async def concurrent():
+            await asyncio.gather(*(engine.analyze_trend_async(query) for query in burst))
+        
+        results[f"{delay_ms}ms io"] = {
+            'sync_ms': _best_of(lambda: engine.analyze_trend(QUERIES[0]), repeat),
+            'async_ms': _best_of(lambda: asyncio.run(engine.analyze_trend_async(QUERIES[0])), repeat),
+            'burst_sync_ms': _best_of(lambda: [engine.analyze_trend(query) for query in burst], repeat),
+            'burst_async_ms': _best_of(lambda: asyncio.run(concurrent()), repeat)
+        }
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    print(f"{'':>9} {'sync':>9} {'async':>9} {f'{BURST}x sync':>10} {f'{BURST}x async':>10}")
+    for label, timings in results.items():
+        print(
+            f"{label:>9} "
+            f"{timings['sync_ms']:>7.1f}ms "
+            f"{timings['async_ms']:>7.1f}ms "
+            f"{timings['burst_sync_ms']:>8.1f}ms "
+            f"{timings['burst_async_ms']:>8.1f}ms"
+        )
@@ -0,0 +1,57 @@
+"""Micro-benchmark for time to first token of streamed RAG answers.
+
+Answers one analysis per case with the stub backend (paced like a CPU
+llama.cpp model) and times the first token and the full answer: a cold
+prompt, a new question on a topic whose context is already prefilled in a
+slot, a new topic where only the system prompt is cached, and a reworded
+repeat that the semantic answer cache serves without generating.
+
+    python -m benchmarks.bench_generation
+"""
+import time
+from typing import Dict
+
+from src.generation import AnswerGenerator, StubBackend
+from src.mock_data import MockDataGenerator
+from src.rag_engine import RAGEngine
+
+CASES = {
+    'cold': "Analyze the cultural impact of #AIethics",
+    'warm topic': "Why is #AIethics trending",
+    'new topic': "ClimateAction policy backlash",
+    'near duplicate': "what is the cultural impact of AIethics?"
+}
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    """Analyze and answer each case in order on one engine, so later cases see earlier ones' caches"""
+    engine = RAGEngine(MockDataGenerator(), generator=AnswerGenerator(StubBackend()))
+    results = {}
+    for label, query in CASES.items():
+        analysis = engine.analyze_trend(query)
+        start = time.perf_counter()
+        for _ in engine.stream_answer(analysis):
+            pass
+        stats = analysis['generation']
+        results[label] = {
+            'ttft_ms': stats['ttft_seconds'] * 1000,
+            'answer_ms': (time.perf_counter() - start) * 1000,
+            'prompt_tokens': stats['prompt_tokens'],
+            'cached_tokens': stats['cached_tokens'],
+            'source': stats['source']
+        }
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    print(f"{'':>15} {'first token':>12} {'answer':>10} {'prompt':>7} {'cached':>7}  source")
+    for label, timings in results.items():
+        print(
+            f"{label:>15} "
+            f"{timings['ttft_ms']:>10.1f}ms "
+            f"{timings['answer_ms']:>8.0f}ms "
+            f"{timings['prompt_tokens']:>7} "
+            f"{timings['cached_tokens']:>7}  "
+            f"{timings['source']}"
+        )
@@ -0,0 +1,48 @@
+"""Spatial binning of geotagged posts: index build and per-zoom rollups.
+
+    python -m benchmarks.bench_geo
+"""
+import time
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from src.geo import GeoIndex
+
+TOPICS = [f"topic{i}" for i in range(20)]
+
+
+def run(sizes=(100_000, 1_000_000, 5_000_000), zooms=(2, 4, 6, 8)) -> Dict[int, Dict[str, float]]:
+    rng = np.random.default_rng(0)
+    results = {}
+    
+    for size in sizes:
+        # Clustered around 50 random centers, like posts around metros
+        centers = np.column_stack([rng.uniform(-50, 65, 50), rng.uniform(-180, 180, 50)])
+        which = rng.integers(0, 50, size)
+        lat = centers[which, 0] + rng.normal(0, 0.5, size)
+        lng = np.clip(centers[which, 1] + rng.normal(0, 0.5, size), -180, 180)
+        topics = rng.integers(0, len(TOPICS), size)
+        engagement = rng.lognormal(2, 1, size)
+        
+        index = GeoIndex(TOPICS)
+        start = time.perf_counter()
+        index.add(lat, lng, topics, engagement, datetime.now())
+        result = {'build_ms': (time.perf_counter() - start) * 1000}
+        
+        for zoom in zooms:
+            start = time.perf_counter()
+            index.bins(zoom, limit=200)
+            result[f'zoom{zoom}_ms'] = (time.perf_counter() - start) * 1000
+        results[size] = result
+    
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    columns = list(next(iter(results.values())))
+    print(f"{'posts':>10} " + ' '.join(f"{c:>10}" for c in columns))
+    for size, r in results.items():
+        print(f"{size:>10,} " + ' '.join(f"{r[c]:>10.1f}" for c in columns))
@@ -0,0 +1,69 @@
+"""Micro-benchmark for the Parquet history store across 24h to 90d horizons.
+
+Seeds a temporary store with 90 days of simulated history, then times the
+chart queries with and without topic/platform predicates.
+
+    python -m benchmarks.bench_history
+"""
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from src.history import HistoryStore
+from src.mock_data import MockDataGenerator
+
+HORIZONS = {
+    '24h': 24,
+    '7d': 24 * 7,
+    '30d': 24 * 30,
+    '90d': 24 * 90
+}
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(days: int = 90, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Seed a store, then time every query shape at every horizon"""
+    mock_gen = MockDataGenerator()
+    with tempfile.TemporaryDirectory() as root:
+        store = HistoryStore(root)
+        start = time.perf_counter()
+        rows = mock_gen.backfill_history(store, days=days)
+        results = {'seed': {'rows': rows, 'seconds': time.perf_counter() - start, **store.stats()}}
+        
+        now = datetime.now()
+        for label, hours in HORIZONS.items():
+            since = now - timedelta(hours=hours)
+            freq = max(1, hours // 48)
+            results[label] = {
+                'all_ms': _best_of(lambda: store.timeline(since, now, freq), repeat),
+                'platform_ms': _best_of(lambda: store.timeline(since, now, freq, platform='Reddit'), repeat),
+                'topic_ms': _best_of(lambda: store.timeline(since, now, freq, topic='AIethics', platform='TikTok'), repeat),
+                'regenerate_ms': _best_of(lambda: mock_gen.generate_sentiment_timeline(hours=hours), repeat)
+            }
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    seed = results.pop('seed')
+    print(f"seeded {seed['rows']:,} rows in {seed['seconds']:.2f}s: "
+          f"{seed['files']} files over {seed['days']} days, {seed['bytes'] / 1024 ** 2:.1f} MB")
+    print(f"{'horizon':>8} {'all':>10} {'platform':>10} {'topic':>10} {'regenerate':>11}")
+    for label, timings in results.items():
+        print(
+            f"{label:>8} "
+            f"{timings['all_ms']:>8.1f}ms "
+            f"{timings['platform_ms']:>8.1f}ms "
+            f"{timings['topic_ms']:>8.1f}ms "
+            f"{timings['regenerate_ms']:>9.1f}ms"
+        )
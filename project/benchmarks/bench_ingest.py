@@ -0,0 +1,49 @@
+"""Ingestion: per-platform adapter decode throughput and partitioned pipeline ingest.
+
+    python -m benchmarks.bench_ingest
+"""
+import time
+from typing import Dict
+
+from src.ingest import ADAPTERS, Normalizer
+from src.mock_data import MockDataGenerator
+from src.pipeline import PartitionedPipeline
+from src.serialization import dumps
+
+
+def run(posts: int = 50_000) -> Dict[str, Dict[str, float]]:
+    mock_gen = MockDataGenerator()
+    normalizer = Normalizer(mock_gen.topics)
+    pipeline = PartitionedPipeline(mock_gen.platforms, mock_gen.topics, sources=[])
+    sample = mock_gen.generate_posts(posts, hours=1)
+    results = {}
+    
+    for platform, adapter in ADAPTERS.items():
+        lines = []
+        for post in sample:
+            post.update(views=100, engagements=8)
+            lines.append(dumps(adapter.encode(post)))
+        
+        start = time.perf_counter()
+        batch = adapter.decode(lines, normalizer)
+        decode_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        pipeline.ingest(batch)
+        ingest_s = time.perf_counter() - start
+        
+        results[platform] = {
+            'decode_per_s': posts / decode_s,
+            'ingest_per_s': posts / ingest_s,
+            'raw_kb': sum(len(line) for line in lines) / 1024,
+            'batch_kb': batch.nbytes / 1024
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'platform':>10} {'decode/s':>10} {'ingest/s':>11} {'raw KB':>8} {'batch KB':>9}")
+    for platform, r in run().items():
+        print(f"{platform:>10} {r['decode_per_s']:>10,.0f} {r['ingest_per_s']:>11,.0f} "
+              f"{r['raw_kb']:>8,.0f} {r['batch_kb']:>9,.0f}")
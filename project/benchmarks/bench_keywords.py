@@ -0,0 +1,53 @@
+"""Keyword scan cost as the number of keywords grows.
+
+The automaton's scan time should stay flat; a loop of substring checks grows
+linearly with the keyword count.
+
+    python -m benchmarks.bench_keywords
+"""
+import random
+import string
+import time
+from typing import Dict, List
+
+from src.keyword_matcher import KeywordMatcher
+from src.mock_data import MockDataGenerator
+
+
+def _random_words(count: int) -> List[str]:
+    return [''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 10))) for _ in range(count)]
+
+
+def run(sizes=(100, 1_000, 10_000, 100_000), posts: int = 2_000) -> Dict[int, Dict[str, float]]:
+    mock_gen = MockDataGenerator()
+    corpus = [p for topic in mock_gen.topics for p in mock_gen.get_sample_posts(topic, 5)]
+    texts = random.choices(corpus, k=posts)
+    results = {}
+    
+    for size in sizes:
+        keywords = _random_words(size - len(mock_gen.topics)) + mock_gen.topics
+        matcher = KeywordMatcher(keywords)
+        matcher.scan('')  # build failure links outside the timed loop
+        
+        start = time.perf_counter()
+        for text in texts:
+            matcher.scan(text)
+        automaton_us = (time.perf_counter() - start) / posts * 1e6
+        
+        sample = texts[:50]
+        lowered = [k.lower() for k in keywords]
+        start = time.perf_counter()
+        for text in sample:
+            text = text.lower()
+            [k for k in lowered if k in text]
+        substring_us = (time.perf_counter() - start) / len(sample) * 1e6
+        
+        results[size] = {'automaton_us_per_post': automaton_us, 'substring_us_per_post': substring_us}
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'keywords':>9} {'automaton':>12} {'substring loop':>15}")
+    for size, timings in run().items():
+        print(f"{size:>9,} {timings['automaton_us_per_post']:>10.1f}us {timings['substring_us_per_post']:>13.1f}us")
@@ -0,0 +1,49 @@
+"""Meme variant clustering throughput: reposts (exact-text fast path) vs distinct variants (MinHash + LSH).
+
+    python -m benchmarks.bench_memes
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from src.meme_tracker import MemeTracker
+from src.mock_data import MockDataGenerator
+
+
+def run(sizes=(10_000, 100_000, 1_000_000)) -> Dict[int, Dict[str, float]]:
+    mock_gen = MockDataGenerator()
+    now = datetime.now()
+    results = {}
+    
+    for size in sizes:
+        posts = []
+        while len(posts) < size:
+            posts.extend(mock_gen.generate_meme_posts(mock_gen.topics, now - timedelta(days=14), now))
+        posts = posts[:size]
+        # Tag every post so each one is a distinct near-duplicate variant
+        distinct = [dict(post, text=f"{post['text']} v{i}") for i, post in enumerate(posts)]
+        
+        tracker = MemeTracker()
+        start = time.perf_counter()
+        tracker.add_posts(posts)
+        repost_s = time.perf_counter() - start
+        
+        tracker = MemeTracker()
+        start = time.perf_counter()
+        tracker.add_posts(distinct)
+        distinct_s = time.perf_counter() - start
+        
+        results[size] = {
+            'reposts_per_s': size / repost_s,
+            'variants_per_s': size / distinct_s,
+            'families': len(tracker.families)
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'posts':>10} {'reposts/s':>12} {'variants/s':>12} {'families':>9}")
+    for size in (10_000, 100_000, 1_000_000):
+        r = run((size,))[size]
+        print(f"{size:>10,} {r['reposts_per_s']:>12,.0f} {r['variants_per_s']:>12,.0f} {r['families']:>9,}")
@@ -0,0 +1,53 @@
+"""HyperLogLog reach: estimate error and merge-query latency vs exact author sets.
+
+    python -m benchmarks.bench_reach
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+
+from src.reach import ReachTracker, hash_ids
+
+PLATFORMS = ("Twitter", "Reddit", "TikTok", "Instagram")
+
+
+def run(posts_per_hour=(10_000, 100_000, 1_000_000), hours: int = 24) -> Dict[int, Dict[str, float]]:
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    results = {}
+    
+    for rate in posts_per_hour:
+        tracker = ReachTracker()
+        exact = set()
+        
+        for hour in range(hours):
+            ts = now - timedelta(hours=hours - 1 - hour)
+            for platform in PLATFORMS:
+                authors = rng.zipf(1.3, rate // len(PLATFORMS)) % (rate * hours)
+                exact.update(authors.tolist())
+                tracker.observe("Topic", platform, hash_ids(authors), ts)
+        
+        start = time.perf_counter()
+        for _ in range(100):
+            estimate = tracker.unique("Topic", hours=hours, now=now)
+        query_us = (time.perf_counter() - start) / 100 * 1e6
+        
+        results[rate] = {
+            'exact': len(exact),
+            'estimate': estimate,
+            'error_pct': abs(estimate - len(exact)) / len(exact) * 100,
+            'query_us': query_us,
+            'sketch_kb': tracker.stats()['sketch_bytes'] / 1024,
+            'exact_set_kb': len(exact) * 8 / 1024
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'posts/h':>10} {'exact':>10} {'estimate':>10} {'err %':>6} {'query us':>9} {'sketch KB':>10} {'set KB':>10}")
+    for rate, r in run().items():
+        print(f"{rate:>10,} {r['exact']:>10,} {r['estimate']:>10,} {r['error_pct']:>6.2f} "
+              f"{r['query_us']:>9.0f} {r['sketch_kb']:>10.0f} {r['exact_set_kb']:>10,.0f}")
@@ -0,0 +1,69 @@
+"""Micro-benchmark for restart recovery of the streaming pipeline's state.
+
+Streams an hour of simulated firehose into a temporary state store, then for
+growing log tails past the last snapshot times a restart: snapshot load plus
+log replay, next to starting cold.
+
+    python -m benchmarks.bench_recovery
+"""
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from src.checkpoint import StateStore
+from src.mock_data import MockDataGenerator
+
+# Minutes of stream logged after the snapshot before each restart
+TAIL_MINUTES = (0, 10, 30, 60)
+
+
+def run() -> Dict[str, Dict[str, float]]:
+    """For each log tail length: stream an hour, snapshot, stream the tail, then restart"""
+    results = {}
+    for tail in TAIL_MINUTES:
+        with tempfile.TemporaryDirectory() as root:
+            # Snapshots only when asked, and no replay cap, so the whole tail stays in the log and is replayed
+            mock_gen, store = MockDataGenerator(), StateStore(root, snapshot_bytes=2 ** 62, snapshot_seconds=float('inf'),
+                                                              snapshot_records=2 ** 62)
+            mock_gen.restore_state(store)
+            start = time.perf_counter()
+            mock_gen.rollup_metrics()
+            cold = time.perf_counter() - start
+            
+            with mock_gen._stream_lock:
+                start = time.perf_counter()
+                store.snapshot(mock_gen.pipeline, background=False)
+                snapshot = time.perf_counter() - start
+                mock_gen._advance_stream(datetime.now() + timedelta(minutes=tail))
+            stats = store.stats()
+            store.close()
+            
+            report = MockDataGenerator().restore_state(StateStore(root, max_replay_bytes=2 ** 62))
+            results[f"{tail}m"] = {
+                'cold_ms': cold * 1000,
+                'snapshot_ms': snapshot * 1000,
+                'snapshot_mb': stats['snapshot_bytes'] / 1024 ** 2,
+                'tail_mb': report['replayed_bytes'] / 1024 ** 2,
+                'load_ms': report['snapshot_ms'],
+                'replay_ms': report['replay_ms'],
+                'recovery_ms': report['total_ms']
+            }
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    print(f"{'tail':>6} {'cold start':>11} {'snapshot':>10} {'size':>8} {'log':>8} "
+          f"{'load':>9} {'replay':>9} {'recovery':>10}")
+    for label, timings in results.items():
+        print(
+            f"{label:>6} "
+            f"{timings['cold_ms']:>9.0f}ms "
+            f"{timings['snapshot_ms']:>8.0f}ms "
+            f"{timings['snapshot_mb']:>6.1f}MB "
+            f"{timings['tail_mb']:>6.1f}MB "
+            f"{timings['load_ms']:>7.0f}ms "
+            f"{timings['replay_ms']:>7.0f}ms "
+            f"{timings['recovery_ms']:>8.0f}ms"
+        )
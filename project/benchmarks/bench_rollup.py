@@ -0,0 +1,61 @@
+"""Micro-benchmark for the rollup cubes behind the War Room metrics.
+
+Times rollup summaries at several horizons next to the existing per-window
+reach query (one distinct count only), plus the cubes' footprint.
+
+    python -m benchmarks.bench_rollup
+"""
+import time
+from typing import Callable, Dict
+
+from src.mock_data import MockDataGenerator
+
+HORIZONS = {
+    '1h': 1,
+    '6h': 6,
+    '24h': 24
+}
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Warm the stream, then time rollup summaries and the per-window reach query"""
+    mock_gen = MockDataGenerator()
+    start = time.perf_counter()
+    mock_gen.rollup_metrics()
+    seconds = time.perf_counter() - start
+    rollup_bytes = sum(stats['rollup_bytes'] for stats in mock_gen.pipeline.stats().values())
+    results = {'warmup': {'seconds': seconds, 'rollup_bytes': rollup_bytes}}
+    
+    for label, hours in HORIZONS.items():
+        results[label] = {
+            'rollup_ms': _best_of(lambda: mock_gen.rollup_metrics(hours), repeat),
+            'platform_ms': _best_of(lambda: mock_gen.rollup_metrics(hours, platform='Reddit'), repeat),
+            'all_platforms_ms': _best_of(lambda: mock_gen.platform_metrics(hours), repeat),
+            'windows_ms': _best_of(lambda: mock_gen.unique_participants(hours=hours), repeat)
+        }
+    return results
+
+
+if __name__ == '__main__':
+    results = run()
+    warmup = results.pop('warmup')
+    print(f"warmed stream in {warmup['seconds']:.2f}s; rollups hold {warmup['rollup_bytes'] / 1024 ** 2:.1f} MB")
+    print(f"{'horizon':>8} {'rollup':>10} {'platform':>10} {'per-platform':>13} {'windows':>10}")
+    for label, timings in results.items():
+        print(
+            f"{label:>8} "
+            f"{timings['rollup_ms']:>8.2f}ms "
+            f"{timings['platform_ms']:>8.2f}ms "
+            f"{timings['all_platforms_ms']:>11.2f}ms "
+            f"{timings['windows_ms']:>8.2f}ms"
+        )
@@ -0,0 +1,41 @@
+"""Sentiment scoring throughput on large post batches.
+
+    python -m benchmarks.bench_sentiment
+"""
+import time
+from typing import Dict
+
+from src.mock_data import MockDataGenerator
+from src.sentiment import SentimentScorer
+
+
+def run(sizes=(1_000, 10_000, 100_000)) -> Dict[int, Dict[str, float]]:
+    mock_gen = MockDataGenerator()
+    scorer = SentimentScorer()
+    results = {}
+    
+    for size in sizes:
+        texts = [post['text'] for post in mock_gen.generate_posts(size)]
+        # Distinct texts defeat the per-batch dedup and measure the full featurize + matvec path
+        distinct = [f"{text} {i}" for i, text in enumerate(texts)]
+        
+        start = time.perf_counter()
+        scorer.score(texts)
+        templated_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        scorer.score(distinct)
+        distinct_s = time.perf_counter() - start
+        
+        results[size] = {
+            'templated_posts_per_s': size / templated_s,
+            'distinct_posts_per_s': size / distinct_s
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'posts':>8} {'templated/s':>13} {'distinct/s':>12}")
+    for size, rates in run().items():
+        print(f"{size:>8,} {rates['templated_posts_per_s']:>13,.0f} {rates['distinct_posts_per_s']:>12,.0f}")
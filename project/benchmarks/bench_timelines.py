@@ -0,0 +1,89 @@
+"""Micro-benchmark for timeline generation across 24h to 90d horizons.
+
+Compares the vectorized builders against the previous row-wise construction.
+
+    python -m benchmarks.bench_timelines
+"""
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.mock_data import MockDataGenerator
+from src.visualizations import controversy_timeline_data
+
+HORIZONS = {
+    '24h': 24,
+    '7d': 24 * 7,
+    '30d': 24 * 30,
+    '90d': 24 * 90
+}
+
+
+def _rowwise_sentiment(hours: int) -> pd.DataFrame:
+    """Reference row-wise sentiment timeline (pre-vectorization)"""
+    timestamps = pd.date_range(end=datetime.now(), periods=hours + 1, freq='h')
+    rows = []
+    for i, timestamp in enumerate(timestamps):
+        sentiment = 0.1 + 0.02 * np.sin(i * 0.2) + random.uniform(-0.3, 0.3)
+        rows.append({
+            'timestamp': timestamp,
+            'sentiment': max(-1, min(1, sentiment)),
+            'volume': random.randint(1000, 10000),
+            'positive_ratio': max(0, min(1, 0.5 + sentiment/2)),
+            'negative_ratio': max(0, min(1, 0.5 - sentiment/2)),
+            'neutral_ratio': random.uniform(0.2, 0.4)
+        })
+    return pd.DataFrame(rows)
+
+
+def _rowwise_controversy(hours: int) -> pd.DataFrame:
+    """Reference row-wise controversy timeline (pre-vectorization)"""
+    timestamps = pd.date_range(end=datetime.now(), periods=hours // 2 + 1, freq='2h')
+    base = random.randint(40, 80)
+    scores = []
+    for i, _ in enumerate(timestamps):
+        spike = 20 if i == len(timestamps) // 3 else 15 if i == 2 * len(timestamps) // 3 else 0
+        scores.append(min(100, max(0, base + random.uniform(-10, 10) + spike)))
+    return pd.DataFrame({'timestamp': timestamps, 'controversy': scores})
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Time every builder at every horizon"""
+    mock_gen = MockDataGenerator()
+    results = {}
+    
+    for label, hours in HORIZONS.items():
+        results[label] = {
+            'sentiment_rowwise_ms': _best_of(lambda: _rowwise_sentiment(hours), repeat),
+            'sentiment_vectorized_ms': _best_of(lambda: mock_gen.generate_sentiment_timeline(hours=hours), repeat),
+            'controversy_rowwise_ms': _best_of(lambda: _rowwise_controversy(hours), repeat),
+            'controversy_vectorized_ms': _best_of(lambda: controversy_timeline_data(hours=hours), repeat)
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'horizon':>8} {'sentiment row':>14} {'vectorized':>11} {'controversy row':>16} {'vectorized':>11}")
+    for label, timings in run().items():
+        print(
+            f"{label:>8} "
+            f"{timings['sentiment_rowwise_ms']:>12.2f}ms "
+            f"{timings['sentiment_vectorized_ms']:>9.2f}ms "
+            f"{timings['controversy_rowwise_ms']:>14.2f}ms "
+            f"{timings['controversy_vectorized_ms']:>9.2f}ms"
+        )
@@ -0,0 +1,40 @@
+"""Toxicity scoring throughput, cold (every post featurized) and warm (content-hash cache hits).
+
+    python -m benchmarks.bench_toxicity
+"""
+import time
+from typing import Dict
+
+from src.mock_data import MockDataGenerator
+from src.toxicity import ToxicityClassifier
+
+
+def run(sizes=(1_000, 10_000, 100_000)) -> Dict[int, Dict[str, float]]:
+    mock_gen = MockDataGenerator()
+    results = {}
+    
+    for size in sizes:
+        # Distinct texts so the cold pass cannot reuse cached scores
+        texts = [f"{post['text']} {i}" for i, post in enumerate(mock_gen.generate_posts(size))]
+        classifier = ToxicityClassifier(cache_size=size)
+        
+        start = time.perf_counter()
+        classifier.score(texts)
+        cold_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        classifier.score(texts)
+        warm_s = time.perf_counter() - start
+        
+        results[size] = {
+            'cold_posts_per_s': size / cold_s,
+            'warm_posts_per_s': size / warm_s
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'posts':>8} {'cold/s':>12} {'warm/s':>12}")
+    for size, rates in run().items():
+        print(f"{size:>8,} {rates['cold_posts_per_s']:>12,.0f} {rates['warm_posts_per_s']:>12,.0f}")
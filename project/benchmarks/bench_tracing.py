@@ -0,0 +1,52 @@
+"""Tracing: per-span overhead and histogram percentile accuracy vs exact percentiles.
+
+    python -m benchmarks.bench_tracing
+"""
+import time
+from typing import Dict
+
+import numpy as np
+
+from src.tracing import LatencyHistogram, Tracer
+
+
+def span_overhead_ns(spans: int = 200_000, repeats: int = 5) -> float:
+    """Cost of an empty `with tracer.span(...)` block beyond the bare loop (best of `repeats`)"""
+    tracer = Tracer(['stage'])
+    best = float('inf')
+    
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(spans):
+            pass
+        baseline = time.perf_counter_ns() - start
+        
+        start = time.perf_counter_ns()
+        for _ in range(spans):
+            with tracer.span('stage'):
+                pass
+        best = min(best, (time.perf_counter_ns() - start - baseline) / spans)
+    return best
+
+
+def run(samples: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    rng = np.random.default_rng(0)
+    # Heavy-tailed latencies around 1 ms
+    values = rng.lognormal(np.log(1e6), 1.0, samples).astype(np.int64)
+    histogram = LatencyHistogram()
+    for value in values.tolist():
+        histogram.record(value)
+    
+    exact = np.percentile(values, [50, 95, 99])
+    estimated = histogram.percentiles((50, 95, 99))
+    return {
+        f"p{p}": {'exact_ms': e / 1e6, 'hdr_ms': h / 1e6, 'error_pct': abs(h - e) / e * 100}
+        for p, e, h in zip((50, 95, 99), exact, estimated)
+    }
+
+
+if __name__ == '__main__':
+    print(f"span overhead: {span_overhead_ns():.0f} ns")
+    print(f"{'pct':>5} {'exact ms':>10} {'hdr ms':>10} {'err %':>6}")
+    for name, r in run().items():
+        print(f"{name:>5} {r['exact_ms']:>10.3f} {r['hdr_ms']:>10.3f} {r['error_pct']:>6.2f}")
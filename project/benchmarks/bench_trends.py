@@ -0,0 +1,51 @@
+"""Trend detector ingest rate and memory as hashtag cardinality grows.
+
+    python -m benchmarks.bench_trends
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+
+from src.trend_detector import TrendDetector
+
+BATCH = 10_000
+
+
+def run(cardinalities=(10_000, 100_000, 1_000_000, 10_000_000), batches: int = 60) -> Dict[int, Dict[str, float]]:
+    rng = np.random.default_rng(0)
+    results = {}
+    
+    for cardinality in cardinalities:
+        detector = TrendDetector()
+        start_ts = datetime.now() - timedelta(hours=1)
+        elapsed = 0.0
+        
+        for b in range(batches):
+            # Zipf-ish draw over `cardinality` tags, aggregated per micro-batch
+            tags, counts = np.unique(rng.zipf(1.3, BATCH) % cardinality, return_counts=True)
+            keys = [f"tag{tag}" for tag in tags]
+            values = np.column_stack([counts, counts * 50, counts * 3])
+            
+            start = time.perf_counter()
+            detector.add(keys, values, start_ts + timedelta(minutes=b))
+            elapsed += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        detector.top_trends(20, start_ts + timedelta(minutes=batches))
+        query_s = time.perf_counter() - start
+        
+        results[cardinality] = {
+            'posts_per_s': batches * BATCH / elapsed,
+            'query_ms': query_s * 1000,
+            'sketch_mb': detector.stats()['sketch_bytes'] / 1e6
+        }
+    
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'hashtags':>12} {'posts/s':>12} {'top-20 ms':>10} {'sketch MB':>10}")
+    for cardinality, r in run().items():
+        print(f"{cardinality:>12,} {r['posts_per_s']:>12,.0f} {r['query_ms']:>10.1f} {r['sketch_mb']:>10.1f}")
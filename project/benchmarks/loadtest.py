@@ -0,0 +1,447 @@
+"""Load generator: N simulated analysts driving one live ViralPulse server.
+
+Starts `streamlit run app.py` (or targets --url) and opens one websocket
+session per simulated user, speaking the same protocol as the browser: every
+interaction is a rerun request carrying the session's widget states, timed
+until the server reports the script finished. AppTest can't do this - it
+swaps a process-global runtime on every run - while real sessions share the
+server's script threads, caches and GIL, which is what saturates.
+
+Users loop through a weighted mix of actions with exponential think time:
+
+    page      switch pages (option_menu falls back to ?page=, like a deep link)
+    platform  change the sidebar platform focus
+    conflict  pick a trend on the Conflict Detector and analyze it
+    rag       submit a query on the RAG Engine
+    refresh   toggle Auto Refresh on, keep it for one think, then off
+
+Concurrency ramps through stages, adding users while earlier ones keep
+working. Each stage reports throughput, rerun latency percentiles and server
+RSS; memory per session is the slope of RSS against connected sessions. The
+server saturates at the first stage where throughput falls below
+SATURATION_EFFICIENCY of N / (think + single-user latency), the closed-loop
+rate N users would reach unloaded, or p95 latency exceeds the SLO.
+
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --users 10 50 100 --duration 20
+    python -m benchmarks.loadtest --url http://127.0.0.1:8501 --server-pid 4242
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from src.tracing import LatencyHistogram
+from views import PAGES
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(PROJECT_DIR, 'app.py')
+
+STAGES = (1, 5, 10, 25, 50, 100, 200)
+STAGE_SECONDS = 30.0
+# New users of a stage arrive spread over this many seconds
+ARRIVAL_SECONDS = 5.0
+THINK_SECONDS = 3.0
+INTERACTION_TIMEOUT = 120.0
+SERVER_START_TIMEOUT = 60.0
+
+# Relative frequency of each action in a simulated session
+ACTION_WEIGHTS = {
+    'page': 0.35,
+    'platform': 0.15,
+    'conflict': 0.2,
+    'rag': 0.2,
+    'refresh': 0.1
+}
+
+# Saturation: throughput falls below this share of what N users would manage
+# at single-user latency (N / (think + latency)), or p95 exceeds the SLO
+SATURATION_EFFICIENCY = 0.75
+DEFAULT_SLO_SECONDS = 5.0
+
+PLATFORMS = ["All", "Twitter", "Reddit", "TikTok", "Instagram"]
+FALLBACK_TAGS = ["#AIethics", "#ClimateAction", "#CryptoRegulation", "#RemoteWork"]
+RAG_QUERIES = (
+    "Analyze the cultural impact of {tag} memes",
+    "Why is {tag} trending right now?",
+    "Summarize the debate around {tag}",
+    "Which communities drive {tag}?"
+)
+
+LABEL_CONFLICT_TREND = "Choose a trend to analyze:"
+LABEL_CONFLICT_BUTTON = "🔍 Analyze Conflict"
+LABEL_RAG_QUERY = "Enter your analysis query:"
+LABEL_RAG_BUTTON = "🚀 Generate Analysis"
+LABEL_PLATFORM = "🎯 Platform Focus"
+LABEL_REFRESH = "🔄 Auto Refresh (30s)"
+
+
+class Session:
+    """One browser tab: a websocket to the server plus the widget states it would send"""
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.query_string = ''
+        # Widgets rendered by the latest run: label -> (element type, widget id, options)
+        self.widgets: Dict[str, tuple] = {}
+        self._rendering: Dict[str, tuple] = {}
+        # Values the user has set, resent with every rerun like the browser does
+        self.values: Dict[str, WidgetState] = {}
+        self.errors = 0
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+        self._waiter: Optional[tuple] = None
+    
+    async def connect(self) -> None:
+        self._ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+        self._reader = asyncio.create_task(self._read())
+    
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+    
+    def _resolve(self, condition: str) -> None:
+        if self._waiter is not None and self._waiter[0] == condition and not self._waiter[1].done():
+            self._waiter[1].set_result(None)
+    
+    async def _read(self) -> None:
+        try:
+            async for frame in self._ws:
+                msg = ForwardMsg()
+                msg.ParseFromString(frame)
+                kind = msg.WhichOneof('type')
+                if kind == 'new_session':
+                    self._rendering = {}
+                elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                    element = msg.delta.new_element
+                    element_type = element.WhichOneof('type')
+                    if element_type == 'exception':
+                        self.errors += 1
+                        continue
+                    proto = getattr(element, element_type)
+                    widget_id = getattr(proto, 'id', '')
+                    if widget_id and getattr(proto, 'label', ''):
+                        self._rendering[proto.label] = (element_type, widget_id, list(getattr(proto, 'options', ())))
+                        self._resolve(proto.label)
+                elif kind == 'script_finished':
+                    status = msg.script_finished
+                    if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                        continue
+                    if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                        self.errors += 1
+                    self.widgets = self._rendering
+                    live = {widget_id for _, widget_id, _ in self.widgets.values()}
+                    self.values = {k: v for k, v in self.values.items() if k in live}
+                    self._resolve('finished')
+        except (websockets.ConnectionClosed, asyncio.CancelledError):
+            pass
+    
+    async def rerun(self, triggers: List[WidgetState] = (), until: str = 'finished',
+                    timeout: float = INTERACTION_TIMEOUT) -> float:
+        """Send one rerun request; seconds until the script finishes (or the `until` label renders)"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = self.query_string
+        msg.rerun_script.widget_states.widgets.extend(list(self.values.values()) + list(triggers))
+        done = asyncio.get_running_loop().create_future()
+        self._waiter = (until, done)
+        start = time.perf_counter()
+        await self._ws.send(msg.SerializeToString())
+        await asyncio.wait_for(done, timeout)
+        return time.perf_counter() - start
+    
+    def widget_id(self, label: str) -> Optional[str]:
+        widget = self.widgets.get(label)
+        return widget[1] if widget else None
+    
+    def options(self, label: str) -> List[str]:
+        widget = self.widgets.get(label)
+        return widget[2] if widget else []
+    
+    def set_value(self, label: str, **value) -> bool:
+        widget_id = self.widget_id(label)
+        if widget_id is None:
+            return False
+        self.values[widget_id] = WidgetState(id=widget_id, **value)
+        return True
+    
+    def trigger(self, label: str) -> List[WidgetState]:
+        widget_id = self.widget_id(label)
+        return [WidgetState(id=widget_id, trigger_value=True)] if widget_id else []
+
+
+class LoadStats:
+    """Interaction latencies and errors, bucketed by stage and action"""
+    
+    def __init__(self):
+        self.stage = 0
+        self.latency: Dict[int, Dict[str, LatencyHistogram]] = {}
+        self.errors: Dict[int, int] = {}
+    
+    def record(self, action: str, seconds: float) -> None:
+        histograms = self.latency.setdefault(self.stage, {})
+        histograms.setdefault(action, LatencyHistogram()).record(int(seconds * 1e9))
+    
+    def error(self) -> None:
+        self.errors[self.stage] = self.errors.get(self.stage, 0) + 1
+    
+    def merged(self, stage: int) -> LatencyHistogram:
+        total = LatencyHistogram()
+        for histogram in self.latency.get(stage, {}).values():
+            total.merge(histogram)
+        return total
+
+
+async def _go_to(session: Session, slug: str, stats: LoadStats) -> None:
+    session.query_string = f"page={slug}"
+    stats.record('page', await session.rerun())
+
+
+async def _act(session: Session, action: str, rng: random.Random, think: float, stats: LoadStats) -> None:
+    if action == 'page':
+        await _go_to(session, rng.choice(list(PAGES)), stats)
+    elif action == 'platform':
+        session.set_value(LABEL_PLATFORM, string_value=rng.choice(PLATFORMS))
+        stats.record('platform', await session.rerun())
+    elif action == 'conflict':
+        if session.widget_id(LABEL_CONFLICT_BUTTON) is None:
+            await _go_to(session, 'conflict', stats)
+        trends = session.options(LABEL_CONFLICT_TREND)
+        if trends:
+            session.set_value(LABEL_CONFLICT_TREND, string_value=rng.choice(trends))
+        stats.record('conflict', await session.rerun(session.trigger(LABEL_CONFLICT_BUTTON)))
+    elif action == 'rag':
+        if session.widget_id(LABEL_RAG_BUTTON) is None:
+            await _go_to(session, 'rag', stats)
+        tag = rng.choice(session.options(LABEL_CONFLICT_TREND) or FALLBACK_TAGS)
+        session.set_value(LABEL_RAG_QUERY, string_value=rng.choice(RAG_QUERIES).format(tag=tag))
+        stats.record('rag', await session.rerun(session.trigger(LABEL_RAG_BUTTON)))
+    elif action == 'refresh':
+        # With the box ticked the script renders the page and then sleeps 30s
+        # before rerunning itself, so the page is up once the box renders
+        session.set_value(LABEL_REFRESH, bool_value=True)
+        stats.record('refresh_on', await session.rerun(until=LABEL_REFRESH))
+        await asyncio.sleep(rng.expovariate(1 / think))
+        session.set_value(LABEL_REFRESH, bool_value=False)
+        stats.record('refresh_off', await session.rerun())
+
+
+async def _user(url: str, seed: int, think: float, stats: LoadStats, stop: asyncio.Event) -> Session:
+    rng = random.Random(seed)
+    session = Session(url)
+    await session.connect()
+    actions, weights = list(ACTION_WEIGHTS), list(ACTION_WEIGHTS.values())
+    try:
+        await _go_to(session, rng.choice(list(PAGES)), stats)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), rng.expovariate(1 / think))
+                break
+            except asyncio.TimeoutError:
+                pass
+            errors = session.errors
+            try:
+                await _act(session, rng.choices(actions, weights)[0], rng, think, stats)
+            except asyncio.TimeoutError:
+                stats.error()
+            if session.errors > errors:
+                stats.error()
+    except websockets.ConnectionClosed:
+        stats.error()
+    return session
+
+
+def _rss_mb(pid: Optional[int]) -> Optional[float]:
+    """Resident set size of a process from /proc (Linux only)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    """Launch the app headless and wait for its health check"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP_PATH,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read() == b'ok':
+                    return server
+        except OSError:
+            time.sleep(0.25)
+    server.kill()
+    raise RuntimeError(f"Streamlit server did not come up on port {port}")
+
+
+def _slope(xs: List[float], ys: List[float]) -> Optional[float]:
+    """Least-squares slope of ys against xs"""
+    if len(xs) < 2:
+        return None
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var if var else None
+
+
+async def _ramp(url: str, stages: List[int], duration: float, think: float,
+                server_pid: Optional[int], seed: int) -> Dict[str, Any]:
+    stats = LoadStats()
+    stop = asyncio.Event()
+    users: List[asyncio.Task] = []
+    
+    # One warm-up visit so cold imports and cache fills don't count as per-session memory
+    warmup = Session(url)
+    await warmup.connect()
+    for slug in PAGES:
+        warmup.query_string = f"page={slug}"
+        await warmup.rerun()
+    await warmup.close()
+    baseline_rss = _rss_mb(server_pid)
+    
+    results = []
+    for index, target in enumerate(stages):
+        stats.stage = index
+        arriving = target - len(users)
+        for k in range(arriving):
+            users.append(asyncio.create_task(_user(url, seed + len(users), think, stats, stop)))
+            await asyncio.sleep(ARRIVAL_SECONDS / max(arriving, 1))
+        await asyncio.sleep(max(duration - ARRIVAL_SECONDS, 0.0))
+        
+        latency = stats.merged(index)
+        p50, p95, p99 = (value / 1e9 for value in latency.percentiles((50, 95, 99)))
+        results.append({
+            'users': target,
+            'interactions': latency.total,
+            'throughput': latency.total / duration,
+            'mean_s': latency.mean_ns() / 1e9,
+            'p50_s': p50,
+            'p95_s': p95,
+            'p99_s': p99,
+            'max_s': latency.max_ns() / 1e9,
+            'errors': stats.errors.get(index, 0),
+            'rss_mb': _rss_mb(server_pid),
+            'actions': {
+                action: {'count': h.total, **{f"p{p}_s": v / 1e9 for p, v in zip((50, 95, 99), h.percentiles((50, 95, 99)))}}
+                for action, h in sorted(stats.latency.get(index, {}).items())
+            }
+        })
+    
+    stop.set()
+    sessions = await asyncio.gather(*users, return_exceptions=True)
+    await asyncio.gather(*(s.close() for s in sessions if isinstance(s, Session)))
+    return {'baseline_rss_mb': baseline_rss, 'stages': results}
+
+
+def summarize(report: Dict[str, Any], think: float = THINK_SECONDS, slo: float = DEFAULT_SLO_SECONDS) -> Dict[str, Any]:
+    """Memory per session and the saturation point of a ramp report"""
+    stages = report['stages']
+    measured = [s for s in stages if s['rss_mb'] is not None]
+    per_session = _slope([s['users'] for s in measured], [s['rss_mb'] for s in measured])
+    
+    saturated_at = None
+    unloaded = stages[0]['mean_s'] if stages and stages[0]['interactions'] else None
+    for stage in stages:
+        efficiency = stage['throughput'] / (stage['users'] / (think + unloaded)) if unloaded is not None else None
+        stage['efficiency'] = efficiency
+        # The first stage is the reference, too few interactions to judge its own rate
+        degraded = efficiency is not None and efficiency < SATURATION_EFFICIENCY and stage is not stages[0]
+        if saturated_at is None and (stage['p95_s'] > slo or degraded):
+            saturated_at = stage['users']
+    supported = max((s['users'] for s in stages if saturated_at is None or s['users'] < saturated_at), default=0)
+    return {
+        'memory_per_session_mb': per_session,
+        'saturated_at_users': saturated_at,
+        'supported_users': supported,
+        'slo_s': slo
+    }
+
+
+def run(stages=STAGES, duration: float = STAGE_SECONDS, think: float = THINK_SECONDS,
+        url: Optional[str] = None, server_pid: Optional[int] = None,
+        slo: float = DEFAULT_SLO_SECONDS, seed: int = 0) -> Dict[str, Any]:
+    server = None
+    if url is None:
+        port = _free_port()
+        server = start_server(port)
+        url, server_pid = f"http://127.0.0.1:{port}", server.pid
+    ws_url = url.replace('http', 'ws', 1).rstrip('/') + '/_stcore/stream'
+    try:
+        report = asyncio.run(_ramp(ws_url, sorted(stages), duration, think, server_pid, seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report['summary'] = summarize(report, think, slo)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, nargs='+', default=list(STAGES), help="concurrent users per stage")
+    parser.add_argument('--duration', type=float, default=STAGE_SECONDS, help="seconds per stage")
+    parser.add_argument('--think', type=float, default=THINK_SECONDS, help="mean think time between actions")
+    parser.add_argument('--url', help="drive an already running server instead of starting one")
+    parser.add_argument('--server-pid', type=int, help="pid of the --url server, for RSS readings")
+    parser.add_argument('--slo', type=float, default=DEFAULT_SLO_SECONDS, help="p95 rerun latency budget (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write the full report as JSON")
+    args = parser.parse_args()
+    
+    report = run(args.users, args.duration, args.think, args.url, args.server_pid, args.slo, args.seed)
+    print(f"{'users':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'eff':>5} {'errors':>6} {'rss':>9}")
+    for stage in report['stages']:
+        rss = f"{stage['rss_mb']:.0f}MB" if stage['rss_mb'] is not None else '-'
+        efficiency = f"{stage['efficiency']:.2f}" if stage['efficiency'] is not None else '-'
+        print(
+            f"{stage['users']:>6} {stage['throughput']:>7.2f} {stage['p50_s']:>7.2f}s {stage['p95_s']:>7.2f}s "
+            f"{stage['p99_s']:>7.2f}s {stage['max_s']:>7.2f}s {efficiency:>5} {stage['errors']:>6} {rss:>9}"
+        )
+    
+    last = report['stages'][-1]
+    print(f"\nlast stage by action ({last['users']} users):")
+    for action, row in last['actions'].items():
+        print(f"  {action:>12} n={row['count']:<5} p50 {row['p50_s']:.2f}s  p95 {row['p95_s']:.2f}s  p99 {row['p99_s']:.2f}s")
+    
+    summary = report['summary']
+    if summary['memory_per_session_mb'] is not None:
+        print(f"\nmemory per session: {summary['memory_per_session_mb']:.2f} MB "
+              f"(server RSS {report['baseline_rss_mb']:.0f}MB after warm-up)")
+    if summary['saturated_at_users'] is None:
+        print(f"no saturation up to {summary['supported_users']} users (p95 SLO {summary['slo_s']:g}s)")
+    else:
+        print(f"saturates at {summary['saturated_at_users']} users; supports ~{summary['supported_users']} "
+              f"(p95 SLO {summary['slo_s']:g}s, efficiency floor {SATURATION_EFFICIENCY:g})")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,328 @@
+"""Benchmark suite for the engines and figure builders, with baseline regression checks.
+
+Every (case, scale) runs in a fresh interpreter so peak RSS is attributed to
+the case that pays it. Scales are corpus sizes: posts ingested into the
+stream pipeline, or records fed to a figure builder. Cases whose inputs don't
+grow with a corpus (RAG analyses read a fixed top-k of chunks and a fixed post
+sample; conflict analyses don't read ingested posts) run once.
+
+    python -m benchmarks.suite                          # 10^3 .. 10^7
+    python -m benchmarks.suite --max-scale 100000 -k rag
+    python -m benchmarks.suite --save-baseline          # writes benchmarks/baseline.json
+    python -m benchmarks.suite --compare                # exit 1 on regressions
+"""
+import argparse
+import fnmatch
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(PROJECT_DIR, 'benchmarks', 'baseline.json')
+
+SCALES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+
+# Timing: keep repeating until both minimums are met, but never past MAX_ROUNDS
+MIN_ROUNDS = 3
+MIN_SECONDS = 0.5
+MAX_ROUNDS = 200
+
+# A case regresses when its median latency (or RSS growth) exceeds the baseline
+# by more than this fraction; RSS growth below the floor is treated as noise
+DEFAULT_MAX_REGRESSION = 0.25
+DEFAULT_MAX_RSS_REGRESSION = 0.5
+RSS_NOISE_FLOOR_MB = 8.0
+
+RAG_QUERY = "Analyze the cultural impact of #AIethics memes"
+
+
+def _ingest_posts(mock_gen, posts: int, seed: int = 0) -> None:
+    """Push `posts` simulated firehose posts through the pipeline, spread over the last 5 minutes"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    counts = rng.multinomial(posts, mock_gen._stream_rates / mock_gen._stream_rates.sum())
+    for batch in mock_gen._simulate_batches(counts, 0, now - timedelta(minutes=5), now, rng):
+        mock_gen.pipeline.ingest(batch)
+
+
+def _trends(count: int) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(0)
+    return [
+        {
+            'topic': f"Topic{i}", 'platform': 'Twitter', 'views': int(rng.integers(1e5, 1e7)),
+            'sentiment_score': float(rng.uniform(-1, 1)), 'controversy': int(rng.integers(20, 95)),
+            'growth_rate': float(rng.uniform(-50, 300)), 'geographic_spread': int(rng.integers(10, 90))
+        }
+        for i in range(count)
+    ]
+
+
+def _locations(count: int) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(0)
+    return [
+        {
+            'lat': float(rng.uniform(-50, 65)), 'lng': float(rng.uniform(-180, 180)),
+            'intensity': int(rng.integers(1, 100)), 'city': f"Bin {i}", 'top_topics': ['AIethics'],
+            'posts': int(rng.integers(1, 5000)), 'engagement': float(rng.uniform(0, 1e5))
+        }
+        for i in range(count)
+    ]
+
+
+# Case setups: scale (or None) -> zero-argument callable to time
+def _setup_analyze_trend(scale):
+    from src.rag_engine import RAGEngine
+    engine = RAGEngine()
+    return lambda: engine.analyze_trend(RAG_QUERY)
+
+
+def _setup_retrieve_chunks(scale):
+    from src.rag_engine import RAGEngine
+    engine = RAGEngine()
+    return lambda: engine._retrieve_chunks(RAG_QUERY)
+
+
+def _setup_analyze_conflict(scale):
+    from src.conflict_detector import ConflictDetector
+    from src.mock_data import MockDataGenerator
+    detector = ConflictDetector(MockDataGenerator())
+    return lambda: detector.analyze_conflict('AIethics')
+
+
+def _setup_detect_conflicts(scale):
+    from src.conflict_detector import ConflictDetector
+    detector = ConflictDetector()
+    return detector.detect_real_time_conflicts
+
+
+def _setup_trending_topics(scale):
+    from src.mock_data import MockDataGenerator
+    mock_gen = MockDataGenerator()
+    _ingest_posts(mock_gen, scale)
+    return mock_gen.generate_trending_topics
+
+
+def _setup_pipeline_ingest(scale):
+    from src.mock_data import MockDataGenerator
+    from src.pipeline import PartitionedPipeline
+    mock_gen = MockDataGenerator()
+    rng = np.random.default_rng(0)
+    now = datetime.now()
+    counts = rng.multinomial(scale, mock_gen._stream_rates / mock_gen._stream_rates.sum())
+    batches = mock_gen._simulate_batches(counts, 0, now - timedelta(minutes=5), now, rng)
+    
+    def ingest():
+        pipeline = PartitionedPipeline(mock_gen.platforms, mock_gen.topics, sources=[])
+        for batch in batches:
+            pipeline.ingest(batch)
+    return ingest
+
+
+def _setup_heatmap(scale):
+    from src.visualizations import create_heatmap
+    locations = _locations(scale)
+    return lambda: create_heatmap(locations)
+
+
+def _setup_trend_radar(scale):
+    from src.visualizations import create_trend_radar
+    trends = _trends(scale)
+    return lambda: create_trend_radar(trends)
+
+
+def _setup_sentiment_chart(scale):
+    from src.visualizations import create_sentiment_chart
+    return create_sentiment_chart
+
+
+def _setup_controversy_timeline(scale):
+    from src.visualizations import create_controversy_timeline
+    # One point every 2 hours
+    return lambda: create_controversy_timeline('AIethics', hours=2 * scale)
+
+
+def _setup_platform_comparison(scale):
+    from src.visualizations import create_platform_comparison
+    return create_platform_comparison
+
+
+# name -> (setup, largest scale or None for corpus-independent cases, throughput is per item)
+CASES: Dict[str, tuple] = {
+    'rag.analyze_trend': (_setup_analyze_trend, None, False),
+    'rag.retrieve_chunks': (_setup_retrieve_chunks, None, False),
+    'conflict.analyze_conflict': (_setup_analyze_conflict, None, False),
+    'conflict.detect_real_time_conflicts': (_setup_detect_conflicts, None, False),
+    'stream.generate_trending_topics': (_setup_trending_topics, 10 ** 7, False),
+    'stream.pipeline_ingest': (_setup_pipeline_ingest, 10 ** 7, True),
+    # Folium markers and plotly points past these sizes are unusable in a browser anyway
+    'viz.create_heatmap': (_setup_heatmap, 10 ** 4, False),
+    'viz.create_trend_radar': (_setup_trend_radar, 10 ** 6, False),
+    'viz.create_sentiment_chart': (_setup_sentiment_chart, None, False),
+    'viz.create_controversy_timeline': (_setup_controversy_timeline, 10 ** 5, False),
+    'viz.create_platform_comparison': (_setup_platform_comparison, None, False)
+}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(case: str, scale: Optional[int]) -> Dict[str, Any]:
+    """Time one case in this process: latency stats, throughput and peak RSS"""
+    setup, _, per_item = CASES[case]
+    rss_before = _peak_rss_mb()
+    fn: Callable[[], Any] = setup(scale)
+    fn()  # warm-up: lazy imports, caches, first stream catch-up
+    
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_ROUNDS and (len(timings) < MIN_ROUNDS or time.perf_counter() - started < MIN_SECONDS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    
+    median = statistics.median(timings)
+    return {
+        'case': case,
+        'scale': scale,
+        'rounds': len(timings),
+        'min_ms': min(timings) * 1000,
+        'median_ms': median * 1000,
+        'mean_ms': statistics.fmean(timings) * 1000,
+        'stdev_ms': statistics.stdev(timings) * 1000 if len(timings) > 1 else 0.0,
+        'throughput_per_s': (scale if per_item else 1) / median if median else float('inf'),
+        'peak_rss_mb': _peak_rss_mb(),
+        'rss_growth_mb': _peak_rss_mb() - rss_before
+    }
+
+
+def measure_in_subprocess(case: str, scale: Optional[int]) -> Dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.suite', '--child', case, str(scale)],
+        capture_output=True, text=True, check=True, cwd=PROJECT_DIR
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def plan(pattern: str = '*', max_scale: int = SCALES[-1]) -> List[tuple]:
+    """(case, scale) pairs to run, smallest scales first"""
+    runs = []
+    for case, (_, case_max, _) in CASES.items():
+        if not fnmatch.fnmatch(case, pattern if any(c in pattern for c in '*?[') else f"*{pattern}*"):
+            continue
+        if case_max is None:
+            runs.append((case, None))
+        else:
+            runs.extend((case, scale) for scale in SCALES if scale <= min(case_max, max_scale))
+    return runs
+
+
+def run(pattern: str = '*', max_scale: int = SCALES[-1],
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    results = []
+    for case, scale in plan(pattern, max_scale):
+        result = measure_in_subprocess(case, scale)
+        results.append(result)
+        if progress:
+            progress(result)
+    return results
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return f"{result['case']}[{result['scale']}]" if result['scale'] is not None else result['case']
+
+
+def save_baseline(results: List[Dict[str, Any]], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'results': {_key(result): result for result in results}
+        }, f, indent=2)
+
+
+def compare(results: List[Dict[str, Any]], path: str, max_regression: float = DEFAULT_MAX_REGRESSION,
+            max_rss_regression: float = DEFAULT_MAX_RSS_REGRESSION) -> List[str]:
+    """Regressions of `results` against the baseline at `path`, as readable lines"""
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    
+    regressions = []
+    for result in results:
+        base = baseline.get(_key(result))
+        if base is None:
+            continue
+        if result['median_ms'] > base['median_ms'] * (1 + max_regression):
+            regressions.append(
+                f"{_key(result)}: median {result['median_ms']:.2f}ms vs baseline {base['median_ms']:.2f}ms "
+                f"(+{(result['median_ms'] / base['median_ms'] - 1) * 100:.0f}%)"
+            )
+        growth_limit = max(base['rss_growth_mb'] * (1 + max_rss_regression), base['rss_growth_mb'] + RSS_NOISE_FLOOR_MB)
+        if result['rss_growth_mb'] > growth_limit:
+            regressions.append(
+                f"{_key(result)}: RSS growth {result['rss_growth_mb']:.1f}MB vs baseline {base['rss_growth_mb']:.1f}MB"
+            )
+    return regressions
+
+
+def _print_row(result: Dict[str, Any]) -> None:
+    scale = f"{result['scale']:,}" if result['scale'] is not None else '-'
+    print(f"{result['case']:<38} {scale:>12} {result['median_ms']:>11.3f} {result['stdev_ms']:>10.3f} "
+          f"{result['throughput_per_s']:>13,.1f} {result['peak_rss_mb']:>9.0f} {result['rss_growth_mb']:>8.1f}",
+          flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ViralPulse benchmark suite")
+    parser.add_argument('-k', '--cases', default='*', help="case name substring or glob")
+    parser.add_argument('--max-scale', type=float, default=SCALES[-1], help="largest corpus size to run")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help="save results as the baseline")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, help="fail on regressions vs this baseline")
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="allowed median latency growth as a fraction (default 0.25)")
+    parser.add_argument('--max-rss-regression', type=float, default=DEFAULT_MAX_RSS_REGRESSION,
+                        help="allowed RSS growth increase as a fraction (default 0.5)")
+    parser.add_argument('--child', nargs=2, metavar=('CASE', 'SCALE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        case, scale = args.child
+        print(json.dumps(measure(case, None if scale == 'None' else int(scale))))
+        return
+    
+    # Fail before spending a full suite run on a comparison that can't happen
+    if args.compare and not os.path.exists(args.compare):
+        print(f"no baseline at {args.compare}, run with --save-baseline first", file=sys.stderr)
+        sys.exit(2)
+    
+    print(f"{'case':<38} {'scale':>12} {'median ms':>11} {'stdev ms':>10} {'throughput/s':>13} {'peak MB':>9} {'+RSS MB':>8}")
+    results = run(args.cases, int(args.max_scale), progress=_print_row)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+        print(f"\nBaseline saved to {args.save_baseline}")
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression, args.max_rss_regression)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
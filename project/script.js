@@ -1,8 +1,51 @@
 // ViralPulse Pro - JavaScript Implementation
+
+// Text from the API (feed hashtags, quotes, alert keywords) goes through this
+// before it is interpolated into HTML templates
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+function escapeHtml(value) {
+    return String(value ?? '').replace(/[&<>"']/g, char => HTML_ESCAPES[char]);
+}
+
+// Client for the headless Python API (python -m src.api). Every method resolves
+// to null when the API is unreachable so callers can fall back to mock data.
+class ApiClient {
+    constructor(baseUrl) {
+        this.baseUrl = baseUrl;
+    }
+
+    async get(path) {
+        try {
+            const response = await fetch(`${this.baseUrl}${path}`);
+            return response.ok ? await response.json() : null;
+        } catch (e) {
+            return null;
+        }
+    }
+
+    getTrends(count = 20) {
+        return this.get(`/api/trends?count=${count}`);
+    }
+
+    getGeo(zoom = 2) {
+        return this.get(`/api/geo?zoom=${zoom}`);
+    }
+
+    analyzeConflict(topic) {
+        return this.get(`/api/conflicts/${encodeURIComponent(topic)}`);
+    }
+
+    analyzeTrend(query) {
+        return this.get(`/api/analyze?q=${encodeURIComponent(query)}`);
+    }
+}
+
 class ViralPulsePro {
     constructor() {
         this.currentTab = 'war-room';
         this.mockData = new MockDataGenerator();
+        this.api = new ApiClient(window.VIRALPULSE_API_URL || 'http://127.0.0.1:8000');
         this.init();
     }
 
@@ -68,9 +111,13 @@ class ViralPulsePro {
         this.loadRadarChart();
     }
 
-    loadTrendingList() {
+    async loadTrendingList() {
+        const trends = await this.api.getTrends() || this.mockData.generateTrendingTopics();
+        this.renderTrendingList(trends);
+    }
+
+    renderTrendingList(trends) {
         const container = document.getElementById('trending-list');
-        const trends = this.mockData.generateTrendingTopics();
         
         container.innerHTML = trends.slice(0, 10).map(trend => {
             const controversyClass = trend.controversy > 70 ? 'controversy-high' : 
@@ -78,7 +125,7 @@ class ViralPulsePro {
             
             return `
                 <div class="trend-item">
-                    <div class="trend-title">#${trend.topic}</div>
+                    <div class="trend-title">#${escapeHtml(trend.topic)}</div>
                     <div class="trend-stats">
                         <span>👁️ ${trend.views.toLocaleString()}</span>
                         <span class="${controversyClass}">🔥 ${trend.controversy}%</span>
@@ -88,11 +135,17 @@ class ViralPulsePro {
         }).join('');
     }
 
-    loadHeatmap() {
+    async loadHeatmap() {
         const container = document.getElementById('heatmap');
         
-        // Create a simple world map visualization
-        const mapData = [
+        // Spatial bins from the API, or a static world sample offline
+        const bins = await this.api.getGeo();
+        const mapData = bins ? bins.map(bin => ({
+            country: `${bin.city} (${bin.top_topics.map(topic => '#' + topic).join(', ')})`,
+            lat: bin.lat,
+            lng: bin.lng,
+            intensity: bin.intensity
+        })) : [
             {country: 'USA', lat: 39.8283, lng: -98.5795, intensity: 85},
             {country: 'UK', lat: 55.3781, lng: -3.4360, intensity: 72},
             {country: 'Germany', lat: 51.1657, lng: 10.4515, intensity: 68},
@@ -184,18 +237,24 @@ class ViralPulsePro {
         this.loadSampleQuotes();
     }
 
-    analyzeConflict() {
+    async analyzeConflict() {
         const quotesContainer = document.getElementById('quotes-container');
         quotesContainer.innerHTML = '<div class="loading">🔍 Analyzing conflict patterns...</div>';
         
-        setTimeout(() => {
+        const selector = document.getElementById('trend-selector');
+        const topic = selector.options[selector.selectedIndex].text.replace('#', '');
+        const analysis = await this.api.analyzeConflict(topic);
+        
+        if (analysis) {
+            document.querySelector('#conflict-results .pro-side .percentage').textContent = `✅ ${analysis.pro_percentage}%`;
+            document.querySelector('#conflict-results .con-side .percentage').textContent = `❌ ${analysis.con_percentage}%`;
+            this.renderQuotes(analysis.pro_quotes, analysis.con_quotes);
+        } else {
             this.loadSampleQuotes();
-        }, 2000);
+        }
     }
 
     loadSampleQuotes() {
-        const quotesContainer = document.getElementById('quotes-container');
-        
         const proQuotes = [
             { text: "AI ethics frameworks are essential for responsible innovation", author: "TechEthicist", credibility: 92 },
             { text: "We need proactive measures, not reactive regulations", author: "AIResearcher", credibility: 88 }
@@ -206,14 +265,20 @@ class ViralPulsePro {
             { text: "Market forces will naturally guide ethical development", author: "VCPartner", credibility: 78 }
         ];
 
+        this.renderQuotes(proQuotes, conQuotes);
+    }
+
+    renderQuotes(proQuotes, conQuotes) {
+        const quotesContainer = document.getElementById('quotes-container');
+        
         quotesContainer.innerHTML = `
             <div>
                 <h4 style="color: #10b981; margin-bottom: 1rem;">🟢 Pro Viewpoint</h4>
                 ${proQuotes.map(quote => `
                     <div class="quote-item" style="border-left-color: #10b981;">
-                        <div class="quote-text">"${quote.text}"</div>
+                        <div class="quote-text">"${escapeHtml(quote.text)}"</div>
                         <div class="quote-author">
-                            @${quote.author}
+                            @${escapeHtml(quote.author)}
                             <span style="float: right; color: #10b981;">🎯 ${quote.credibility}% credible</span>
                         </div>
                     </div>
@@ -223,9 +288,9 @@ class ViralPulsePro {
                 <h4 style="color: #ef4444; margin-bottom: 1rem;">🔴 Con Viewpoint</h4>
                 ${conQuotes.map(quote => `
                     <div class="quote-item" style="border-left-color: #ef4444;">
-                        <div class="quote-text">"${quote.text}"</div>
+                        <div class="quote-text">"${escapeHtml(quote.text)}"</div>
                         <div class="quote-author">
-                            @${quote.author}
+                            @${escapeHtml(quote.author)}
                             <span style="float: right; color: #ef4444;">🎯 ${quote.credibility}% credible</span>
                         </div>
                     </div>
@@ -247,22 +312,26 @@ class ViralPulsePro {
         this.loadSampleChunks();
     }
 
-    performRAGAnalysis() {
+    async performRAGAnalysis() {
         const chunksContainer = document.getElementById('rag-chunks');
         const analysisContainer = document.getElementById('rag-analysis');
         
         chunksContainer.innerHTML = '<div class="loading">🔍 Retrieving relevant chunks...</div>';
         analysisContainer.innerHTML = '<div class="loading">🧠 Generating analysis...</div>';
         
-        setTimeout(() => {
+        const query = document.getElementById('rag-query').value.trim();
+        const analysis = query ? await this.api.analyzeTrend(query) : null;
+        
+        if (analysis) {
+            this.renderChunks(analysis.chunks);
+            this.renderAnalysis(analysis.cultural_origin, analysis.sentiment_breakdown, analysis.toxicity_alert);
+        } else {
             this.loadSampleChunks();
             this.loadSampleAnalysis();
-        }, 2000);
+        }
     }
 
     loadSampleChunks() {
-        const container = document.getElementById('rag-chunks');
-        
         const chunks = [
             { text: "AI ethics discussions have intensified following recent breakthroughs in large language models...", relevance: 0.94 },
             { text: "Tech industry leaders debate the balance between innovation and responsible development...", relevance: 0.89 },
@@ -271,21 +340,35 @@ class ViralPulsePro {
             { text: "International bodies call for coordinated approach to AI regulation...", relevance: 0.78 }
         ];
 
+        this.renderChunks(chunks);
+    }
+
+    renderChunks(chunks) {
+        const container = document.getElementById('rag-chunks');
+        
         container.innerHTML = chunks.map((chunk, i) => `
             <div class="chunk-item">
                 <div class="chunk-relevance">Chunk ${i + 1} - Relevance: ${chunk.relevance.toFixed(3)}</div>
-                <div class="chunk-text">${chunk.text}</div>
+                <div class="chunk-text">${escapeHtml(chunk.text)}</div>
             </div>
         `).join('');
     }
 
     loadSampleAnalysis() {
+        this.renderAnalysis(
+            'The #AIethics movement originated from academic circles and gained mainstream traction following high-profile AI incidents. It represents a convergence of technological advancement concerns and social responsibility advocacy.',
+            [45, 35, 20],
+            true
+        );
+    }
+
+    renderAnalysis(culturalOrigin, sentimentBreakdown, toxicityAlert) {
         const container = document.getElementById('rag-analysis');
         
         container.innerHTML = `
             <div style="margin-bottom: 2rem;">
                 <h4>Cultural Origin Summary</h4>
-                <p style="color: #94a3b8;">The #AIethics movement originated from academic circles and gained mainstream traction following high-profile AI incidents. It represents a convergence of technological advancement concerns and social responsibility advocacy.</p>
+                <p style="color: #94a3b8;">${escapeHtml(culturalOrigin)}</p>
             </div>
             
             <div style="margin-bottom: 2rem;">
@@ -293,14 +376,15 @@ class ViralPulsePro {
                 <div id="sentiment-pie" style="height: 300px;"></div>
             </div>
             
+            ${toxicityAlert ? `
             <div class="alert-card">
-                ⚠️ <strong>Toxicity Alert:</strong> Moderate levels of toxic content detected in discussions (23% of analyzed posts).
-            </div>
+                ⚠️ <strong>Toxicity Alert:</strong> Elevated levels of toxic content detected in discussions.
+            </div>` : ''}
         `;
 
         // Create sentiment pie chart
         const sentimentData = [{
-            values: [45, 35, 20],
+            values: sentimentBreakdown,
             labels: ['Positive', 'Neutral', 'Negative'],
             type: 'pie',
             marker: {
@@ -367,9 +451,9 @@ class ViralPulsePro {
 
         container.innerHTML = notifications.map(notif => `
             <div class="notification-item">
-                <div class="notification-title">${notif.title}</div>
-                <div class="notification-message">${notif.message}</div>
-                <div class="notification-time">${notif.time}</div>
+                <div class="notification-title">${escapeHtml(notif.title)}</div>
+                <div class="notification-message">${escapeHtml(notif.message)}</div>
+                <div class="notification-time">${escapeHtml(notif.time)}</div>
             </div>
         `).join('');
     }
@@ -461,6 +545,79 @@ class ViralPulsePro {
     }
 
     startLiveUpdates() {
+        // Prefer the API's push channel; fall back to polling local mock data
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+
+        this.liveTrends = new Map();
+        const source = new EventSource(`${this.api.baseUrl}/api/stream`);
+        let opened = false;
+
+        source.onopen = () => { opened = true; };
+        source.onerror = () => {
+            // EventSource reconnects (resending Last-Event-ID) on its own once it has
+            // connected; if the API was never reachable, give up and poll instead.
+            if (!opened) {
+                source.close();
+                this.startPolling();
+            }
+        };
+
+        const payloadOf = (e) => JSON.parse(e.data).payload;
+        source.addEventListener('trend.new', e => {
+            const trend = payloadOf(e);
+            this.liveTrends.set(trend.topic, trend);
+            this.scheduleTrendRender();
+        });
+        source.addEventListener('trend.update', e => {
+            const update = payloadOf(e);
+            const trend = this.liveTrends.get(update.topic);
+            if (trend) {
+                trend.controversy = update.controversy;
+                trend.views = update.views;
+                this.scheduleTrendRender();
+            }
+        });
+        source.addEventListener('trend.expired', e => {
+            this.liveTrends.delete(payloadOf(e).topic);
+            this.scheduleTrendRender();
+        });
+        source.addEventListener('resync', async () => {
+            // We fell behind the stream; rebuild from a fresh snapshot
+            const trends = await this.api.getTrends() || [];
+            this.liveTrends = new Map(trends.map(trend => [trend.topic, trend]));
+            this.scheduleTrendRender();
+        });
+        source.addEventListener('alert.fired', e => this.showNotification(payloadOf(e)));
+    }
+
+    scheduleTrendRender() {
+        // Coalesce bursts of deltas into one render per frame
+        if (this.trendRenderPending) return;
+        this.trendRenderPending = true;
+        requestAnimationFrame(() => {
+            this.trendRenderPending = false;
+            if (this.currentTab === 'war-room') {
+                const trends = [...this.liveTrends.values()].sort((a, b) => b.views - a.views);
+                this.renderTrendingList(trends);
+            }
+        });
+    }
+
+    showNotification(notification) {
+        const container = document.getElementById('notifications');
+        container.insertAdjacentHTML('afterbegin', `
+            <div class="notification-item">
+                <div class="notification-title">${escapeHtml(notification.title)}</div>
+                <div class="notification-message">${escapeHtml(notification.message)}</div>
+                <div class="notification-time">Just now</div>
+            </div>
+        `);
+    }
+
+    startPolling() {
         // Simulate live updates every 30 seconds
         setInterval(() => {
             if (this.currentTab === 'war-room') {
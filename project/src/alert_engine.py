@@ -0,0 +1,205 @@
+import bisect
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.keyword_matcher import KeywordMatcher, normalize_phrase
+
+# Alert types offered in the Alert Center
+CONTROVERSY = "Controversy Score"
+SENTIMENT_SHIFT = "Sentiment Shift"
+VIRAL = "Viral Threshold"
+KEYWORD = "Keyword Detection"
+THRESHOLD_TYPES = (CONTROVERSY, SENTIMENT_SHIFT, VIRAL)
+
+# Views at which a trend counts as 100% viral on the 0-100 trigger scale
+VIRAL_VIEWS_AT_MAX = 5_000_000
+
+ANY_TOPIC = '*'
+
+def normalize_keyword(keyword: str) -> str:
+    """Case-fold and drop hashtags so '#AIethics' and 'aiethics' match"""
+    return normalize_phrase(keyword)
+
+def parse_keywords(keywords: str) -> List[str]:
+    """Split the Alert Center's comma-separated keyword field"""
+    return [k for k in (normalize_keyword(part) for part in (keywords or '').split(',')) if k]
+
+def _severity(alert_type: str) -> str:
+    return {CONTROVERSY: 'danger', VIRAL: 'success'}.get(alert_type, 'info')
+
+def _title(alert_type: str) -> str:
+    return {
+        CONTROVERSY: '🚨 HIGH CONTROVERSY ALERT',
+        SENTIMENT_SHIFT: '😊 SENTIMENT SHIFT',
+        VIRAL: '📈 VIRAL THRESHOLD',
+        KEYWORD: '🔎 KEYWORD DETECTED'
+    }[alert_type]
+
+class ThresholdIndex:
+    """Rules of one type and scope, kept sorted by trigger value
+    
+    Every rule with trigger <= metric fires, which is a prefix of the sorted
+    list found with one bisect instead of a scan over all rules.
+    """
+    
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []  # (trigger, alert_id)
+    
+    def add(self, trigger: float, alert_id: int) -> None:
+        bisect.insort(self.keys, (trigger, alert_id))
+    
+    def remove(self, trigger: float, alert_id: int) -> None:
+        i = bisect.bisect_left(self.keys, (trigger, alert_id))
+        if i < len(self.keys) and self.keys[i] == (trigger, alert_id):
+            del self.keys[i]
+    
+    def fired(self, value: float) -> List[Tuple[float, int]]:
+        return self.keys[:bisect.bisect_right(self.keys, (value, float('inf')))]
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+
+class AlertEngine:
+    """Evaluate trend updates against all active alerts using per-type indexes
+    
+    Threshold alerts (controversy, sentiment shift, virality) are indexed by
+    type and topic scope; an alert's keywords, if any, scope it to those
+    topics. Keyword alerts live in an Aho-Corasick automaton, so an update's
+    text is scanned once for the keywords of every alert.
+    """
+    
+    def __init__(self, cooldown_seconds: float = 300):
+        self.cooldown_seconds = cooldown_seconds
+        self.rules: Dict[int, Dict[str, Any]] = {}
+        self.thresholds: Dict[Tuple[str, str], ThresholdIndex] = defaultdict(ThresholdIndex)
+        self.keywords = KeywordMatcher()
+        self.last_sentiment: Dict[Tuple[str, Optional[str]], float] = {}  # (topic, platform) -> latest score
+        self.last_fired: Dict[Tuple[int, str], datetime] = {}
+    
+    def _scopes(self, alert: Dict[str, Any]) -> List[str]:
+        return parse_keywords(alert.get('keywords', '')) or [ANY_TOPIC]
+    
+    def add_rule(self, alert: Dict[str, Any]) -> None:
+        """Index an alert; re-adding an id replaces the previous rule"""
+        self.remove_rule(alert['id'])
+        self.rules[alert['id']] = alert
+        
+        if alert['type'] == KEYWORD:
+            for keyword in parse_keywords(alert.get('keywords', '')):
+                self.keywords.add(keyword, alert['id'])
+        else:
+            for scope in self._scopes(alert):
+                self.thresholds[(alert['type'], scope)].add(float(alert['trigger']), alert['id'])
+    
+    def remove_rule(self, alert_id: int) -> None:
+        alert = self.rules.pop(alert_id, None)
+        if alert is None:
+            return
+        
+        if alert['type'] == KEYWORD:
+            for keyword in parse_keywords(alert.get('keywords', '')):
+                self.keywords.remove(keyword, alert_id)
+        else:
+            for scope in self._scopes(alert):
+                index = self.thresholds[(alert['type'], scope)]
+                index.remove(float(alert['trigger']), alert_id)
+                if not index:
+                    del self.thresholds[(alert['type'], scope)]
+        
+        for key in [k for k in self.last_fired if k[0] == alert_id]:
+            del self.last_fired[key]
+    
+    def sync(self, alerts: List[Dict[str, Any]]) -> None:
+        """Bring the index in line with a list of alerts: adds, deletes and edited rules"""
+        wanted = {alert['id']: alert for alert in alerts if alert.get('status', 'Active') == 'Active'}
+        for alert_id in list(self.rules):
+            if alert_id not in wanted or wanted[alert_id] != self.rules[alert_id]:
+                self.remove_rule(alert_id)
+        for alert_id, alert in wanted.items():
+            if alert_id not in self.rules:
+                self.add_rule(alert)
+    
+    def _metrics(self, update: Dict[str, Any], topic: str) -> Dict[str, float]:
+        metrics = {}
+        if 'controversy' in update:
+            metrics[CONTROVERSY] = float(update['controversy'])
+        if 'views' in update:
+            metrics[VIRAL] = min(100.0, update['views'] / VIRAL_VIEWS_AT_MAX * 100)
+        if 'sentiment_score' in update:
+            # Compare against this topic's previous reading on the same platform: one
+            # batch carries a topic once per platform, and those readings differ by source
+            stream = (topic, update.get('platform'))
+            previous = self.last_sentiment.get(stream)
+            self.last_sentiment[stream] = update['sentiment_score']
+            if previous is not None:
+                # A full swing from -1 to +1 is a 100% shift
+                metrics[SENTIMENT_SHIFT] = abs(update['sentiment_score'] - previous) * 50
+        return metrics
+    
+    def _cooling_down(self, alert_id: int, topic: str, now: datetime) -> bool:
+        last = self.last_fired.get((alert_id, topic))
+        if last is not None and (now - last).total_seconds() < self.cooldown_seconds:
+            return True
+        self.last_fired[(alert_id, topic)] = now
+        return False
+    
+    def evaluate(self, update: Dict[str, Any], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Check one trend/conflict update against every active alert"""
+        now = now or datetime.now()
+        topic = update.get('topic', '')
+        scopes = (ANY_TOPIC, normalize_keyword(topic))
+        notifications = []
+        
+        for alert_type, value in self._metrics(update, scopes[1]).items():
+            for scope in scopes:
+                index = self.thresholds.get((alert_type, scope))
+                if index is None:
+                    continue
+                for trigger, alert_id in index.fired(value):
+                    if not self._cooling_down(alert_id, topic, now):
+                        notifications.append(self._notification(alert_id, topic, value, now))
+        
+        if len(self.keywords):
+            text = f"{topic} {update.get('text', '')}"
+            for alert_id, keywords in self.keywords.matched_owners(text).items():
+                if not self._cooling_down(alert_id, topic, now):
+                    notifications.append(self._notification(alert_id, topic, None, now, keywords[0]))
+        
+        return notifications
+    
+    def evaluate_many(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        now = datetime.now()
+        return [n for update in updates for n in self.evaluate(update, now)]
+    
+    def _notification(self, alert_id: int, topic: str, value: Optional[float],
+                      now: datetime, keyword: Optional[str] = None) -> Dict[str, Any]:
+        alert = self.rules[alert_id]
+        if alert['type'] == KEYWORD:
+            message = f"#{topic} mentions '{keyword}'"
+        elif alert['type'] == SENTIMENT_SHIFT:
+            message = f"#{topic} sentiment shifted {value:.0f}% (trigger: {alert['trigger']}%)"
+        elif alert['type'] == VIRAL:
+            message = f"#{topic} virality reached {value:.0f}% (trigger: {alert['trigger']}%)"
+        else:
+            message = f"#{topic} controversy score reached {value:.0f}% (trigger: {alert['trigger']}%)"
+        
+        return {
+            'alert_id': alert_id,
+            'type': alert['type'],
+            'topic': topic,
+            'title': _title(alert['type']),
+            'message': message,
+            'value': value,
+            'trigger': alert['trigger'],
+            'severity': _severity(alert['type']),
+            'methods': alert.get('methods', []),
+            'time': now
+        }
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'rules': len(self.rules),
+            'threshold_indexes': len(self.thresholds),
+            'keywords': len(self.keywords)
+        }
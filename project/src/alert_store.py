@@ -0,0 +1,198 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DATA_DIR = os.environ.get(
+    'VIRALPULSE_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+)
+
+# Notifications are kept for this long, and at most this many, pruned as new ones are added
+NOTIFICATION_RETENTION_DAYS = 30
+MAX_NOTIFICATIONS = 100_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL DEFAULT 'default',
+    type TEXT NOT NULL,
+    trigger REAL NOT NULL,
+    keywords TEXT NOT NULL DEFAULT '',
+    methods TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL DEFAULT 'Active',
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_owner ON alerts (owner, status);
+
+-- Bumped once per inserted, edited or deleted alert row, by any process, so
+-- evaluators can tell whether their loaded rules are stale with one lookup
+CREATE TABLE IF NOT EXISTS alerts_version (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO alerts_version (id, version) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS alerts_inserted AFTER INSERT ON alerts
+BEGIN UPDATE alerts_version SET version = version + 1 WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS alerts_updated AFTER UPDATE ON alerts
+BEGIN UPDATE alerts_version SET version = version + 1 WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS alerts_deleted AFTER DELETE ON alerts
+BEGIN UPDATE alerts_version SET version = version + 1 WHERE id = 0; END;
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    value REAL,
+    trigger REAL,
+    methods TEXT NOT NULL DEFAULT '[]',
+    time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notifications_time ON notifications (time);
+
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    status TEXT NOT NULL,
+    messages INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    time TEXT NOT NULL
+);
+"""
+
+class AlertStore:
+    """Durable alerts, notifications and delivery log in SQLite (WAL mode)
+    
+    One connection is shared across threads behind a lock; WAL keeps readers
+    (other processes, e.g. the API) from blocking on writes.
+    """
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(DEFAULT_DATA_DIR, 'viralpulse.db')
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript(_SCHEMA)
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _alert_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'owner': row['owner'],
+            'type': row['type'],
+            'trigger': row['trigger'],
+            'keywords': row['keywords'],
+            'methods': json.loads(row['methods']),
+            'status': row['status'],
+            'created': datetime.fromisoformat(row['created'])
+        }
+    
+    def add_alert(self, alert: Dict[str, Any], owner: str = 'default') -> Dict[str, Any]:
+        """Persist a new alert; returns it with its assigned id"""
+        created = alert.get('created') or datetime.now()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO alerts (owner, type, trigger, keywords, methods, status, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (owner, alert['type'], float(alert['trigger']), alert.get('keywords', ''),
+                 json.dumps(list(alert.get('methods', []))), alert.get('status', 'Active'), created.isoformat())
+            )
+        return {**alert, 'id': cursor.lastrowid, 'owner': owner, 'status': alert.get('status', 'Active'), 'created': created}
+    
+    def delete_alert(self, alert_id: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+        return cursor.rowcount > 0
+    
+    def list_alerts(self, owner: Optional[str] = None, active_only: bool = False) -> List[Dict[str, Any]]:
+        query = "SELECT * FROM alerts WHERE 1 = 1"
+        params: list = []
+        if owner is not None:
+            query += " AND owner = ?"
+            params.append(owner)
+        if active_only:
+            query += " AND status = 'Active'"
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [self._alert_from_row(row) for row in rows]
+    
+    def alerts_version(self) -> int:
+        """Counter bumped by every change to the alerts table, from any connection"""
+        with self._lock:
+            return self._conn.execute("SELECT version FROM alerts_version WHERE id = 0").fetchone()[0]
+    
+    def count_alerts(self, owner: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM alerts WHERE owner = ?", (owner,)).fetchone()[0]
+    
+    def add_notifications(self, notifications: List[Dict[str, Any]]) -> None:
+        """Append fired notifications in one transaction, pruning those past retention"""
+        if not notifications:
+            return
+        rows = [
+            (n['alert_id'], n['type'], n['topic'], n['title'], n['message'], n['severity'],
+             n.get('value'), n.get('trigger'), json.dumps(list(n.get('methods', []))), n['time'].isoformat())
+            for n in notifications
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO notifications (alert_id, type, topic, title, message, severity, value, trigger, methods, time) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            cutoff = (datetime.now() - timedelta(days=NOTIFICATION_RETENTION_DAYS)).isoformat()
+            self._conn.execute("DELETE FROM notifications WHERE time < ?", (cutoff,))
+            self._conn.execute(
+                "DELETE FROM notifications WHERE id <= (SELECT id FROM notifications ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (MAX_NOTIFICATIONS,)
+            )
+            self._conn.execute("COMMIT")
+    
+    def recent_notifications(self, limit: int = 50, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT n.* FROM notifications n"
+        params: list = []
+        if owner is not None:
+            query += " JOIN alerts a ON a.id = n.alert_id WHERE a.owner = ?"
+            params.append(owner)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY n.id DESC LIMIT ?", params + [limit]).fetchall()
+        return [
+            {**dict(row), 'methods': json.loads(row['methods']), 'time': datetime.fromisoformat(row['time'])}
+            for row in rows
+        ]
+    
+    def record_delivery(self, channel: str, status: str, messages: int, attempts: int,
+                        error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO deliveries (channel, status, messages, attempts, error, time) VALUES (?, ?, ?, ?, ?, ?)",
+                (channel, status, messages, attempts, error, datetime.now().isoformat())
+            )
+    
+    def delivery_stats(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Delivery batches and the messages in them, per channel and status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel, status, COUNT(*) AS batches, SUM(messages) AS messages FROM deliveries GROUP BY channel, status"
+            ).fetchall()
+        stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for row in rows:
+            stats.setdefault(row['channel'], {})[row['status']] = {'batches': row['batches'], 'messages': row['messages']}
+        return stats
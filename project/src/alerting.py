@@ -0,0 +1,78 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.alert_engine import AlertEngine, KEYWORD, THRESHOLD_TYPES
+from src.alert_store import AlertStore
+from src.dispatch import Dispatcher
+
+class AlertService:
+    """Durable alerts evaluated by one shared engine
+    
+    Alerts live in the AlertStore, so they survive reloads and restarts and
+    are visible to every process using the same database. Fired
+    notifications are persisted and handed to the Dispatcher for delivery.
+    """
+    
+    def __init__(self, store: AlertStore, dispatcher: Optional[Dispatcher] = None,
+                 engine: Optional[AlertEngine] = None, max_alerts_per_owner: int = 1000):
+        self.store = store
+        self.dispatcher = dispatcher
+        self.engine = engine or AlertEngine()
+        self.max_alerts_per_owner = max_alerts_per_owner
+        self._lock = threading.Lock()
+        self._loaded_version = None
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """Reload rules if anything (another process included) changed the stored alerts since the last load"""
+        version = self.store.alerts_version()
+        if version == self._loaded_version:
+            return
+        with self._lock:
+            self.engine.sync(self.store.list_alerts(active_only=True))
+            self._loaded_version = version
+    
+    def _applied_locally(self) -> None:
+        # Our own single-row change bumped the version by exactly one; anything
+        # more means another writer got in too, so leave it for refresh() to reload
+        version = self.store.alerts_version()
+        if self._loaded_version is not None and version == self._loaded_version + 1:
+            self._loaded_version = version
+    
+    def create_alert(self, alert: Dict[str, Any], owner: str = 'default') -> Dict[str, Any]:
+        if alert['type'] not in THRESHOLD_TYPES + (KEYWORD,):
+            raise ValueError(f"Unknown alert type: {alert['type']}")
+        if self.store.count_alerts(owner) >= self.max_alerts_per_owner:
+            raise ValueError(f"Alert limit reached ({self.max_alerts_per_owner})")
+        
+        stored = self.store.add_alert(alert, owner)
+        with self._lock:
+            self.engine.add_rule(stored)
+            self._applied_locally()
+        return stored
+    
+    def delete_alert(self, alert_id: int) -> bool:
+        deleted = self.store.delete_alert(alert_id)
+        with self._lock:
+            self.engine.remove_rule(alert_id)
+            if deleted:
+                self._applied_locally()
+        return deleted
+    
+    def list_alerts(self, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.store.list_alerts(owner)
+    
+    def process(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Evaluate updates, then persist and dispatch whatever fired"""
+        self.refresh()
+        with self._lock:
+            notifications = self.engine.evaluate_many(updates)
+        
+        if notifications:
+            self.store.add_notifications(notifications)
+            if self.dispatcher is not None:
+                self.dispatcher.submit(notifications)
+        return notifications
+    
+    def recent_notifications(self, limit: int = 50, owner: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.store.recent_notifications(limit, owner)
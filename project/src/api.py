@@ -0,0 +1,344 @@
+"""Headless JSON API over the analysis engines.
+
+Serves the same analyses as the Streamlit app without rerun overhead, for the
+static frontend and for load-testing the engines on their own.
+
+    python -m src.api --port 8000
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import anyio
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from src.alert_store import AlertStore
+from src.alerting import AlertService
+from src.dispatch import CHANNELS, Dispatcher
+from src.generation import GenerationError, PREFIX_SLOTS
+from src.conflict_detector import ConflictDetector
+from src.live_feed import Broadcaster, LiveFeedProducer
+from src.metrics import PROMETHEUS_CONTENT_TYPE, REGISTRY
+from src.mock_data import MockDataGenerator
+from src.rag_engine import RAGEngine
+from src.serialization import dumps, loads
+from src.stages import StageTimeout
+
+# Engine calls are synchronous and CPU-bound; they run on worker threads, with
+# at most this many in flight so a burst of requests can't starve the event loop.
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get('VIRALPULSE_API_CONCURRENCY', '8'))
+
+# Answers streamed at once; each holds a model slot for seconds, so they are
+# limited separately from the short analysis calls above
+DEFAULT_MAX_GENERATIONS = int(os.environ.get('VIRALPULSE_API_GENERATIONS', str(PREFIX_SLOTS)))
+
+# Seconds between live-feed polls, and between keep-alive comments on idle streams
+DEFAULT_LIVE_INTERVAL = float(os.environ.get('VIRALPULSE_LIVE_INTERVAL', '5'))
+HEARTBEAT_SECONDS = 15.0
+
+# Serve the metrics registry at /metrics in Prometheus text format
+DEFAULT_EXPOSE_METRICS = os.environ.get('VIRALPULSE_METRICS', '') == '1'
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when available"""
+    
+    media_type = 'application/json'
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _error(status_code: int, message: str) -> FastJSONResponse:
+    return FastJSONResponse({'error': message}, status_code=status_code)
+
+
+def _last_seq(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def create_app(max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+               live_interval: Optional[float] = DEFAULT_LIVE_INTERVAL,
+               store_path: Optional[str] = None,
+               expose_metrics: bool = DEFAULT_EXPOSE_METRICS,
+               max_generations: int = DEFAULT_MAX_GENERATIONS) -> Starlette:
+    """Build the API application with its own engine instances
+    
+    `live_interval=None` disables the background live-feed producer. Alerts
+    are read from and written to the same SQLite store as the dashboard
+    unless `store_path` points elsewhere. `expose_metrics` adds a Prometheus
+    scrape endpoint at /metrics. At most `max_generations` answers stream
+    from /api/answer at once.
+    """
+    
+    mock_gen = MockDataGenerator()
+    conflict_detector = ConflictDetector(mock_gen)
+    rag_engine = RAGEngine(mock_gen)
+    limiter = anyio.CapacityLimiter(max_concurrency)
+    generation_limiter = anyio.CapacityLimiter(max_generations)
+    broadcaster = Broadcaster()
+    store = AlertStore(store_path)
+    dispatcher = Dispatcher(store)
+    alert_service = AlertService(store, dispatcher)
+    producer = LiveFeedProducer(broadcaster, mock_gen, conflict_detector, interval=live_interval or 0,
+                                alert_evaluator=alert_service.process)
+    
+    async def run_engine(fn: Callable, *args) -> Any:
+        return await anyio.to_thread.run_sync(fn, *args, limiter=limiter)
+    
+    async def health(request: Request) -> FastJSONResponse:
+        return FastJSONResponse({'status': 'ok'})
+    
+    def platform_param(request: Request) -> Optional[str]:
+        platform = request.query_params.get('platform', 'All')
+        if platform != 'All' and platform not in mock_gen.platforms:
+            raise ValueError(f"platform must be one of: All, {', '.join(mock_gen.platforms)}")
+        return None if platform == 'All' else platform
+    
+    async def trends(request: Request) -> FastJSONResponse:
+        try:
+            platform = platform_param(request)
+        except ValueError as e:
+            return _error(400, str(e))
+        try:
+            count = int(request.query_params.get('count', 20))
+        except ValueError:
+            return _error(400, "count must be an integer")
+        if not 1 <= count <= 1000:
+            return _error(400, "count must be between 1 and 1000")
+        return FastJSONResponse(await run_engine(mock_gen.generate_trending_topics, count, platform))
+    
+    async def geo(request: Request) -> FastJSONResponse:
+        try:
+            platform = platform_param(request)
+        except ValueError as e:
+            return _error(400, str(e))
+        try:
+            zoom = int(request.query_params.get('zoom', 2))
+        except ValueError:
+            return _error(400, "zoom must be an integer")
+        if not 0 <= zoom <= 18:
+            return _error(400, "zoom must be between 0 and 18")
+        return FastJSONResponse(await run_engine(mock_gen.generate_geographic_data, zoom, 60, platform))
+    
+    async def live_conflicts(request: Request) -> FastJSONResponse:
+        return FastJSONResponse(await run_engine(conflict_detector.detect_real_time_conflicts))
+    
+    async def conflict(request: Request) -> FastJSONResponse:
+        topic = request.path_params['topic'].lstrip('#')
+        if not topic:
+            return _error(400, "topic is required")
+        try:
+            async with limiter:
+                return FastJSONResponse(await conflict_detector.analyze_conflict_async(topic))
+        except StageTimeout as e:
+            return _error(504, str(e))
+    
+    async def analyze(request: Request) -> FastJSONResponse:
+        if request.method == 'POST':
+            try:
+                query = (loads(await request.body()) or {}).get('query', '')
+            except (ValueError, AttributeError):
+                return _error(400, "body must be a JSON object with a 'query' field")
+        else:
+            query = request.query_params.get('q', '')
+        if not isinstance(query, str) or not query.strip():
+            return _error(400, "query is required")
+        try:
+            async with limiter:
+                return FastJSONResponse(await rag_engine.analyze_trend_async(query))
+        except StageTimeout as e:
+            return _error(504, str(e))
+    
+    async def answer(request: Request) -> Response:
+        query = request.query_params.get('q', '')
+        if not query.strip():
+            return _error(400, "query is required")
+        try:
+            async with limiter:
+                analysis = await rag_engine.analyze_trend_async(query)
+        except StageTimeout as e:
+            return _error(504, str(e))
+        
+        # Sent as server-sent events: the analysis, then answer text as it is generated, then the stats.
+        # The generation slot is held until the stream ends or the client goes away.
+        async def frames():
+            async with generation_limiter:
+                yield b"event: analysis\ndata: " + dumps(analysis) + b"\n\n"
+                try:
+                    # Each token is pulled on a worker thread, so a slow backend doesn't block the loop
+                    async for piece in iterate_in_threadpool(rag_engine.stream_answer(analysis)):
+                        yield b"event: token\ndata: " + dumps({'text': piece}) + b"\n\n"
+                except GenerationError:
+                    pass
+                yield b"event: done\ndata: " + dumps(analysis['generation']) + b"\n\n"
+        
+        return StreamingResponse(frames(), media_type='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+    
+    async def alerts(request: Request) -> FastJSONResponse:
+        if request.method == 'GET':
+            return FastJSONResponse(await run_engine(alert_service.list_alerts))
+        
+        try:
+            body = loads(await request.body())
+            alert = {
+                'type': body['type'],
+                'trigger': float(body.get('trigger', 80)),
+                'keywords': str(body.get('keywords', '')),
+                'methods': body.get('methods', []),
+                'created': datetime.now()
+            }
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return _error(400, "body must be a JSON object with 'type' and numeric 'trigger'")
+        methods = body.get('methods', [])
+        if not isinstance(methods, list) or not all(method in CHANNELS for method in methods):
+            return _error(400, f"'methods' must be a list of channels from {', '.join(CHANNELS)}")
+        
+        try:
+            created = await run_engine(alert_service.create_alert, alert, str(body.get('owner', 'default')))
+        except ValueError as e:
+            return _error(400, str(e))
+        return FastJSONResponse(created, status_code=201)
+    
+    async def delete_alert(request: Request) -> FastJSONResponse:
+        try:
+            alert_id = int(request.path_params['alert_id'])
+        except ValueError:
+            return _error(400, "alert id must be an integer")
+        if not await run_engine(alert_service.delete_alert, alert_id):
+            return _error(404, f"no alert with id {alert_id}")
+        return FastJSONResponse({'deleted': alert_id})
+    
+    async def notifications(request: Request) -> FastJSONResponse:
+        return FastJSONResponse(await run_engine(alert_service.recent_notifications))
+    
+    async def stream(request: Request) -> StreamingResponse:
+        # EventSource resends the last id it saw on reconnect; ?since= works for manual clients
+        last_seq = _last_seq(request.headers.get('last-event-id') or request.query_params.get('since'))
+        subscription = broadcaster.subscribe(last_seq)
+        
+        async def frames():
+            try:
+                while True:
+                    try:
+                        event = await asyncio.wait_for(subscription.get(), HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+                        continue
+                    yield event.sse
+            finally:
+                broadcaster.unsubscribe(subscription)
+        
+        return StreamingResponse(frames(), media_type='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+    
+    async def websocket_stream(websocket: WebSocket) -> None:
+        await websocket.accept()
+        subscription = broadcaster.subscribe(_last_seq(websocket.query_params.get('since')))
+        
+        async def pump():
+            while True:
+                event = await subscription.get()
+                await websocket.send_text(event.data)
+        
+        # Idle viewers are blocked in subscription.get(), so watch the receive side
+        # to notice disconnects promptly instead of on the next send.
+        pump_task = asyncio.create_task(pump())
+        try:
+            while (await websocket.receive())['type'] != 'websocket.disconnect':
+                pass
+        finally:
+            pump_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+                await pump_task
+            broadcaster.unsubscribe(subscription)
+    
+    async def stream_stats(request: Request) -> FastJSONResponse:
+        return FastJSONResponse(broadcaster.stats())
+    
+    async def metrics(request: Request) -> Response:
+        return Response(REGISTRY.exposition(), media_type=PROMETHEUS_CONTENT_TYPE)
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        dispatcher.start()
+        task = asyncio.create_task(producer.run()) if live_interval else None
+        try:
+            yield
+        finally:
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+            await asyncio.to_thread(dispatcher.stop)
+    
+    routes = [
+        Route('/api/health', health),
+        Route('/api/trends', trends),
+        Route('/api/geo', geo),
+        Route('/api/conflicts/live', live_conflicts),
+        Route('/api/conflicts/{topic}', conflict),
+        Route('/api/analyze', analyze, methods=['GET', 'POST']),
+        Route('/api/answer', answer),
+        Route('/api/alerts', alerts, methods=['GET', 'POST']),
+        Route('/api/alerts/{alert_id}', delete_alert, methods=['DELETE']),
+        Route('/api/notifications', notifications),
+        Route('/api/stream', stream),
+        Route('/api/stream/stats', stream_stats),
+        WebSocketRoute('/api/ws', websocket_stream)
+    ]
+    if expose_metrics:
+        routes.append(Route('/metrics', metrics))
+    
+    middleware = [
+        # The static frontend is served separately (vite), so allow cross-origin reads
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['GET', 'POST', 'DELETE'], allow_headers=['*'])
+    ]
+    
+    app = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+    app.state.mock_gen = mock_gen
+    app.state.conflict_detector = conflict_detector
+    app.state.rag_engine = rag_engine
+    app.state.broadcaster = broadcaster
+    app.state.alert_service = alert_service
+    app.state.live_producer = producer
+    return app
+
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="ViralPulse headless API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument('--live-interval', type=float, default=DEFAULT_LIVE_INTERVAL,
+                        help="seconds between live-feed polls (0 disables the push channel producer)")
+    parser.add_argument('--metrics', action='store_true', default=DEFAULT_EXPOSE_METRICS,
+                        help="serve Prometheus metrics at /metrics")
+    args = parser.parse_args()
+    
+    app = create_app(args.max_concurrency, args.live_interval, expose_metrics=args.metrics)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,522 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src import serialization
+from src.alert_store import DEFAULT_DATA_DIR
+from src.geo import GeoIndex, _Aggregate
+from src.ingest import PostBatch
+from src.metrics import STATE_RECOVERY_SECONDS, STATE_SNAPSHOT_SECONDS, STATE_SNAPSHOTS, STATE_WAL_BYTES
+from src.pipeline import Partition
+from src.reach import HyperLogLog, ReachTracker
+from src.rollup import RollupCell, RollupCube
+from src.trend_detector import CountMinSketch, SpaceSaving, TrendDetector, _Window
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; metadata falls back to JSON
+    msgpack = None
+
+# Record kinds in the write-ahead log: the pipeline's three inputs
+BATCH, SENTIMENT, WATERMARK = 1, 2, 3
+
+# Record header: sequence number, kind, payload length, CRC-32 of the payload
+_HEADER = struct.Struct('<QBII')
+_META_LENGTH = struct.Struct('<I')
+
+# A new segment is started past this size; only whole segments are deleted
+SEGMENT_BYTES = 64 * 1024 ** 2
+
+# Snapshot once this much log or this many records have accumulated, or this
+# long has passed, checked after every input; a snapshot of the full pipeline
+# is about 16MB and takes ~50ms, while one firehose catch-up logs ~3MB per window
+SNAPSHOT_WAL_BYTES = 8 * 1024 ** 2
+SNAPSHOT_WAL_RECORDS = 64
+SNAPSHOT_SECONDS = 600.0
+
+# Recovery replays at most this much log after the snapshot; anything past it
+# (only possible if snapshots kept failing) is dropped and a snapshot taken at once
+MAX_REPLAY_BYTES = 4 * SNAPSHOT_WAL_BYTES
+
+# Snapshots kept; the log is trimmed to the oldest, so a damaged newest one can fall back
+KEEP_SNAPSHOTS = 2
+
+SNAPSHOT_VERSION = 1
+
+# Classes whose instances may appear in a snapshot, restored without running __init__
+_STATE_TYPES = {cls.__name__: cls for cls in (
+    Partition, CountMinSketch, SpaceSaving, _Window, TrendDetector, HyperLogLog, ReachTracker,
+    _Aggregate, GeoIndex, RollupCell, RollupCube
+)}
+_DEFAULT_FACTORIES = {dict: 'dict', list: 'list'}
+
+def _dump_meta(obj: Any) -> bytes:
+    """msgpack when installed, JSON otherwise; the first byte records which"""
+    if msgpack is not None:
+        return b'M' + msgpack.packb(obj, use_bin_type=True)
+    return b'J' + serialization.dumps(obj)
+
+def _load_meta(data: bytes) -> Any:
+    if data[:1] == b'M':
+        if msgpack is None:
+            raise RuntimeError("state was written with msgpack, which is not installed")
+        return msgpack.unpackb(data[1:], raw=False, strict_map_key=False)
+    return serialization.loads(data[1:])
+
+class _ArrayPool:
+    """Arrays of a snapshot, concatenated into one flat buffer per dtype
+    
+    A full pipeline holds thousands of small sketches; a handful of large
+    buffers saves and loads far faster than one .npy entry each, and the
+    concatenation is also the point-in-time copy of the state.
+    """
+    
+    def __init__(self):
+        self.parts: Dict[str, List[np.ndarray]] = {}
+        self.sizes: Dict[str, int] = {}
+    
+    def add(self, array: np.ndarray) -> Dict[str, Any]:
+        dtype = array.dtype.str
+        offset = self.sizes.get(dtype, 0)
+        self.parts.setdefault(dtype, []).append(array.ravel())
+        self.sizes[dtype] = offset + array.size
+        return {'$array': [dtype, offset, list(array.shape)]}
+    
+    def buffers(self) -> Dict[str, np.ndarray]:
+        return {dtype: np.concatenate(parts) for dtype, parts in self.parts.items()}
+
+def _object_state(obj: Any) -> Dict[str, Any]:
+    if type(obj).__getstate__ is not object.__getstate__:
+        return obj.__getstate__()
+    if hasattr(obj, '__dict__'):
+        return dict(vars(obj))
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+def _encode(value: Any, pool: _ArrayPool) -> Any:
+    """Metadata tree for `value`, with every array moved into `pool`"""
+    if isinstance(value, np.ndarray):
+        return pool.add(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item, pool) for item in value]
+    if isinstance(value, tuple):
+        return {'$tuple': [_encode(item, pool) for item in value]}
+    if isinstance(value, deque):
+        return {'$deque': [_encode(item, pool) for item in value]}
+    if isinstance(value, dict):
+        items = [[_encode(key, pool), _encode(item, pool)] for key, item in value.items()]
+        if isinstance(value, defaultdict):
+            return {'$defaultdict': items, 'factory': _DEFAULT_FACTORIES[value.default_factory]}
+        return {'$dict': items}
+    cls = type(value)
+    if _STATE_TYPES.get(cls.__name__) is not cls:
+        raise TypeError(f"Cannot snapshot {cls.__name__}")
+    return {'$object': cls.__name__, 'state': _encode(_object_state(value), pool)}
+
+def _decode(node: Any, buffers: Dict[str, np.ndarray]) -> Any:
+    if isinstance(node, list):
+        return [_decode(item, buffers) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if '$array' in node:
+        dtype, offset, shape = node['$array']
+        size = int(np.prod(shape, dtype=np.int64))
+        return buffers[dtype][offset:offset + size].reshape(shape).copy()
+    if '$tuple' in node:
+        return tuple(_decode(item, buffers) for item in node['$tuple'])
+    if '$deque' in node:
+        return deque(_decode(item, buffers) for item in node['$deque'])
+    if '$dict' in node:
+        return {_decode(key, buffers): _decode(item, buffers) for key, item in node['$dict']}
+    if '$defaultdict' in node:
+        factory = {name: cls for cls, name in _DEFAULT_FACTORIES.items()}[node['factory']]
+        return defaultdict(factory, ((_decode(key, buffers), _decode(item, buffers)) for key, item in node['$defaultdict']))
+    
+    cls = _STATE_TYPES[node['$object']]
+    state = _decode(node['state'], buffers)
+    obj = cls.__new__(cls)
+    if hasattr(cls, '__setstate__'):
+        obj.__setstate__(state)
+    elif hasattr(obj, '__dict__'):
+        obj.__dict__.update(state)
+    else:
+        for name, value in state.items():
+            setattr(obj, name, value)
+    return obj
+
+def _pack_arrays(meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> bytes:
+    """One log payload: length-prefixed metadata, then each array's raw bytes"""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    meta = dict(meta, arrays=[[name, array.dtype.str, list(array.shape)] for name, array in arrays.items()])
+    encoded = _dump_meta(meta)
+    return b''.join([_META_LENGTH.pack(len(encoded)), encoded, *(array.tobytes() for array in arrays.values())])
+
+def _unpack_arrays(payload: memoryview) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    (length,) = _META_LENGTH.unpack_from(payload)
+    meta = _load_meta(bytes(payload[_META_LENGTH.size:_META_LENGTH.size + length]))
+    offset = _META_LENGTH.size + length
+    arrays = {}
+    for name, dtype, shape in meta.pop('arrays'):
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(payload, dtype, count, offset).reshape(shape)
+        offset += count * dtype.itemsize
+    return meta, arrays
+
+class WriteAheadLog:
+    """Append-only, checksummed log of records in numbered segment files
+    
+    Each record is a header (sequence number, kind, length, CRC-32) and a
+    payload. A record torn by a crash mid-write fails its checksum and is cut
+    off before the next append, so the log always ends on a whole record.
+    Segments whose records are all covered by a snapshot are deleted whole.
+    """
+    
+    def __init__(self, directory: str, segment_bytes: int = SEGMENT_BYTES, fsync: bool = False):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.next_lsn = 1
+        self._file = None
+        self._tail_checked = False
+        self._lock = threading.Lock()
+    
+    def _segments(self) -> List[Tuple[int, str]]:
+        """(first sequence number, path) of every segment, oldest first"""
+        return sorted(
+            (int(name[4:-4]), os.path.join(self.directory, name))
+            for name in os.listdir(self.directory) if name.startswith('wal-') and name.endswith('.log')
+        )
+    
+    def _open_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = open(os.path.join(self.directory, f"wal-{self.next_lsn:016d}.log"), 'ab')
+    
+    def append(self, kind: int, payload: bytes) -> int:
+        """Write one record (flushed to the OS, fsynced if configured); returns its sequence number"""
+        with self._lock:
+            if not self._tail_checked:
+                for _ in self._read(0):
+                    pass
+            if self._file is None or self._file.tell() >= self.segment_bytes:
+                self._open_segment()
+            lsn = self.next_lsn
+            self._file.write(_HEADER.pack(lsn, kind, len(payload), zlib.crc32(payload)))
+            self._file.write(payload)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.next_lsn += 1
+            return lsn
+    
+    def replay(self, after: int = 0) -> Iterator[Tuple[int, int, memoryview]]:
+        """(sequence number, kind, payload) of every whole record after `after`, in order"""
+        with self._lock:
+            yield from self._read(after)
+    
+    def _read(self, after: int) -> Iterator[Tuple[int, int, memoryview]]:
+        segments = self._segments()
+        for i, (first, path) in enumerate(segments):
+            last_segment = i + 1 == len(segments)
+            if not last_segment and segments[i + 1][0] <= after + 1:
+                continue
+            with open(path, 'rb') as f:
+                data = memoryview(f.read())
+            offset = 0
+            while offset + _HEADER.size <= len(data):
+                lsn, kind, length, crc = _HEADER.unpack_from(data, offset)
+                payload = data[offset + _HEADER.size:offset + _HEADER.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                offset += _HEADER.size + length
+                self.next_lsn = lsn + 1
+                if lsn > after:
+                    yield lsn, kind, payload
+            
+            if last_segment and not self._tail_checked:
+                # Cut a torn tail so new records follow the last whole one
+                if offset < len(data):
+                    with open(path, 'r+b') as f:
+                        f.truncate(offset)
+                self.next_lsn = max(self.next_lsn, first)
+                self._tail_checked = True
+        self._tail_checked = True
+    
+    def rotate(self) -> int:
+        """Start a new segment at the next record; returns the last sequence number written"""
+        with self._lock:
+            if not self._tail_checked:
+                for _ in self._read(0):
+                    pass
+            self._open_segment()
+            return self.next_lsn - 1
+    
+    def truncate(self, upto: int) -> int:
+        """Delete segments holding only records <= `upto`; returns bytes freed"""
+        freed = 0
+        with self._lock:
+            segments = self._segments()
+            for (_, path), (next_first, _) in zip(segments, segments[1:]):
+                if next_first <= upto + 1:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+        return freed
+    
+    def nbytes(self) -> int:
+        return sum(os.path.getsize(path) for _, path in self._segments())
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class StateStore:
+    """Durable pipeline state: a write-ahead log of inputs plus periodic snapshots
+    
+    Every batch, sentiment sample and watermark the pipeline ingests is
+    appended to the log first. Snapshots capture every partition's sketches,
+    windows and rollups as flat NumPy buffers (.npz) plus a metadata tree
+    (msgpack, or JSON without it); the pool copy is taken under the caller's
+    lock and written in the background. Recovery loads the newest intact
+    snapshot and replays only the log after it: a snapshot is due every
+    SNAPSHOT_WAL_BYTES or SNAPSHOT_WAL_RECORDS of log, and replay stops at
+    `max_replay_bytes` regardless.
+    """
+    
+    def __init__(self, root: Optional[str] = None, snapshot_bytes: int = SNAPSHOT_WAL_BYTES,
+                 snapshot_seconds: float = SNAPSHOT_SECONDS, keep: int = KEEP_SNAPSHOTS, fsync: bool = False,
+                 snapshot_records: int = SNAPSHOT_WAL_RECORDS, max_replay_bytes: int = MAX_REPLAY_BYTES):
+        self.root = root or os.path.join(DEFAULT_DATA_DIR, 'state')
+        self.snapshot_dir = os.path.join(self.root, 'snapshots')
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self.wal = WriteAheadLog(os.path.join(self.root, 'wal'), fsync=fsync)
+        self.snapshot_bytes = snapshot_bytes
+        self.snapshot_seconds = snapshot_seconds
+        self.snapshot_records = snapshot_records
+        self.max_replay_bytes = max_replay_bytes
+        self.keep = keep
+        self.bytes_since_snapshot = 0
+        self.records_since_snapshot = 0
+        self.last_snapshot = time.monotonic()
+        self.recovery: Optional[Dict[str, Any]] = None
+        self._writer: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def _fingerprint(pipeline) -> Dict[str, Any]:
+        """Configuration a snapshot must match to be loaded into `pipeline`"""
+        return {
+            'platforms': list(pipeline.partitions),
+            'topics': pipeline.topics,
+            'window_seconds': pipeline.window_seconds,
+            'windows': pipeline.max_windows
+        }
+    
+    def _log(self, kind: int, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        payload = _pack_arrays(meta, arrays)
+        self.wal.append(kind, payload)
+        self.bytes_since_snapshot += _HEADER.size + len(payload)
+        self.records_since_snapshot += 1
+        STATE_WAL_BYTES.set(self.bytes_since_snapshot)
+    
+    def log_batch(self, batch: PostBatch) -> None:
+        self._log(BATCH, {'platform': batch.platform, 'tags': list(batch.tags)}, {
+            'tag_idx': batch.tag_idx, 'topic_idx': batch.topic_idx, 'timestamps': batch.timestamps,
+            'authors': batch.authors, 'views': batch.views, 'engagements': batch.engagements,
+            'lat': batch.lat, 'lng': batch.lng
+        })
+    
+    def log_sentiment(self, platform: str, timestamp: float, topic_idx: np.ndarray, scores: np.ndarray,
+                      controversy: np.ndarray, posts: np.ndarray) -> None:
+        self._log(SENTIMENT, {'platform': platform, 'timestamp': timestamp}, {
+            'topic_idx': np.asarray(topic_idx), 'scores': np.asarray(scores),
+            'controversy': np.asarray(controversy), 'posts': np.asarray(posts)
+        })
+    
+    def log_watermark(self, timestamp: float) -> None:
+        self._log(WATERMARK, {'timestamp': timestamp}, {})
+    
+    def snapshot_due(self) -> bool:
+        if self._writer is not None and self._writer.is_alive():
+            return False
+        return self.bytes_since_snapshot >= self.snapshot_bytes or self.records_since_snapshot >= self.snapshot_records or (
+            self.bytes_since_snapshot and time.monotonic() - self.last_snapshot >= self.snapshot_seconds
+        )
+    
+    def snapshot(self, pipeline, background: bool = True) -> int:
+        """Capture `pipeline` now (callers hold its lock) and write it, by default on a background thread
+        
+        Returns the sequence number the snapshot covers.
+        """
+        self.wait()
+        started = time.perf_counter()
+        pool = _ArrayPool()
+        tree = _encode({'partitions': pipeline.partitions, 'watermark': pipeline.watermark}, pool)
+        buffers = pool.buffers()
+        lsn = self.wal.rotate()
+        meta = {
+            'version': SNAPSHOT_VERSION,
+            'lsn': lsn,
+            'created': datetime.now().isoformat(),
+            'fingerprint': self._fingerprint(pipeline),
+            'state': tree
+        }
+        self.bytes_since_snapshot = 0
+        self.records_since_snapshot = 0
+        self.last_snapshot = time.monotonic()
+        STATE_WAL_BYTES.set(0)
+        
+        if background:
+            self._writer = threading.Thread(target=self._write_snapshot, args=(lsn, meta, buffers, started),
+                                            name='state-snapshot', daemon=True)
+            self._writer.start()
+        else:
+            self._write_snapshot(lsn, meta, buffers, started)
+        return lsn
+    
+    def _write_snapshot(self, lsn: int, meta: Dict[str, Any], buffers: Dict[str, np.ndarray], started: float) -> None:
+        base = os.path.join(self.snapshot_dir, f"snapshot-{lsn:016d}")
+        # Arrays first, metadata last: a snapshot only counts once its .meta exists
+        for path, write in ((base + '.npz', lambda f: np.savez(f, **{f"pool{i}": buffer for i, buffer in enumerate(buffers.values())})),
+                            (base + '.meta', lambda f: f.write(_dump_meta(dict(meta, pools=list(buffers)))))):
+            with open(path + '.tmp', 'wb') as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+        
+        kept = self._snapshots()[-self.keep:]
+        for old in self._snapshots()[:-self.keep]:
+            for suffix in ('.npz', '.meta'):
+                if os.path.exists(os.path.join(self.snapshot_dir, f"snapshot-{old:016d}{suffix}")):
+                    os.remove(os.path.join(self.snapshot_dir, f"snapshot-{old:016d}{suffix}"))
+        self.wal.truncate(kept[0])
+        STATE_SNAPSHOTS.inc()
+        STATE_SNAPSHOT_SECONDS.observe(time.perf_counter() - started)
+    
+    def _snapshots(self) -> List[int]:
+        """Sequence numbers of complete snapshots, oldest first"""
+        return sorted(int(name[9:-5]) for name in os.listdir(self.snapshot_dir)
+                      if name.startswith('snapshot-') and name.endswith('.meta'))
+    
+    def _load_snapshot(self, lsn: int) -> Dict[str, Any]:
+        base = os.path.join(self.snapshot_dir, f"snapshot-{lsn:016d}")
+        with open(base + '.meta', 'rb') as f:
+            meta = _load_meta(f.read())
+        with np.load(base + '.npz') as npz:
+            buffers = {dtype: npz[f"pool{i}"] for i, dtype in enumerate(meta['pools'])}
+        meta['state'] = _decode(meta['state'], buffers)
+        return meta
+    
+    def recover(self, pipeline) -> Dict[str, Any]:
+        """Restore `pipeline` from the newest usable snapshot plus the log after it, then start logging its inputs
+        
+        A snapshot that fails to load falls back to the previous one. State
+        written by a different pipeline configuration (topics, platforms,
+        windows) cannot be replayed into this one and is discarded. The report
+        gives the time spent in each phase, and `complete` is False when the
+        log no longer reaches back to the loaded snapshot (or to the start), or
+        when replay hit `max_replay_bytes` (`truncated`) and the rest of the log
+        was dropped by snapshotting straight away.
+        """
+        started = time.perf_counter()
+        report = {'snapshot_lsn': 0, 'snapshot_ms': 0.0, 'replayed': 0, 'replayed_bytes': 0, 'replay_ms': 0.0,
+                  'discarded': False, 'truncated': False, 'complete': True}
+        for lsn in reversed(self._snapshots()):
+            try:
+                meta = self._load_snapshot(lsn)
+            except Exception:
+                continue
+            if meta.get('version') != SNAPSHOT_VERSION or meta['fingerprint'] != self._fingerprint(pipeline):
+                self.reset()
+                report['discarded'] = True
+                break
+            pipeline.partitions.update(meta['state']['partitions'])
+            pipeline.watermark = meta['state']['watermark']
+            report['snapshot_lsn'] = lsn
+            break
+        report['snapshot_ms'] = (time.perf_counter() - started) * 1000
+        
+        # The log is trimmed to the oldest snapshot, so anything older than that means starting over
+        replay_started = time.perf_counter()
+        pipeline.state = None
+        records = self.wal.replay(report['snapshot_lsn'])
+        for lsn, kind, payload in records:
+            if not report['replayed'] and lsn != report['snapshot_lsn'] + 1:
+                report['complete'] = False
+            if report['replayed_bytes'] + _HEADER.size + len(payload) > self.max_replay_bytes:
+                report['truncated'] = True
+                report['complete'] = False
+                break
+            meta, arrays = _unpack_arrays(payload)
+            if kind == BATCH:
+                pipeline.ingest(PostBatch(meta['platform'], meta['tags'], **arrays))
+            elif kind == SENTIMENT:
+                pipeline.observe_sentiment(meta['platform'], meta['timestamp'], **arrays)
+            elif kind == WATERMARK:
+                pipeline.advance(datetime.fromtimestamp(meta['timestamp']))
+            report['replayed'] += 1
+            report['replayed_bytes'] += _HEADER.size + len(payload)
+        records.close()
+        report['replay_ms'] = (time.perf_counter() - replay_started) * 1000
+        # Never reuse sequence numbers the snapshot already covers, even if the log was lost
+        self.wal.next_lsn = max(self.wal.next_lsn, report['snapshot_lsn'] + 1)
+        
+        self.bytes_since_snapshot = report['replayed_bytes']
+        self.records_since_snapshot = report['replayed']
+        if report['truncated']:
+            # The new snapshot covers the unreplayed tail, so it is never replayed on top of this state
+            self.snapshot(pipeline, background=False)
+        report['total_ms'] = (time.perf_counter() - started) * 1000
+        pipeline.state = self
+        self.recovery = report
+        STATE_RECOVERY_SECONDS.set(report['total_ms'] / 1000)
+        STATE_WAL_BYTES.set(self.bytes_since_snapshot)
+        return report
+    
+    def reset(self) -> None:
+        """Delete every snapshot and log segment"""
+        self.wait()
+        self.wal.close()
+        for directory in (self.snapshot_dir, self.wal.directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+        self.wal = WriteAheadLog(self.wal.directory, self.wal.segment_bytes, self.wal.fsync)
+        self.bytes_since_snapshot = 0
+        self.records_since_snapshot = 0
+    
+    def wait(self) -> None:
+        """Block until a background snapshot write has finished"""
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+    
+    def close(self) -> None:
+        self.wait()
+        self.wal.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        snapshots = self._snapshots()
+        return {
+            'snapshots': len(snapshots),
+            'snapshot_bytes': sum(
+                os.path.getsize(os.path.join(self.snapshot_dir, f"snapshot-{lsn:016d}{suffix}"))
+                for lsn in snapshots for suffix in ('.npz', '.meta')
+            ),
+            'wal_bytes': self.wal.nbytes(),
+            'bytes_since_snapshot': self.bytes_since_snapshot,
+            'records_since_snapshot': self.records_since_snapshot,
+            'recovery': self.recovery
+        }
@@ -0,0 +1,234 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.alert_store import DEFAULT_DATA_DIR, AlertStore
+from src.serialization import dumps
+
+CHANNELS = ("Email", "SMS", "In-App", "Slack")
+
+# (sends per second, burst) per channel, roughly what each provider tolerates
+CHANNEL_RATE_LIMITS = {
+    "Email": (5.0, 10),
+    "SMS": (1.0, 3),
+    "In-App": (50.0, 100),
+    "Slack": (1.0, 1)
+}
+
+class TokenBucket:
+    """Async token-bucket rate limiter"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+    
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class StubTransport:
+    """Local stand-in for a delivery provider: appends each batch to an outbox file"""
+    
+    def __init__(self, channel: str, outbox_dir: Optional[str] = None, failure_rate: float = 0.0):
+        self.channel = channel
+        self.outbox_dir = outbox_dir or os.path.join(DEFAULT_DATA_DIR, 'outbox')
+        self.failure_rate = failure_rate
+        self.path = os.path.join(self.outbox_dir, f"{channel.lower().replace('-', '_')}.jsonl")
+    
+    def _write(self, line: bytes) -> None:
+        os.makedirs(self.outbox_dir, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(line + b'\n')
+    
+    async def send(self, messages: List[Dict[str, Any]]) -> None:
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise ConnectionError(f"{self.channel} stub transport: simulated failure")
+        line = dumps({'channel': self.channel, 'sent_at': datetime.now(), 'messages': messages})
+        await asyncio.to_thread(self._write, line)
+
+class InAppTransport:
+    """In-app notifications are read from the alert store, so delivery is a no-op"""
+    
+    channel = "In-App"
+    
+    async def send(self, messages: List[Dict[str, Any]]) -> None:
+        return None
+
+def default_transports() -> Dict[str, Any]:
+    return {
+        "Email": StubTransport("Email"),
+        "SMS": StubTransport("SMS"),
+        "Slack": StubTransport("Slack"),
+        "In-App": InAppTransport()
+    }
+
+class Dispatcher:
+    """Deliver fired notifications through per-channel async workers
+    
+    Each channel has its own queue and worker running on a background event
+    loop. Workers gather notifications into batches (up to `batch_size`, or
+    whatever arrives within `batch_window` seconds), drop repeats of the same
+    alert and topic within `dedup_window`, collapse large batches into one
+    digest, respect the channel's rate limit and retry failures with
+    exponential backoff.
+    """
+    
+    def __init__(self, store: Optional[AlertStore] = None, transports: Optional[Dict[str, Any]] = None,
+                 batch_size: int = 100, batch_window: float = 2.0, dedup_window: float = 600.0,
+                 coalesce_threshold: int = 5, max_attempts: int = 4, base_backoff: float = 0.5,
+                 max_queue: int = 10_000):
+        self.store = store
+        self.transports = transports or default_transports()
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.dedup_window = dedup_window
+        self.coalesce_threshold = coalesce_threshold
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_queue = max_queue
+        
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.buckets = {channel: TokenBucket(*CHANNEL_RATE_LIMITS.get(channel, (1.0, 1))) for channel in self.transports}
+        self.recent: Dict[tuple, float] = {}
+        self.counters: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    def start(self) -> 'Dispatcher':
+        """Start the background event loop and one worker per channel"""
+        if self._thread is not None:
+            return self
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='alert-dispatch', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_workers(), self.loop).result()
+        return self
+    
+    async def _start_workers(self) -> None:
+        for channel in self.transports:
+            self.queues[channel] = asyncio.Queue(maxsize=self.max_queue)
+            self._tasks.append(asyncio.create_task(self._worker(channel)))
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        if self.loop is None:
+            return
+        
+        async def shutdown():
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+        self.loop = None
+    
+    def submit(self, notifications: List[Dict[str, Any]]) -> None:
+        """Queue notifications for every channel they request; safe to call from any thread"""
+        if notifications and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._enqueue, notifications)
+    
+    def _enqueue(self, notifications: List[Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        # Forget dedup keys that have aged out of the window
+        if len(self.recent) > 10_000:
+            self.recent = {k: t for k, t in self.recent.items() if now - t < self.dedup_window}
+        
+        for notification in notifications:
+            for channel in notification.get('methods', []):
+                queue = self.queues.get(channel)
+                if queue is None:
+                    self.counters['unknown_channel'] += 1
+                    continue
+                
+                key = (channel, notification['alert_id'], notification['topic'])
+                last = self.recent.get(key)
+                if last is not None and now - last < self.dedup_window:
+                    self.counters['deduplicated'] += 1
+                    continue
+                self.recent[key] = now
+                
+                try:
+                    queue.put_nowait(notification)
+                    self.counters['queued'] += 1
+                except asyncio.QueueFull:
+                    self.counters['dropped'] += 1
+    
+    async def _next_batch(self, queue: asyncio.Queue) -> List[Dict[str, Any]]:
+        batch = [await queue.get()]
+        deadline = self.loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    def _coalesce(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turn a storm of notifications into a single digest message"""
+        messages = [{'title': n['title'], 'message': n['message'], 'time': n['time']} for n in batch]
+        if len(batch) <= self.coalesce_threshold:
+            return messages
+        
+        topics = Counter(n['topic'] for n in batch)
+        summary = ", ".join(f"#{topic} ({count})" for topic, count in topics.most_common(5))
+        return [{
+            'title': f"🔔 {len(batch)} alerts fired",
+            'message': f"Most active: {summary}",
+            'time': batch[-1]['time'],
+            'coalesced': len(batch)
+        }]
+    
+    async def _worker(self, channel: str) -> None:
+        queue = self.queues[channel]
+        transport = self.transports[channel]
+        bucket = self.buckets[channel]
+        
+        while True:
+            batch = await self._next_batch(queue)
+            messages = self._coalesce(batch)
+            self.counters['coalesced'] += len(batch) - len(messages)
+            
+            error = None
+            for attempt in range(1, self.max_attempts + 1):
+                await bucket.acquire()
+                try:
+                    await transport.send(messages)
+                    error = None
+                    break
+                except Exception as e:  # any transport failure is retried
+                    error = str(e)
+                    self.counters['retries'] += 1
+                    if attempt < self.max_attempts:
+                        backoff = self.base_backoff * 2 ** (attempt - 1)
+                        await asyncio.sleep(backoff + random.uniform(0, backoff / 2))
+            
+            status = 'failed' if error else 'sent'
+            self.counters[f'batches_{status}'] += 1
+            self.counters[f'messages_{status}'] += len(messages)
+            if self.store is not None:
+                await asyncio.to_thread(self.store.record_delivery, channel, status, len(messages), attempt, error)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'pending': {channel: queue.qsize() for channel, queue in self.queues.items()}
+        }
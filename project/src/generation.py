@@ -0,0 +1,390 @@
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from src.keyword_matcher import tokenize
+from src.metrics import ANSWER_CACHE_HITS, LLM_FIRST_TOKEN, LLM_PROMPT_TOKENS_REUSED, LLM_TOKENS
+
+SYSTEM_PROMPT = (
+    "You are ViralPulse, an analyst of social media trends. Answer the question in a few sentences "
+    "using only the context and signals given: where the trend comes from, how people feel about it, "
+    "and any moderation risk. Cite sources as [n]. If the context does not cover something, say so.\n"
+)
+
+# Cap on answer length, in tokens
+MAX_ANSWER_TOKENS = 160
+
+# Backend slots whose KV cache is tracked for prefix reuse (llama-server --parallel)
+PREFIX_SLOTS = 4
+
+# Stub backend pacing, roughly a 7B 4-bit model on a laptop CPU: seconds per
+# prompt token prefilled and per answer token decoded
+STUB_PREFILL_SECONDS = 0.002
+STUB_DECODE_SECONDS = 0.025
+
+# Semantic answer cache: minimum cosine similarity for a hit, entry lifetime,
+# entries kept and hashed embedding width
+ANSWER_SIMILARITY = 0.85
+ANSWER_TTL_SECONDS = 600
+ANSWER_CACHE_SIZE = 256
+EMBEDDING_DIMS = 2048
+
+# Seconds to wait on a llama.cpp server for the connection and for each streamed line
+LLAMA_TIMEOUT = 30.0
+
+LLM_URL_ENV = 'VIRALPULSE_LLM_URL'
+
+# Function words and request verbs left out of query embeddings: "what is the
+# impact of X" and "analyze the impact of X" ask the same thing
+_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'of', 'in', 'on', 'for', 'to', 'and', 'or', 'about', 'around', 'with', 'behind',
+    'is', 'are', 'was', 'it', 'its', 's', 'this', 'that', 'what', 'why', 'how', 'who', 'me',
+    'tell', 'analyze', 'analyse', 'explain'
+})
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_PIECE_RE = re.compile(r"\s*\S+")
+
+def count_tokens(text: str) -> int:
+    """Approximate token count (words and punctuation marks), for prefill accounting"""
+    return len(_TOKEN_RE.findall(text))
+
+class GenerationError(RuntimeError):
+    """The LLM backend could not be reached or failed mid-answer"""
+
+def answer_scope(analysis: Dict[str, Any]) -> Tuple[Tuple[str, ...], bool]:
+    """What an answer depends on besides the wording of its query: matched topics and meme activity"""
+    return tuple(sorted(analysis.get('topics', ()))), bool(analysis.get('meme_evolution'))
+
+def prompt_segments(analysis: Dict[str, Any]) -> List[str]:
+    """The answer prompt for an analysis, split from most to least shared
+    
+    The system prompt is the same for every query, and the context block for
+    every query on the same topics: chunks are listed by id rather than in
+    this query's relevance order. Only the final signals-and-question block
+    is new to each query, so that is all a warm backend slot has to prefill.
+    """
+    sources = sorted(analysis['chunks'], key=lambda chunk: chunk['chunk_id'])
+    context = "### Context\n" + "".join(
+        f"[{i}] ({chunk['source']}) {chunk['text']}\n" for i, chunk in enumerate(sources, 1)
+    ) + f"Cultural origin: {analysis['cultural_origin']}\n"
+    
+    positive, neutral, negative = (round(share) for share in analysis['sentiment_breakdown'])
+    signals = [
+        "### Signals\n",
+        f"Sentiment: {positive}% positive, {neutral}% neutral, {negative}% negative\n",
+        f"Toxic share: {analysis['toxicity_level'] * 100:.0f}%\n"
+    ]
+    if analysis['toxic_topics']:
+        signals.append(f"Flagged: {', '.join('#' + topic for topic in analysis['toxic_topics'])}\n")
+    if analysis['meme_evolution']:
+        peak = max(analysis['meme_evolution'], key=lambda point: point['popularity'])
+        signals.append(f"Meme: variant family peaked at {peak['popularity']} posts/day on {peak['date']}\n")
+    question = "".join(signals) + f"### Question\n{analysis['query']}\n### Answer\n"
+    return [SYSTEM_PROMPT, context, question]
+
+class PrefixCache:
+    """Routes prompts to backend slots so that shared prefixes stay prefilled
+    
+    Each slot remembers the segment hashes of the last prompt it processed,
+    which is what its KV cache holds. A backend works through one request per
+    slot at a time, so slots are leased: a prompt goes to the least busy slot,
+    and among those to the one sharing the most leading segments with it
+    (least recently used among ties). Callers release the lease when their
+    stream ends, however it ends.
+    """
+    
+    def __init__(self, slots: int = PREFIX_SLOTS):
+        self._lock = threading.Lock()
+        # Per slot: (hash of segments so far, cumulative tokens) for each segment of its last prompt
+        self.slots: List[List[Tuple[bytes, int]]] = [[] for _ in range(slots)]
+        self.last_used = [0] * slots
+        self.in_flight = [0] * slots
+        self._clock = 0
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.reused_tokens = 0
+    
+    @staticmethod
+    def chain(segments: Sequence[str]) -> List[Tuple[bytes, int]]:
+        digest = hashlib.blake2b(digest_size=16)
+        chain, tokens = [], 0
+        for segment in segments:
+            digest.update(segment.encode('utf-8'))
+            tokens += count_tokens(segment)
+            chain.append((digest.digest(), tokens))
+        return chain
+    
+    def acquire(self, segments: Sequence[str]) -> Tuple[int, int]:
+        """Lease a slot for the prompt; returns it and the number of the prompt's leading tokens cached there"""
+        chain = self.chain(segments)
+        with self._lock:
+            def shared(slot: int) -> int:
+                held = self.slots[slot]
+                n = 0
+                while n < min(len(held), len(chain)) and held[n][0] == chain[n][0]:
+                    n += 1
+                return n
+            
+            matches = [shared(slot) for slot in range(len(self.slots))]
+            # An idle slot that must prefill the context beats queueing behind another answer's decode
+            slot = max(range(len(self.slots)), key=lambda s: (-self.in_flight[s], matches[s], -self.last_used[s]))
+            cached = chain[matches[slot] - 1][1] if matches[slot] else 0
+            self._clock += 1
+            self.slots[slot] = chain
+            self.last_used[slot] = self._clock
+            self.in_flight[slot] += 1
+            self.requests += 1
+            self.prompt_tokens += chain[-1][1] if chain else 0
+            self.reused_tokens += cached
+        LLM_PROMPT_TOKENS_REUSED.inc(cached)
+        return slot, cached
+    
+    def release(self, slot: int) -> None:
+        with self._lock:
+            self.in_flight[slot] -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'in_flight': sum(self.in_flight),
+            'prompt_tokens': self.prompt_tokens,
+            'reused_tokens': self.reused_tokens,
+            'reuse_ratio': self.reused_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+        }
+
+class SemanticCache:
+    """Recent answers looked up by query similarity rather than exact text
+    
+    Queries are embedded as L2-normalized hashed bags of content words and
+    their character trigrams, so rewordings, typos and hashtag variants of a
+    question land close together. A hit needs cosine similarity of at least `threshold` and
+    the same scope (see answer_scope), and entries expire after
+    `ttl_seconds` because answers describe live signals.
+    """
+    
+    def __init__(self, capacity: int = ANSWER_CACHE_SIZE, threshold: float = ANSWER_SIMILARITY,
+                 ttl_seconds: float = ANSWER_TTL_SECONDS, dims: int = EMBEDDING_DIMS):
+        self._lock = threading.Lock()
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.dims = dims
+        self.vectors = np.zeros((capacity, dims), dtype=np.float32)
+        # Per row: (scope, query, answer, expiry on the monotonic clock); rows are reused oldest first
+        self.entries: List[Optional[Tuple[Any, str, str, float]]] = [None] * capacity
+        self._next = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dims, dtype=np.float32)
+        for token in tokenize(text):
+            if token in _STOPWORDS:
+                continue
+            # crc32 rather than hash() so embeddings don't change between processes
+            vector[zlib.crc32(token.encode('utf-8')) % self.dims] += 1.0
+            padded = f"<{token}>"
+            for i in range(len(padded) - 2):
+                vector[zlib.crc32(padded[i:i + 3].encode('utf-8'), 1) % self.dims] += 0.5
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, query: str, scope: Any) -> Optional[Tuple[str, str, float]]:
+        """(answer, the query it was cached for, similarity) for the closest live entry, or None"""
+        vector = self.embed(query)
+        now = time.monotonic()
+        with self._lock:
+            live = np.array([entry is not None and entry[0] == scope and entry[3] > now for entry in self.entries])
+            similarity = np.where(live, self.vectors @ vector, -1.0)
+            best = int(np.argmax(similarity))
+            if similarity[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            _, cached_query, answer, _ = self.entries[best]
+        return answer, cached_query, float(similarity[best])
+    
+    def put(self, query: str, scope: Any, answer: str) -> None:
+        vector = self.embed(query)
+        with self._lock:
+            self.vectors[self._next] = vector
+            self.entries[self._next] = (scope, query, answer, time.monotonic() + self.ttl_seconds)
+            self._next = (self._next + 1) % len(self.entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': sum(entry is not None for entry in self.entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+class StubBackend:
+    """Offline stand-in for a local model server
+    
+    Writes a templated answer from the labeled lines of the prompt and paces
+    it like CPU inference: a prefill cost for every prompt token not already
+    cached in the slot, then a fixed cost per decoded token. Like a server
+    slot, each slot serves one request at a time.
+    """
+    
+    name = 'stub'
+    
+    def __init__(self, prefill_seconds: float = STUB_PREFILL_SECONDS, decode_seconds: float = STUB_DECODE_SECONDS):
+        self.prefill_seconds = prefill_seconds
+        self.decode_seconds = decode_seconds
+        self._slot_locks: Dict[int, threading.Lock] = defaultdict(threading.Lock)
+    
+    def stream(self, prompt: str, max_tokens: int, slot: int, cached_tokens: int) -> Iterator[str]:
+        with self._slot_locks[slot]:
+            time.sleep(max(0, count_tokens(prompt) - cached_tokens) * self.prefill_seconds)
+            for piece in _PIECE_RE.findall(self._answer(prompt))[:max_tokens]:
+                time.sleep(self.decode_seconds)
+                yield piece
+    
+    @staticmethod
+    def _answer(prompt: str) -> str:
+        def field(label: str) -> str:
+            match = re.search(rf"^{label}: (.*)$", prompt, re.MULTILINE)
+            return match.group(1) if match else ''
+        
+        question = prompt.rsplit("### Question\n", 1)[-1].split("\n", 1)[0]
+        sentences = [f"Background: {field('Cultural origin')}"]
+        
+        shares = re.findall(r"(\d+)% (?:positive|neutral|negative)", field('Sentiment'))
+        if shares:
+            positive, _, negative = map(int, shares)
+            leaning = 'positive' if positive > negative + 10 else 'negative' if negative > positive + 10 else 'split'
+            sentences.append(f"Sentiment is {leaning}, with {positive}% positive against {negative}% negative")
+        
+        toxic, flagged = field('Toxic share'), field('Flagged')
+        if flagged:
+            sentences.append(f"Moderation risk is elevated: {toxic} of recent posts read as toxic, concentrated in {flagged}")
+        elif toxic:
+            sentences.append(f"Toxicity is contained at {toxic} of recent posts")
+        if field('Meme'):
+            sentences.append(f"A meme {field('Meme').split(': ', 1)[-1]}")
+        
+        # Cite the source sharing the most words with the question
+        sources = re.findall(r"^\[(\d+)\] \(.*?\) (.*)$", prompt, re.MULTILINE)
+        if sources:
+            words = set(tokenize(question))
+            n, text = max(sources, key=lambda source: len(words & set(tokenize(source[1]))))
+            sentences.append(f"Coverage notes: {text.split('. ')[0].rstrip('.')} [{n}]")
+        return '. '.join(sentences) + '.'
+
+class LlamaCppBackend:
+    """Streams completions from a llama.cpp server (`llama-server`) on localhost
+    
+    Requests pin `id_slot` and set `cache_prompt`, so the server keeps each
+    slot's KV cache between requests and only prefills the part of a prompt
+    past what it shares with that slot's previous prompt.
+    """
+    
+    name = 'llama.cpp'
+    
+    def __init__(self, url: str, timeout: float = LLAMA_TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 8080
+        self.timeout = timeout
+    
+    def stream(self, prompt: str, max_tokens: int, slot: int, cached_tokens: int) -> Iterator[str]:
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request('POST', '/completion', body=json.dumps({
+                'prompt': prompt,
+                'n_predict': max_tokens,
+                'stream': True,
+                'cache_prompt': True,
+                'id_slot': slot
+            }), headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            if response.status != 200:
+                raise GenerationError(f"llama.cpp server returned {response.status}: {response.read(200)!r}")
+            # Server-sent events, one JSON object per token
+            for line in response:
+                if not line.startswith(b'data: '):
+                    continue
+                event = json.loads(line[6:])
+                if event.get('content'):
+                    yield event['content']
+                if event.get('stop'):
+                    break
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise GenerationError(f"llama.cpp server at {self.host}:{self.port}: {e}") from e
+        finally:
+            conn.close()
+
+def backend_from_env():
+    """A llama.cpp backend if VIRALPULSE_LLM_URL is set ("http://127.0.0.1:8080"), else the stub"""
+    url = os.environ.get(LLM_URL_ENV)
+    return LlamaCppBackend(url) if url else StubBackend()
+
+class AnswerGenerator:
+    """Grounded answers for RAG analyses, streamed from a local model backend
+    
+    Prompts put what queries share first so the backend's slot caches skip
+    re-prefilling it (PrefixCache), and near-duplicate questions are answered
+    from a SemanticCache without generating at all.
+    """
+    
+    def __init__(self, backend=None, answers: Optional[SemanticCache] = None, slots: int = PREFIX_SLOTS,
+                 max_tokens: int = MAX_ANSWER_TOKENS):
+        self.backend = backend or backend_from_env()
+        self.prefixes = PrefixCache(slots)
+        self.answers = answers if answers is not None else SemanticCache()
+        self.max_tokens = max_tokens
+    
+    def stream(self, analysis: Dict[str, Any], stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Answer text as it is produced; `stats` gets timings and cache use once the answer is complete"""
+        stats = {} if stats is None else stats
+        start = time.perf_counter()
+        scope = answer_scope(analysis)
+        
+        cached = self.answers.get(analysis['query'], scope)
+        if cached is not None:
+            answer, cached_query, similarity = cached
+            ANSWER_CACHE_HITS.inc()
+            LLM_FIRST_TOKEN.observe(time.perf_counter() - start)
+            yield answer
+            stats.update(source='answer cache', cached_query=cached_query, similarity=similarity,
+                         ttft_seconds=time.perf_counter() - start, seconds=time.perf_counter() - start,
+                         tokens=len(_PIECE_RE.findall(answer)), prompt_tokens=0, cached_tokens=0)
+            return
+        
+        segments = prompt_segments(analysis)
+        slot, cached_tokens = self.prefixes.acquire(segments)
+        pieces: List[str] = []
+        first = None
+        try:
+            for piece in self.backend.stream(''.join(segments), self.max_tokens, slot, cached_tokens):
+                if first is None:
+                    first = time.perf_counter() - start
+                    LLM_FIRST_TOKEN.observe(first)
+                pieces.append(piece)
+                yield piece
+        finally:
+            self.prefixes.release(slot)
+        seconds = time.perf_counter() - start
+        LLM_TOKENS.inc(len(pieces))
+        
+        answer = ''.join(pieces).strip()
+        if answer:
+            self.answers.put(analysis['query'], scope, answer)
+        decode = seconds - (first or seconds)
+        stats.update(source=self.backend.name, slot=slot, ttft_seconds=first or seconds, seconds=seconds,
+                     tokens=len(pieces), tokens_per_second=(len(pieces) - 1) / decode if decode else 0.0,
+                     prompt_tokens=sum(map(count_tokens, segments)), cached_tokens=cached_tokens)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.backend.name, 'prefix': self.prefixes.stats(), 'answers': self.answers.stats()}
@@ -0,0 +1,165 @@
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Finest web-mercator tile level kept (~40 km tiles at the equator); coarser
+# levels are rolled up from it by shifting tile coordinates
+MAX_ZOOM = 10
+
+# Bins are drawn this many levels finer than the map zoom, so a screen tile
+# splits into a 4x4 grid of bins
+BIN_ZOOM_OFFSET = 2
+
+MAX_LATITUDE = 85.05112878
+
+def tile_xy(lat: np.ndarray, lng: np.ndarray, zoom: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Web-mercator tile coordinates of each point at `zoom`, vectorized"""
+    n = 1 << zoom
+    lat_rad = np.radians(np.clip(lat, -MAX_LATITUDE, MAX_LATITUDE))
+    x = ((np.asarray(lng) + 180.0) / 360.0 * n).astype(np.int64)
+    y = ((1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * n).astype(np.int64)
+    return np.clip(x, 0, n - 1), np.clip(y, 0, n - 1)
+
+def map_zoom_to_bin_zoom(map_zoom: int) -> int:
+    return int(min(MAX_ZOOM, max(0, map_zoom + BIN_ZOOM_OFFSET)))
+
+class _Aggregate:
+    """Per-tile sums at MAX_ZOOM: post count, engagement, lat/lng sums and topic counts"""
+    
+    def __init__(self, keys, counts, engagement, lat_sum, lng_sum, topic_counts):
+        self.keys = keys
+        self.counts = counts
+        self.engagement = engagement
+        self.lat_sum = lat_sum
+        self.lng_sum = lng_sum
+        self.topic_counts = topic_counts
+    
+    @classmethod
+    def reduce(cls, keys: np.ndarray, counts, engagement, lat_sum, lng_sum, topic_counts) -> '_Aggregate':
+        """Sum rows sharing a key (sort once, then segment sums)"""
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+        return cls(keys[starts], *(
+            np.add.reduceat(values[order], starts, axis=0)
+            for values in (counts, engagement, lat_sum, lng_sum, topic_counts)
+        ))
+    
+    @classmethod
+    def concat(cls, aggregates: Sequence['_Aggregate']) -> '_Aggregate':
+        return cls(*(np.concatenate([getattr(a, field) for a in aggregates]) for field in
+                     ('keys', 'counts', 'engagement', 'lat_sum', 'lng_sum', 'topic_counts')))
+
+def _rolled(indexes: Sequence['GeoIndex'], zoom: int) -> Optional[_Aggregate]:
+    """Every window of several indexes merged, with tiles rolled up to `zoom`; None when all are empty"""
+    aggregates = [aggregate for index in indexes for _, aggregate in index.windows]
+    if not aggregates:
+        return None
+    shift = MAX_ZOOM - zoom
+    data = _Aggregate.concat(aggregates)
+    
+    # Roll finest tiles up to `zoom`: parent tile = (x >> shift, y >> shift)
+    mask = (1 << MAX_ZOOM) - 1
+    keys = ((data.keys >> MAX_ZOOM) >> shift << zoom) | ((data.keys & mask) >> shift)
+    return _Aggregate.reduce(keys, data.counts, data.engagement, data.lat_sum, data.lng_sum, data.topic_counts)
+
+def rollup(indexes: Sequence['GeoIndex'], zoom: int, top_n: int = 3, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Merge several indexes (e.g. platform partitions) and roll their tiles up to `zoom`"""
+    zoom = int(min(MAX_ZOOM, max(0, zoom)))
+    rolled = _rolled(indexes, zoom)
+    if rolled is None:
+        return []
+    topics = indexes[0].topics
+    
+    order = np.argsort(-rolled.counts)[:limit]
+    top_topics = np.argsort(-rolled.topic_counts[order], axis=1)[:, :top_n]
+    peak = rolled.counts[order[0]] if len(order) else 1
+    
+    return [
+        {
+            'tile': (zoom, int(rolled.keys[i] >> zoom), int(rolled.keys[i] & ((1 << zoom) - 1))),
+            'lat': float(rolled.lat_sum[i] / rolled.counts[i]),
+            'lng': float(rolled.lng_sum[i] / rolled.counts[i]),
+            'posts': int(rolled.counts[i]),
+            'engagement': float(rolled.engagement[i]),
+            # sqrt keeps mid-sized bins visible next to the busiest one
+            'intensity': int(round(100 * np.sqrt(rolled.counts[i] / peak))),
+            'top_topics': [topics[t] for t in top_topics[row] if rolled.topic_counts[i, t]]
+        }
+        for row, i in enumerate(order)
+    ]
+
+def topic_spread(indexes: Sequence['GeoIndex'], zoom: int) -> np.ndarray:
+    """Per topic, how widely its posts cover the tiles occupied at `zoom`, 0-100
+    
+    The effective number of tiles a topic reaches (exp of the entropy of its
+    posts over tiles) as a percentage of all occupied tiles: 100 when it is
+    spread evenly over all of them, near 0 when it sits in one.
+    """
+    rolled = _rolled(indexes, int(min(MAX_ZOOM, max(0, zoom))))
+    if rolled is None:
+        return np.zeros(len(indexes[0].topics) if indexes else 0)
+    totals = rolled.topic_counts.sum(axis=0)
+    shares = rolled.topic_counts / np.maximum(totals, 1)
+    entropy = -np.sum(shares * np.log(np.where(shares > 0, shares, 1)), axis=0)
+    return np.where(totals > 0, np.exp(entropy) / len(rolled.keys) * 100, 0.0)
+
+class GeoIndex:
+    """Sliding-window spatial aggregation of geotagged posts on a tile quadtree
+    
+    Posts are binned to MAX_ZOOM tiles with vectorized mercator arithmetic and
+    reduced to per-tile sums immediately, so memory scales with occupied tiles
+    rather than posts. Any coarser zoom is a rollup of those sums.
+    """
+    
+    def __init__(self, topics: Sequence[str], window_seconds: int = 300, windows: int = 12):
+        self.topics = list(topics)
+        self.window_seconds = window_seconds
+        self.max_windows = windows
+        self.windows: Deque[Tuple[float, _Aggregate]] = deque()
+    
+    def _bin(self, lat: np.ndarray, lng: np.ndarray, topic_idx: np.ndarray, engagement: np.ndarray) -> _Aggregate:
+        x, y = tile_xy(lat, lng, MAX_ZOOM)
+        keys = (x << MAX_ZOOM) | y
+        unique, inverse = np.unique(keys, return_inverse=True)
+        n, t = len(unique), len(self.topics)
+        return _Aggregate(
+            unique,
+            np.bincount(inverse, minlength=n),
+            np.bincount(inverse, weights=engagement, minlength=n),
+            np.bincount(inverse, weights=lat, minlength=n),
+            np.bincount(inverse, weights=lng, minlength=n),
+            np.bincount(inverse * t + topic_idx, minlength=n * t).reshape(n, t)
+        )
+    
+    def add(self, lat: np.ndarray, lng: np.ndarray, topic_idx: np.ndarray, engagement: np.ndarray,
+            timestamp: datetime) -> None:
+        """Bin a batch of geotagged posts into the window containing `timestamp`"""
+        if not len(lat):
+            return
+        start = timestamp.timestamp() // self.window_seconds * self.window_seconds
+        batch = self._bin(np.asarray(lat, dtype=float), np.asarray(lng, dtype=float),
+                          np.asarray(topic_idx, dtype=np.int64), np.asarray(engagement, dtype=float))
+        
+        if self.windows and self.windows[-1][0] == start:
+            merged = _Aggregate.concat([self.windows[-1][1], batch])
+            self.windows[-1] = (start, _Aggregate.reduce(merged.keys, merged.counts, merged.engagement,
+                                                          merged.lat_sum, merged.lng_sum, merged.topic_counts))
+        elif not self.windows or start > self.windows[-1][0]:
+            self.windows.append((start, batch))
+        
+        horizon = start - (self.max_windows - 1) * self.window_seconds
+        while self.windows and self.windows[0][0] < horizon:
+            self.windows.popleft()
+    
+    def bins(self, zoom: int, top_n: int = 3, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Bins at tile level `zoom` with centroid, volume, engagement and top topics, busiest first"""
+        return rollup([self], zoom, top_n, limit)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'windows': len(self.windows),
+            'tiles': sum(len(aggregate.keys) for _, aggregate in self.windows)
+        }
@@ -0,0 +1,225 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.alert_store import DEFAULT_DATA_DIR
+
+try:
+    import duckdb
+except ImportError:  # duckdb is optional; scan()/timeline() cover the dashboard queries
+    duckdb = None
+
+# One row per (time window, topic, platform); platform and the (UTC) day live in the path
+TIMESTAMP = pa.timestamp('s', tz='UTC')
+HISTORY_SCHEMA = pa.schema([
+    ('timestamp', TIMESTAMP),
+    ('topic', pa.string()),
+    ('posts', pa.int64()),
+    ('views', pa.int64()),
+    ('engagements', pa.int64()),
+    ('sentiment', pa.float32()),
+    ('positive_ratio', pa.float32()),
+    ('negative_ratio', pa.float32()),
+    ('controversy', pa.float32())
+])
+PARTITIONING = ds.partitioning(pa.schema([('day', pa.string()), ('platform', pa.string())]), flavor='hive')
+
+# Appends are buffered until this many rows or this many seconds, whichever comes first
+DEFAULT_FLUSH_ROWS = 20_000
+DEFAULT_FLUSH_SECONDS = 300.0
+
+# A partition holding more files than this is rewritten as one on the next flush
+COMPACT_FILES = 16
+
+class HistoryStore:
+    """Columnar history of per-topic, per-platform activity in partitioned Parquet
+    
+    Files live under day=YYYY-MM-DD/platform=<name>/, so a query for a date
+    range and platform only opens the matching directories; within a file rows
+    are sorted by topic and timestamp so row-group statistics skip the rest.
+    Appends are buffered and written in batches; buffered rows are still
+    visible to queries. Small files from frequent flushes are compacted.
+    """
+    
+    def __init__(self, root: Optional[str] = None, flush_rows: int = DEFAULT_FLUSH_ROWS,
+                 flush_seconds: float = DEFAULT_FLUSH_SECONDS):
+        self.root = root or os.path.join(DEFAULT_DATA_DIR, 'history')
+        os.makedirs(self.root, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffer: List[pa.Table] = []
+        self._buffered_rows = 0
+        self._buffered_since: Optional[float] = None
+        self._dataset: Optional[ds.Dataset] = None
+        self._sequence = 0
+        self._lock = threading.RLock()
+    
+    def append(self, platform: str, columns: Dict[str, Any]) -> None:
+        """Buffer rows for one platform; `columns` holds every HISTORY_SCHEMA field (timestamps in epoch seconds)"""
+        arrays = {
+            name: pa.array(np.asarray(columns[name], dtype=np.int64)).cast(field.type) if name == 'timestamp'
+            else pa.array(columns[name], type=field.type)
+            for name, field in zip(HISTORY_SCHEMA.names, HISTORY_SCHEMA)
+        }
+        table = pa.table(arrays, schema=HISTORY_SCHEMA)
+        table = table.append_column('platform', pa.array([platform] * len(table), type=pa.string()))
+        with self._lock:
+            self._buffer.append(table)
+            self._buffered_rows += len(table)
+            if self._buffered_since is None:
+                self._buffered_since = time.monotonic()
+            if (self._buffered_rows >= self.flush_rows
+                    or time.monotonic() - self._buffered_since >= self.flush_seconds):
+                self.flush()
+    
+    def flush(self) -> int:
+        """Write buffered rows, one file per (day, platform) partition; returns rows written"""
+        with self._lock:
+            if not self._buffer:
+                return 0
+            table = pa.concat_tables(self._buffer)
+            self._buffer, self._buffered_rows, self._buffered_since = [], 0, None
+            
+            table = table.append_column('day', pc.strftime(table['timestamp'], format='%Y-%m-%d'))
+            touched = []
+            partitions = table.select(['day', 'platform']).group_by(['day', 'platform']).aggregate([])
+            for day, platform in zip(partitions['day'].to_pylist(), partitions['platform'].to_pylist()):
+                rows = table.filter((pc.field('day') == day) & (pc.field('platform') == platform))
+                rows = rows.select(HISTORY_SCHEMA.names).sort_by([('topic', 'ascending'), ('timestamp', 'ascending')])
+                directory = os.path.join(self.root, f"day={day}", f"platform={platform}")
+                os.makedirs(directory, exist_ok=True)
+                self._sequence += 1
+                pq.write_table(rows, os.path.join(directory, f"part-{time.time_ns()}-{self._sequence}.parquet"))
+                touched.append(directory)
+            
+            for directory in touched:
+                if len(os.listdir(directory)) > COMPACT_FILES:
+                    self._compact_partition(directory)
+            self._dataset = None
+            return len(table)
+    
+    def _compact_partition(self, directory: str) -> None:
+        files = sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.parquet'))
+        if len(files) < 2:
+            return
+        rows = pa.concat_tables([pq.read_table(path, schema=HISTORY_SCHEMA) for path in files])
+        rows = rows.sort_by([('topic', 'ascending'), ('timestamp', 'ascending')])
+        self._sequence += 1
+        pq.write_table(rows, os.path.join(directory, f"part-{time.time_ns()}-{self._sequence}.parquet"))
+        for path in files:
+            os.remove(path)
+    
+    def compact(self) -> int:
+        """Rewrite every multi-file partition as a single file; returns partitions compacted"""
+        compacted = 0
+        with self._lock:
+            for day in os.listdir(self.root):
+                for platform in os.listdir(os.path.join(self.root, day)):
+                    directory = os.path.join(self.root, day, platform)
+                    if len(os.listdir(directory)) > 1:
+                        self._compact_partition(directory)
+                        compacted += 1
+            self._dataset = None
+        return compacted
+    
+    def _files(self) -> ds.Dataset:
+        if self._dataset is None:
+            self._dataset = ds.dataset(self.root, schema=HISTORY_SCHEMA.append(pa.field('day', pa.string()))
+                                       .append(pa.field('platform', pa.string())),
+                                       format='parquet', partitioning=PARTITIONING)
+        return self._dataset
+    
+    def scan(self, start: datetime, end: datetime, topic: Optional[str] = None, platform: Optional[str] = None,
+             columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Rows with start <= timestamp < end (naive datetimes are local time), optionally one topic/platform
+        
+        Day and platform prune whole directories; the timestamp and topic
+        predicates are pushed down to Parquet row-group statistics.
+        """
+        columns = list(columns or HISTORY_SCHEMA.names + ['platform'])
+        start, end = start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+        predicate = (pc.field('timestamp') >= pa.scalar(start, TIMESTAMP)) & \
+                    (pc.field('timestamp') < pa.scalar(end, TIMESTAMP))
+        if topic is not None:
+            predicate &= pc.field('topic') == topic
+        if platform is not None:
+            predicate &= pc.field('platform') == platform
+        pruning = (pc.field('day') >= f"{start:%Y-%m-%d}") & (pc.field('day') <= f"{end:%Y-%m-%d}")
+        
+        with self._lock:
+            parts = [self._files().to_table(columns=columns, filter=pruning & predicate)]
+            if self._buffer:
+                parts.append(pa.concat_tables(self._buffer).filter(predicate).select(columns))
+        return pa.concat_tables(parts)
+    
+    def timeline(self, start: datetime, end: datetime, freq_hours: int = 1,
+                 topic: Optional[str] = None, platform: Optional[str] = None) -> pd.DataFrame:
+        """Activity per time bucket: post volume plus post-weighted sentiment, mood ratios and controversy"""
+        table = self.scan(start, end, topic, platform, columns=[
+            'timestamp', 'posts', 'views', 'engagements', 'sentiment', 'positive_ratio', 'negative_ratio', 'controversy'
+        ])
+        weights = pc.cast(table['posts'], pa.float64())
+        weighted = ('sentiment', 'positive_ratio', 'negative_ratio', 'controversy')
+        buckets = pa.table({
+            'timestamp': pc.floor_temporal(table['timestamp'], multiple=freq_hours, unit='hour'),
+            'posts': table['posts'],
+            'views': table['views'],
+            'engagements': table['engagements'],
+            **{name: pc.multiply(pc.cast(table[name], pa.float64()), weights) for name in weighted}
+        }).group_by('timestamp').aggregate([(name, 'sum') for name in ('posts', 'views', 'engagements') + weighted])
+        
+        frame = buckets.sort_by('timestamp').to_pandas()
+        frame.columns = [name.removesuffix('_sum') for name in frame.columns]
+        # Back to naive local time, like the rest of the dashboard's timestamps
+        frame['timestamp'] = pd.to_datetime([datetime.fromtimestamp(ts.timestamp()) for ts in frame['timestamp']])
+        volume = frame['posts'].where(frame['posts'] > 0)
+        for name in weighted:
+            frame[name] = (frame[name] / volume).fillna(0.0)
+        frame['neutral_ratio'] = 1 - frame['positive_ratio'] - frame['negative_ratio']
+        return frame.rename(columns={'posts': 'volume'})
+    
+    def latest(self) -> Optional[datetime]:
+        """Timestamp of the newest stored row (flushed or buffered), None when empty"""
+        with self._lock:
+            days = sorted(name for name in os.listdir(self.root) if name.startswith('day='))
+            newest = []
+            if days:
+                last_day = days[-1].split('=', 1)[1]
+                table = self._files().to_table(columns=['timestamp'], filter=pc.field('day') == last_day)
+                newest.append(pc.max(table['timestamp']).as_py())
+            newest.extend(pc.max(part['timestamp']).as_py() for part in self._buffer)
+        newest = [ts for ts in newest if ts is not None]
+        return max(newest).astimezone().replace(tzinfo=None) if newest else None
+    
+    def sql(self, query: str) -> pd.DataFrame:
+        """Run SQL over the flushed history (view `history`) with DuckDB, if installed"""
+        if duckdb is None:
+            raise RuntimeError("duckdb is not installed; use scan() or timeline() instead")
+        self.flush()
+        connection = duckdb.connect()
+        try:
+            pattern = os.path.join(self.root, '*', '*', '*.parquet')
+            connection.execute(f"CREATE VIEW history AS SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)")
+            return connection.execute(query).df()
+        finally:
+            connection.close()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = [os.path.join(directory, name)
+                     for directory, _, names in os.walk(self.root) for name in names if name.endswith('.parquet')]
+            return {
+                'days': len([name for name in os.listdir(self.root) if name.startswith('day=')]),
+                'files': len(files),
+                'bytes': sum(os.path.getsize(path) for path in files),
+                'buffered_rows': self._buffered_rows
+            }
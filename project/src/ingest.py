@@ -0,0 +1,327 @@
+import argparse
+import os
+import re
+import socket
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.keyword_matcher import KeywordMatcher
+from src.reach import hash_strings
+from src.serialization import dumps, loads
+
+_HASHTAG_RE = re.compile(r'#(\w+)')
+
+# Reddit rarely exposes view counts; estimate them from engagement instead
+REDDIT_VIEWS_PER_ENGAGEMENT = 20
+
+class PostBatch:
+    """Columnar batch of normalized posts from one platform
+    
+    Every platform's payloads reduce to the same compact record: timestamp,
+    trend tag (index into `tags`), tracked topic index (-1 if none), author
+    hash, views, engagements and optional coordinates (NaN when absent).
+    """
+    
+    def __init__(self, platform: str, tags: List[str], tag_idx: np.ndarray, topic_idx: np.ndarray,
+                 timestamps: np.ndarray, authors: np.ndarray, views: np.ndarray, engagements: np.ndarray,
+                 lat: Optional[np.ndarray] = None, lng: Optional[np.ndarray] = None):
+        n = len(timestamps)
+        self.platform = platform
+        self.tags = tags
+        self.tag_idx = np.asarray(tag_idx, dtype=np.int32)
+        self.topic_idx = np.asarray(topic_idx, dtype=np.int16)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.authors = np.asarray(authors, dtype=np.uint64)
+        self.views = np.asarray(views, dtype=np.int64)
+        self.engagements = np.asarray(engagements, dtype=np.int64)
+        self.lat = np.full(n, np.nan, dtype=np.float32) if lat is None else np.asarray(lat, dtype=np.float32)
+        self.lng = np.full(n, np.nan, dtype=np.float32) if lng is None else np.asarray(lng, dtype=np.float32)
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.tag_idx, self.topic_idx, self.timestamps, self.authors,
+                                              self.views, self.engagements, self.lat, self.lng))
+
+class Normalizer:
+    """Turns extracted post fields into a PostBatch, tagging tracked topics in one scan per post"""
+    
+    def __init__(self, topics: Sequence[str]):
+        self.topics = list(topics)
+        self.topic_matcher = KeywordMatcher()
+        for i, topic in enumerate(self.topics):
+            self.topic_matcher.add(topic, i)
+    
+    def to_batch(self, platform: str, rows: Sequence[Tuple]) -> PostBatch:
+        """`rows` are (timestamp, author, text, hashtags, views, engagements, lat, lng) tuples"""
+        tags: Dict[str, int] = {}
+        tag_idx, topic_idx = [], []
+        for _, _, text, hashtags, *_ in rows:
+            owners = self.topic_matcher.matched_owners(' '.join([text, *hashtags]))
+            topic = min(owners) if owners else -1
+            tag = self.topics[topic] if topic >= 0 else (hashtags[0].lower() if hashtags else None)
+            topic_idx.append(topic)
+            tag_idx.append(tags.setdefault(tag, len(tags)) if tag else -1)
+        
+        columns = list(zip(*rows)) if rows else [[]] * 8
+        return PostBatch(
+            platform, list(tags), np.array(tag_idx), np.array(topic_idx),
+            np.array(columns[0], dtype=np.float64), hash_strings(columns[1]),
+            np.array(columns[4], dtype=np.int64), np.array(columns[5], dtype=np.int64),
+            np.array(columns[6], dtype=np.float64), np.array(columns[7], dtype=np.float64)
+        )
+
+class PlatformAdapter:
+    """Decodes one platform's raw payloads into normalized rows
+    
+    Subclasses implement `extract` (payload -> row tuple) and `encode` (the
+    inverse, used to write stand-in feeds).
+    """
+    
+    platform = ''
+    
+    def extract(self, payload: Dict[str, Any]) -> Tuple:
+        raise NotImplementedError
+    
+    def encode(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+    
+    def decode(self, lines: Iterable[bytes], normalizer: Normalizer) -> PostBatch:
+        """Decode a batch of newline-delimited JSON payloads; malformed lines are skipped"""
+        rows = []
+        for line in lines:
+            try:
+                rows.append(self.extract(loads(line)))
+            except (ValueError, KeyError, TypeError):
+                continue
+        return normalizer.to_batch(self.platform, rows)
+
+ADAPTERS: Dict[str, PlatformAdapter] = {}
+
+def register_adapter(cls: Callable[[], PlatformAdapter]) -> Callable[[], PlatformAdapter]:
+    """Class decorator adding an adapter to the registry under its platform name"""
+    ADAPTERS[cls.platform] = cls()
+    return cls
+
+def _no_geo() -> Tuple[float, float]:
+    return float('nan'), float('nan')
+
+@register_adapter
+class TwitterAdapter(PlatformAdapter):
+    platform = 'Twitter'
+    
+    def extract(self, payload):
+        metrics = payload.get('public_metrics', {})
+        coordinates = (payload.get('coordinates') or {}).get('coordinates')
+        lng, lat = coordinates if coordinates else _no_geo()
+        return (
+            datetime.strptime(payload['created_at'], '%a %b %d %H:%M:%S %z %Y').timestamp(),
+            payload['user']['screen_name'],
+            payload.get('full_text', ''),
+            [tag['text'] for tag in payload.get('entities', {}).get('hashtags', [])],
+            metrics.get('impression_count', 0),
+            metrics.get('like_count', 0) + metrics.get('retweet_count', 0)
+            + metrics.get('reply_count', 0) + metrics.get('quote_count', 0),
+            lat, lng
+        )
+    
+    def encode(self, post):
+        engagements = post.get('engagements', 0)
+        payload = {
+            'id_str': str(post['post_id']),
+            'full_text': post['text'],
+            'created_at': post['timestamp'].astimezone(timezone.utc).strftime('%a %b %d %H:%M:%S %z %Y'),
+            'user': {'screen_name': post['author']},
+            'entities': {'hashtags': [{'text': tag} for tag in _HASHTAG_RE.findall(post['text'])]},
+            'public_metrics': {'impression_count': post.get('views', 0), 'like_count': engagements,
+                               'retweet_count': 0, 'reply_count': 0, 'quote_count': 0}
+        }
+        if post.get('lat') is not None:
+            payload['coordinates'] = {'type': 'Point', 'coordinates': [post['lng'], post['lat']]}
+        return payload
+
+@register_adapter
+class RedditAdapter(PlatformAdapter):
+    platform = 'Reddit'
+    
+    def extract(self, payload):
+        text = f"{payload.get('title', '')} {payload.get('selftext', '')}"
+        engagements = payload.get('score', 0) + payload.get('num_comments', 0)
+        views = payload.get('view_count') or engagements * REDDIT_VIEWS_PER_ENGAGEMENT
+        return (
+            float(payload['created_utc']),
+            payload['author'],
+            text,
+            _HASHTAG_RE.findall(text) + [payload.get('subreddit', '')],
+            views, engagements,
+            *_no_geo()
+        )
+    
+    def encode(self, post):
+        return {
+            'id': str(post['post_id']),
+            'title': post['text'],
+            'selftext': '',
+            'author': post['author'],
+            'created_utc': post['timestamp'].timestamp(),
+            'subreddit': post['topic'],
+            'score': post.get('engagements', 0),
+            'num_comments': 0,
+            'view_count': post.get('views')
+        }
+
+@register_adapter
+class TikTokAdapter(PlatformAdapter):
+    platform = 'TikTok'
+    
+    def extract(self, payload):
+        stats = payload.get('stats', {})
+        return (
+            float(payload['create_time']),
+            payload['author']['unique_id'],
+            payload.get('desc', ''),
+            [challenge['title'] for challenge in payload.get('challenges', [])],
+            stats.get('play_count', 0),
+            stats.get('digg_count', 0) + stats.get('comment_count', 0) + stats.get('share_count', 0),
+            *_no_geo()
+        )
+    
+    def encode(self, post):
+        return {
+            'video_id': str(post['post_id']),
+            'desc': post['text'],
+            'create_time': int(post['timestamp'].timestamp()),
+            'author': {'unique_id': post['author']},
+            'challenges': [{'title': tag} for tag in _HASHTAG_RE.findall(post['text'])],
+            'stats': {'play_count': post.get('views', 0), 'digg_count': post.get('engagements', 0),
+                      'comment_count': 0, 'share_count': 0}
+        }
+
+@register_adapter
+class InstagramAdapter(PlatformAdapter):
+    platform = 'Instagram'
+    
+    def extract(self, payload):
+        caption = (payload.get('caption') or {}).get('text', '')
+        location = payload.get('location') or {}
+        return (
+            float(payload['taken_at']),
+            payload['user']['username'],
+            caption,
+            _HASHTAG_RE.findall(caption),
+            payload.get('play_count') or payload.get('view_count') or 0,
+            payload.get('like_count', 0) + payload.get('comment_count', 0),
+            location.get('lat', float('nan')), location.get('lng', float('nan'))
+        )
+    
+    def encode(self, post):
+        payload = {
+            'pk': str(post['post_id']),
+            'caption': {'text': post['text']},
+            'taken_at': int(post['timestamp'].timestamp()),
+            'user': {'username': post['author']},
+            'play_count': post.get('views', 0),
+            'like_count': post.get('engagements', 0),
+            'comment_count': 0
+        }
+        if post.get('lat') is not None:
+            payload['location'] = {'lat': post['lat'], 'lng': post['lng']}
+        return payload
+
+class JsonlFileSource:
+    """Tails a newline-delimited JSON file, returning up to `batch_size` new lines per read"""
+    
+    def __init__(self, path: str, batch_size: int = 5000):
+        self.path = path
+        self.batch_size = batch_size
+        self.offset = 0
+    
+    def read_batch(self) -> List[bytes]:
+        if not os.path.exists(self.path):
+            return []
+        lines = []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while len(lines) < self.batch_size:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break  # partial line still being written
+                self.offset += len(line)
+                lines.append(line)
+        return lines
+
+class SocketSource:
+    """Reads newline-delimited JSON from a TCP stand-in without blocking"""
+    
+    def __init__(self, host: str, port: int, batch_size: int = 5000):
+        self.address = (host, port)
+        self.batch_size = batch_size
+        self.sock: Optional[socket.socket] = None
+        self.buffer = b''
+    
+    def read_batch(self) -> List[bytes]:
+        try:
+            if self.sock is None:
+                self.sock = socket.create_connection(self.address, timeout=1)
+                self.sock.setblocking(False)
+            while self.buffer.count(b'\n') < self.batch_size:
+                chunk = self.sock.recv(65536)
+                if not chunk:
+                    self.close()
+                    break
+                self.buffer += chunk
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.close()
+        
+        *lines, self.buffer = self.buffer.split(b'\n')
+        return lines
+    
+    def close(self) -> None:
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+
+def sources_from_env() -> List[Tuple[PlatformAdapter, Any]]:
+    """Feed stand-ins configured by VIRALPULSE_FEED_DIR ({platform}.jsonl files)
+    and VIRALPULSE_FEED_SOCKETS ("Twitter=127.0.0.1:9001,Reddit=...")"""
+    sources = []
+    feed_dir = os.environ.get('VIRALPULSE_FEED_DIR')
+    if feed_dir:
+        for platform, adapter in ADAPTERS.items():
+            sources.append((adapter, JsonlFileSource(os.path.join(feed_dir, f"{platform.lower()}.jsonl"))))
+    for entry in filter(None, os.environ.get('VIRALPULSE_FEED_SOCKETS', '').split(',')):
+        platform, address = entry.split('=')
+        host, port = address.rsplit(':', 1)
+        sources.append((ADAPTERS[platform.strip()], SocketSource(host, int(port))))
+    return sources
+
+def write_sample_feeds(feed_dir: str, posts_per_platform: int) -> None:
+    """Write stand-in feeds in each platform's native payload shape from mock posts"""
+    from src.mock_data import MockDataGenerator
+    
+    mock_gen = MockDataGenerator()
+    rng = np.random.default_rng()
+    os.makedirs(feed_dir, exist_ok=True)
+    for platform, adapter in ADAPTERS.items():
+        with open(os.path.join(feed_dir, f"{platform.lower()}.jsonl"), 'ab') as f:
+            for post in mock_gen.generate_posts(posts_per_platform, hours=1):
+                views = int(rng.lognormal(4, 1))
+                post.update(author=f"{platform.lower()}_{post['author']}", views=views,
+                            engagements=int(rng.binomial(views, 0.08)))
+                f.write(dumps(adapter.encode(post)) + b'\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write stand-in platform feeds for the ingestion adapters")
+    parser.add_argument('feed_dir')
+    parser.add_argument('--posts', type=int, default=10_000, help="posts appended per platform")
+    args = parser.parse_args()
+    write_sample_feeds(args.feed_dir, args.posts)
+
+if __name__ == '__main__':
+    main()
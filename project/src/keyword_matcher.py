@@ -0,0 +1,166 @@
+import re
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+_WORD_RE = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded word tokens; hashtags and mentions lose their '#'/'@' prefix"""
+    return _WORD_RE.findall(text.casefold())
+
+def normalize_phrase(text: str) -> str:
+    """Canonical form shared by patterns and scanned text: tokens joined by single spaces"""
+    return ' '.join(tokenize(text))
+
+class KeywordMatcher:
+    """Aho-Corasick automaton matching many keywords in one pass over the text
+    
+    Matching is case-folded and token-aligned: 'AIethics' matches '#AIethics'
+    and 'aiethics!' but not 'aiethicsfoo'. Each keyword may have several
+    owners (alert ids, topic names, ...); a keyword stays active while it has
+    at least one owner. Adding a keyword extends the trie in place and only
+    the failure links are recomputed, lazily, on the next scan; removed
+    keywords are deactivated and the trie is compacted once enough are dead.
+    """
+    
+    def __init__(self, keywords: Optional[Iterable[str]] = None):
+        self._reset()
+        for keyword in keywords or []:
+            self.add(keyword)
+    
+    def _reset(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[int] = [-1]  # pattern id ending at node, or -1
+        self._output_link: List[int] = [-1]  # nearest terminal node along failure links
+        self._patterns: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._owners: List[Set[Hashable]] = []
+        self._dead = 0
+        self._dirty = False
+    
+    def __len__(self) -> int:
+        return len(self._patterns) - self._dead
+    
+    def _insert(self, pattern: str, pattern_id: int) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(-1)
+                self._output_link.append(-1)
+            node = nxt
+        self._terminal[node] = pattern_id
+        self._dirty = True
+    
+    def add(self, keyword: str, owner: Hashable = None) -> Optional[str]:
+        """Register `keyword` for `owner`; returns the normalized pattern (None if empty)"""
+        pattern = normalize_phrase(keyword)
+        if not pattern:
+            return None
+        
+        pattern_id = self._ids.get(pattern)
+        if pattern_id is None:
+            pattern_id = len(self._patterns)
+            self._patterns.append(pattern)
+            self._ids[pattern] = pattern_id
+            self._owners.append(set())
+            self._insert(pattern, pattern_id)
+        elif not self._owners[pattern_id]:
+            self._dead -= 1
+        
+        self._owners[pattern_id].add(owner)
+        return pattern
+    
+    def remove(self, keyword: str, owner: Hashable = None) -> None:
+        """Drop `owner` from `keyword`; the keyword stops matching when it has no owners"""
+        pattern_id = self._ids.get(normalize_phrase(keyword))
+        if pattern_id is None or owner not in self._owners[pattern_id]:
+            return
+        
+        self._owners[pattern_id].discard(owner)
+        if not self._owners[pattern_id]:
+            self._dead += 1
+            if self._dead > max(16, len(self._patterns) // 2):
+                self._compact()
+    
+    def owners(self, pattern: str) -> Set[Hashable]:
+        pattern_id = self._ids.get(pattern)
+        return self._owners[pattern_id] if pattern_id is not None else set()
+    
+    def _compact(self) -> None:
+        """Rebuild the trie from active keywords only"""
+        live = [(p, self._owners[i]) for i, p in enumerate(self._patterns) if self._owners[i]]
+        self._reset()
+        for pattern, owners in live:
+            pattern_id = len(self._patterns)
+            self._patterns.append(pattern)
+            self._ids[pattern] = pattern_id
+            self._owners.append(owners)
+            self._insert(pattern, pattern_id)
+    
+    def _build_links(self) -> None:
+        """Breadth-first computation of failure and output links"""
+        goto, fail, terminal, output_link = self._goto, self._fail, self._terminal, self._output_link
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            output_link[child] = -1
+            queue.append(child)
+        
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                target = fail[child]
+                output_link[child] = target if terminal[target] >= 0 else output_link[target]
+                queue.append(child)
+        
+        self._dirty = False
+    
+    def scan(self, text: str) -> Dict[str, int]:
+        """Count token-aligned occurrences of every active keyword in `text`"""
+        if self._dirty:
+            self._build_links()
+        
+        goto, fail, terminal, output_link = self._goto, self._fail, self._terminal, self._output_link
+        patterns, owners = self._patterns, self._owners
+        text = normalize_phrase(text)
+        end = len(text)
+        counts: Dict[str, int] = {}
+        node = 0
+        
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            
+            # Only report matches that end on a token boundary
+            if i + 1 < end and text[i + 1] != ' ':
+                continue
+            
+            hit = node if terminal[node] >= 0 else output_link[node]
+            while hit >= 0:
+                pattern_id = terminal[hit]
+                start = i + 1 - len(patterns[pattern_id])
+                if owners[pattern_id] and (start == 0 or text[start - 1] == ' '):
+                    pattern = patterns[pattern_id]
+                    counts[pattern] = counts.get(pattern, 0) + 1
+                hit = output_link[hit]
+        
+        return counts
+    
+    def matched_owners(self, text: str) -> Dict[Hashable, List[str]]:
+        """Owners whose keywords occur in `text`, with the keywords that matched"""
+        result: Dict[Hashable, List[str]] = {}
+        for pattern in self.scan(text):
+            for owner in self.owners(pattern):
+                result.setdefault(owner, []).append(pattern)
+        return result
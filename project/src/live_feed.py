@@ -0,0 +1,174 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+from src.serialization import dumps
+
+class LiveEvent:
+    """A published delta, encoded once and shared by every subscriber"""
+    
+    __slots__ = ('seq', 'type', 'payload', 'data', 'sse')
+    
+    def __init__(self, seq: int, event_type: str, payload: Any):
+        self.seq = seq
+        self.type = event_type
+        self.payload = payload
+        self.data = dumps({'seq': seq, 'type': event_type, 'payload': payload}).decode('utf-8')
+        self.sse = f"id: {seq}\nevent: {event_type}\ndata: {self.data}\n\n".encode('utf-8')
+
+class Subscription:
+    """One connected viewer: a bounded queue of pending events"""
+    
+    def __init__(self, broadcaster: 'Broadcaster', max_pending: int):
+        self.broadcaster = broadcaster
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.lagged = False
+        self.dropped = 0
+    
+    def offer(self, event: LiveEvent) -> None:
+        """Enqueue without blocking the publisher; a full queue marks the viewer as lagged"""
+        if self.lagged:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+            self.dropped += 1
+    
+    async def get(self) -> LiveEvent:
+        """Next event, or a resync marker if this viewer fell behind"""
+        if self.lagged:
+            # Backpressure: rather than buffering unboundedly for a slow consumer,
+            # discard its backlog and tell it to re-fetch a snapshot.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.lagged = False
+            return self.broadcaster.resync_event()
+        return await self.queue.get()
+
+class Broadcaster:
+    """Fan out live deltas with sequence numbers, replay and slow-consumer handling"""
+    
+    def __init__(self, history_size: int = 1024, max_pending: int = 256):
+        self.seq = 0
+        self.history: Deque[LiveEvent] = deque(maxlen=history_size)
+        self.max_pending = max_pending
+        self.subscribers: Set[Subscription] = set()
+    
+    def publish(self, event_type: str, payload: Any) -> LiveEvent:
+        """Encode an event once and offer it to every subscriber"""
+        self.seq += 1
+        event = LiveEvent(self.seq, event_type, payload)
+        self.history.append(event)
+        for subscription in self.subscribers:
+            subscription.offer(event)
+        return event
+    
+    def resync_event(self) -> LiveEvent:
+        return LiveEvent(self.seq, 'resync', {'latest_seq': self.seq})
+    
+    def subscribe(self, last_seq: Optional[int] = None) -> Subscription:
+        """Register a viewer, replaying anything after `last_seq` that is still retained"""
+        subscription = Subscription(self, self.max_pending)
+        
+        if last_seq is not None and last_seq < self.seq:
+            oldest = self.history[0].seq if self.history else self.seq + 1
+            if last_seq + 1 < oldest:
+                # The gap is no longer in the ring buffer
+                subscription.lagged = True
+            else:
+                for event in self.history:
+                    if event.seq > last_seq:
+                        subscription.offer(event)
+        
+        self.subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscribers.discard(subscription)
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'seq': self.seq,
+            'subscribers': len(self.subscribers),
+            'lagged': sum(1 for s in self.subscribers if s.lagged),
+            'retained_events': len(self.history)
+        }
+
+def _by_topic(rows: Iterable[Dict[str, Any]], score_key: str) -> Dict[str, Dict[str, Any]]:
+    """Keep the highest-scoring row per topic"""
+    latest = {}
+    for row in rows:
+        current = latest.get(row['topic'])
+        if current is None or row[score_key] > current[score_key]:
+            latest[row['topic']] = row
+    return latest
+
+class LiveFeedProducer:
+    """Poll the trend generator and conflict detector and publish only what changed"""
+    
+    def __init__(self, broadcaster: Broadcaster, mock_gen, conflict_detector,
+                 interval: float = 5.0, controversy_delta: int = 5,
+                 alert_evaluator: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None):
+        self.broadcaster = broadcaster
+        self.mock_gen = mock_gen
+        self.conflict_detector = conflict_detector
+        self.interval = interval
+        self.controversy_delta = controversy_delta
+        self.alert_evaluator = alert_evaluator
+        self.trends: Dict[str, Dict[str, Any]] = {}
+        self.conflicts: Dict[str, Dict[str, Any]] = {}
+    
+    def diff(self, trends: List[Dict[str, Any]], conflicts: List[Dict[str, Any]]) -> List[tuple]:
+        """Compute (event_type, payload) deltas against the previous tick"""
+        events = []
+        
+        # Trends: new topics and controversy moves beyond the threshold
+        latest_trends = _by_topic(trends, 'views')
+        for topic, trend in latest_trends.items():
+            previous = self.trends.get(topic)
+            if previous is None:
+                events.append(('trend.new', trend))
+            elif abs(trend['controversy'] - previous['controversy']) >= self.controversy_delta:
+                events.append(('trend.update', {
+                    'topic': topic,
+                    'controversy': trend['controversy'],
+                    'previous_controversy': previous['controversy'],
+                    'views': trend['views']
+                }))
+        for topic in self.trends.keys() - latest_trends.keys():
+            events.append(('trend.expired', {'topic': topic}))
+        
+        # Conflicts: new or changed levels, and conflicts that went quiet
+        latest_conflicts = _by_topic(conflicts, 'conflict_level')
+        for topic, conflict in latest_conflicts.items():
+            previous = self.conflicts.get(topic)
+            if previous is None or abs(conflict['conflict_level'] - previous['conflict_level']) >= self.controversy_delta:
+                events.append(('conflict.update', conflict))
+        for topic in self.conflicts.keys() - latest_conflicts.keys():
+            events.append(('conflict.resolved', {'topic': topic}))
+        
+        self.trends = latest_trends
+        self.conflicts = latest_conflicts
+        return events
+    
+    async def tick(self) -> int:
+        """Run one poll; returns the number of events published"""
+        trends = await asyncio.to_thread(self.mock_gen.generate_trending_topics)
+        conflicts = await asyncio.to_thread(self.conflict_detector.detect_real_time_conflicts)
+        
+        events = self.diff(trends, conflicts)
+        if self.alert_evaluator is not None:
+            # Evaluation reads and writes the alert store, so it stays off the event loop too
+            notifications = await asyncio.to_thread(self.alert_evaluator, trends)
+            events.extend(('alert.fired', n) for n in notifications)
+        
+        for event_type, payload in events:
+            self.broadcaster.publish(event_type, payload)
+        return len(events)
+    
+    async def run(self) -> None:
+        while True:
+            await self.tick()
+            await asyncio.sleep(self.interval)
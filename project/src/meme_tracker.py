@@ -0,0 +1,216 @@
+import hashlib
+import zlib
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.keyword_matcher import tokenize
+
+# MinHash signature = BANDS x ROWS permutations; two posts become LSH
+# candidates when any band matches, which happens with probability
+# 1 - (1 - J^ROWS)^BANDS for Jaccard similarity J (~50% at J = 0.5)
+BANDS = 16
+ROWS = 4
+SHINGLE_SIZE = 3
+
+# Candidates join a family only if their estimated Jaccard clears this bar
+SIMILARITY_THRESHOLD = 0.5
+
+# Texts hashed per numpy pass; bounds the (permutations x shingles) temporary
+SIGNATURE_BATCH = 4096
+
+# Universal hashing modulus, just above 2^32 so a*x + b stays within uint64
+_PRIME = np.uint64(4294967311)
+
+class MemeFamily:
+    """A cluster of near-duplicate posts with per-day popularity and platform counts"""
+    
+    def __init__(self, family_id: int, signature: np.ndarray, text: str):
+        self.family_id = family_id
+        self.signature = signature
+        self.text = text
+        self.size = 0
+        self.topics: Counter = Counter()
+        self.daily_posts: Counter = Counter()
+        self.daily_new_variants: Counter = Counter()
+        self.daily_platforms: Dict[date, Counter] = defaultdict(Counter)
+        self.variants = 0
+        # Index entries this family owns, removed with it on eviction
+        self.text_keys: Set[bytes] = set()
+        self.band_keys: List[Tuple[int, bytes]] = []
+    
+    def record(self, topic: str, platform: str, day: date, new_variant: bool) -> None:
+        self.size += 1
+        self.topics[topic] += 1
+        self.daily_posts[day] += 1
+        self.daily_platforms[day][platform] += 1
+        if new_variant:
+            self.variants += 1
+            self.daily_new_variants[day] += 1
+
+class MemeTracker:
+    """Groups posts into meme variant families with MinHash LSH
+    
+    Each post is shingled into word 3-grams and reduced to a MinHash
+    signature; the signature's bands are looked up in hash tables to find
+    candidate families, so assignment costs a constant number of lookups
+    regardless of how many posts were seen. Exact reposts skip hashing
+    entirely via a text digest -> family map. Families with no posts inside
+    the retention window are evicted along with their index entries, so
+    memory follows recent activity rather than every post ever seen.
+    """
+    
+    def __init__(self, seed: int = 7, retention_days: int = 30):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 31, BANDS * ROWS, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, BANDS * ROWS, dtype=np.uint64)
+        self.retention_days = retention_days
+        
+        self.families: Dict[int, MemeFamily] = {}
+        self.band_tables: List[Dict[bytes, int]] = [{} for _ in range(BANDS)]
+        # blake2b of the text rather than hash(): stable across processes and restarts
+        self.text_families: Dict[bytes, int] = {}
+        self.posts_seen = 0
+        self.evicted = 0
+        self._next_id = 0
+        self._pruned_on: Optional[date] = None
+    
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _shingles(self, text: str) -> List[int]:
+        tokens = tokenize(text)
+        if len(tokens) <= SHINGLE_SIZE:
+            return [zlib.crc32(' '.join(tokens).encode('utf-8'))]
+        return list({
+            zlib.crc32(' '.join(tokens[i:i + SHINGLE_SIZE]).encode('utf-8'))
+            for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        })
+    
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """MinHash signatures for a batch of texts, one row per text"""
+        if len(texts) > SIGNATURE_BATCH:
+            return np.concatenate([
+                self.signatures(texts[i:i + SIGNATURE_BATCH]) for i in range(0, len(texts), SIGNATURE_BATCH)
+            ])
+        
+        shingles = [self._shingles(text) for text in texts]
+        lengths = np.array([len(s) for s in shingles])
+        flat = np.fromiter((h for s in shingles for h in s), dtype=np.uint64, count=int(lengths.sum()))
+        
+        # Permute every shingle under every hash function, then take per-text minima
+        hashed = (self.a[:, None] * flat[None, :] + self.b[:, None]) % _PRIME
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        return np.minimum.reduceat(hashed, offsets, axis=1).T
+    
+    def _find_family(self, signature: np.ndarray) -> Optional[int]:
+        bands = signature.reshape(BANDS, ROWS)
+        candidates = {
+            self.band_tables[i].get(bands[i].tobytes()) for i in range(BANDS)
+        }
+        candidates.discard(None)
+        
+        best, best_similarity = None, SIMILARITY_THRESHOLD
+        for family_id in candidates:
+            similarity = float(np.mean(self.families[family_id].signature == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = family_id, similarity
+        return best
+    
+    def _index(self, signature: np.ndarray, family_id: int) -> None:
+        bands = signature.reshape(BANDS, ROWS)
+        family = self.families[family_id]
+        for i in range(BANDS):
+            key = bands[i].tobytes()
+            if self.band_tables[i].setdefault(key, family_id) == family_id:
+                family.band_keys.append((i, key))
+    
+    def add_posts(self, posts: Sequence[Dict[str, Any]]) -> List[int]:
+        """Assign each post to a variant family and update its stats; returns family ids"""
+        today = datetime.now().date()
+        if self._pruned_on != today:
+            self.prune()
+            self._pruned_on = today
+        
+        keys = [self._text_key(post['text']) for post in posts]
+        new_texts = {key: post['text'] for key, post in zip(keys, posts) if key not in self.text_families}
+        if new_texts:
+            for (key, text), signature in zip(new_texts.items(), self.signatures(list(new_texts.values()))):
+                family_id = self._find_family(signature)
+                if family_id is None:
+                    family_id = self._next_id
+                    self._next_id += 1
+                    self.families[family_id] = MemeFamily(family_id, signature, text)
+                # Index every variant so families follow mutations away from the original
+                self._index(signature, family_id)
+                self.text_families[key] = family_id
+                self.families[family_id].text_keys.add(key)
+        
+        new_variants = set(new_texts)
+        family_ids = []
+        for post, key in zip(posts, keys):
+            family_id = self.text_families[key]
+            self.families[family_id].record(
+                post['topic'], post['platform'], post['timestamp'].date(), key in new_variants
+            )
+            new_variants.discard(key)
+            family_ids.append(family_id)
+        
+        self.posts_seen += len(posts)
+        return family_ids
+    
+    def top_families(self, topics: Optional[Sequence[str]] = None, n: int = 5) -> List[MemeFamily]:
+        """Largest families, optionally restricted to those spreading under `topics`"""
+        families = list(self.families.values())
+        if topics:
+            families = [family for family in families if any(family.topics[topic] for topic in topics)]
+        return sorted(families, key=lambda family: family.size, reverse=True)[:n]
+    
+    def timeline(self, family: MemeFamily, days: int = 7, end: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Daily popularity, cumulative variant count and dominant platform for a family"""
+        end = end or datetime.now().date()
+        start = end - timedelta(days=days - 1)
+        variants = sum(count for day, count in family.daily_new_variants.items() if day < start)
+        
+        timeline = []
+        for i in range(days):
+            day = start + timedelta(days=i)
+            variants += family.daily_new_variants[day]
+            platforms = family.daily_platforms.get(day)
+            timeline.append({
+                'date': day,
+                'popularity': family.daily_posts[day],
+                'variant_count': variants,
+                'platform_dominance': platforms.most_common(1)[0][0] if platforms else None
+            })
+        return timeline
+    
+    def prune(self, now: Optional[datetime] = None) -> None:
+        """Drop per-day stats older than the retention window, and families left with none"""
+        cutoff = (now or datetime.now()).date() - timedelta(days=self.retention_days)
+        for family_id, family in list(self.families.items()):
+            for day in [day for day in family.daily_posts if day < cutoff]:
+                del family.daily_posts[day]
+                family.daily_platforms.pop(day, None)
+            if not family.daily_posts:
+                self._evict(family)
+    
+    def _evict(self, family: MemeFamily) -> None:
+        for i, key in family.band_keys:
+            if self.band_tables[i].get(key) == family.family_id:
+                del self.band_tables[i][key]
+        for key in family.text_keys:
+            self.text_families.pop(key, None)
+        del self.families[family.family_id]
+        self.evicted += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'posts': self.posts_seen,
+            'families': len(self.families),
+            'variants': len(self.text_families),
+            'evicted_families': self.evicted
+        }
@@ -0,0 +1,196 @@
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from src.tracing import LatencyHistogram
+
+# Recent samples kept per metric; older ones are overwritten
+DEFAULT_CAPACITY = 4096
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Port for a process's own /metrics endpoint (see start_metrics_server); unset means none
+METRICS_PORT_ENV = 'VIRALPULSE_METRICS_PORT'
+
+class RingBuffer:
+    """Fixed-size buffer of (timestamp, value) samples, oldest overwritten first"""
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.written = 0
+    
+    def append(self, timestamp: float, value: float) -> None:
+        i = self.written % self.capacity
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.written += 1
+    
+    def samples(self, since: Optional[float] = None) -> Tuple[List[float], List[float]]:
+        """Retained samples in time order, optionally only those at or after `since`"""
+        n = min(self.written, self.capacity)
+        start = self.written % self.capacity if self.written > self.capacity else 0
+        order = [(start + k) % self.capacity for k in range(n)]
+        if since is not None:
+            order = [i for i in order if self.timestamps[i] >= since]
+        return [self.timestamps[i] for i in order], [self.values[i] for i in order]
+
+class _Metric:
+    kind = ''
+    
+    def __init__(self, name: str, help: str, capacity: int):
+        self.name = name
+        self.help = help
+        self.recent = RingBuffer(capacity)
+        self._lock = threading.Lock()
+
+class Counter(_Metric):
+    """Monotonic total; each increment is also kept as a sample for rate plots"""
+    
+    kind = 'counter'
+    
+    def __init__(self, name: str, help: str, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(name, help, capacity)
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+            self.recent.append(time.time(), amount)
+
+class Gauge(_Metric):
+    """Current value of something that goes up and down, with its recent history"""
+    
+    kind = 'gauge'
+    
+    def __init__(self, name: str, help: str, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(name, help, capacity)
+        self.value = 0.0
+    
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+            self.recent.append(time.time(), value)
+
+class Histogram(_Metric):
+    """Distribution of observations (seconds): lifetime quantiles plus recent raw samples"""
+    
+    kind = 'summary'
+    
+    def __init__(self, name: str, help: str, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(name, help, capacity)
+        self.distribution = LatencyHistogram()
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.distribution.record(int(seconds * 1e9))
+            self.count += 1
+            self.sum += seconds
+            self.recent.append(time.time(), seconds)
+    
+    def quantiles(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[float, float]:
+        with self._lock:
+            values = self.distribution.percentiles([q * 100 for q in quantiles])
+        return {q: value / 1e9 for q, value in zip(quantiles, values)}
+
+class MetricsRegistry:
+    """In-process metrics: counters, gauges and histograms over fixed-size ring buffers
+    
+    Memory per metric is bounded by its ring capacity, so instrumentation can
+    stay on permanently. Metrics are created on first use by name, and the
+    whole registry renders as Prometheus text exposition.
+    """
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.started = time.time()
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get(self, cls, name: str, help: str) -> _Metric:
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self.metrics.setdefault(name, cls(name, help, self.capacity))
+        if not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+    
+    def counter(self, name: str, help: str = '') -> Counter:
+        return self._get(Counter, name, help)
+    
+    def gauge(self, name: str, help: str = '') -> Gauge:
+        return self._get(Gauge, name, help)
+    
+    def histogram(self, name: str, help: str = '') -> Histogram:
+        return self._get(Histogram, name, help)
+    
+    def uptime(self) -> float:
+        return time.time() - self.started
+    
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text format (histograms as summaries)"""
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for q, value in metric.quantiles().items():
+                    # Prometheus reports quantiles of an empty summary as NaN
+                    lines.append(f'{name}{{quantile="{q:g}"}} {value:.9g}' if metric.count else f'{name}{{quantile="{q:g}"}} NaN')
+                lines.append(f"{name}_sum {metric.sum:.9g}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                lines.append(f"{name} {metric.value:.9g}")
+        lines.append("# HELP viralpulse_uptime_seconds Seconds since the metrics registry started")
+        lines.append("# TYPE viralpulse_uptime_seconds gauge")
+        lines.append(f"viralpulse_uptime_seconds {self.uptime():.3f}")
+        return '\n'.join(lines) + '\n'
+
+def start_metrics_server(registry: 'MetricsRegistry', port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve `registry` at GET /metrics from a daemon thread, for processes without a web API of their own"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.exposition().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+# Process-wide registry the engines, caches and app record into
+REGISTRY = MetricsRegistry()
+
+RAG_QUERIES = REGISTRY.counter('viralpulse_rag_queries_total', "RAG trend analyses run")
+RAG_LATENCY = REGISTRY.histogram('viralpulse_rag_query_seconds', "RAG trend analysis latency")
+CONFLICT_ANALYSES = REGISTRY.counter('viralpulse_conflict_analyses_total', "Conflict analyses run")
+CONFLICT_LATENCY = REGISTRY.histogram('viralpulse_conflict_analysis_seconds', "Conflict analysis latency")
+CACHE_HITS = REGISTRY.counter('viralpulse_result_cache_hits_total', "Result cache lookups that found their entry")
+CACHE_MISSES = REGISTRY.counter('viralpulse_result_cache_misses_total', "Result cache lookups for absent or evicted entries")
+CACHE_BYTES = REGISTRY.gauge('viralpulse_result_cache_bytes', "Serialized bytes held by the result cache")
+STATE_RECOVERY_SECONDS = REGISTRY.gauge('viralpulse_state_recovery_seconds', "Startup restore of pipeline state (snapshot load plus log replay)")
+STATE_WAL_BYTES = REGISTRY.gauge('viralpulse_state_wal_bytes', "Write-ahead log bytes a restart would replay")
+STATE_SNAPSHOTS = REGISTRY.counter('viralpulse_state_snapshots_total', "Pipeline state snapshots written")
+STATE_SNAPSHOT_SECONDS = REGISTRY.histogram('viralpulse_state_snapshot_seconds', "Pipeline state snapshot capture and write time")
+LLM_FIRST_TOKEN = REGISTRY.histogram('viralpulse_llm_first_token_seconds', "Time from answer request to its first streamed token")
+LLM_TOKENS = REGISTRY.counter('viralpulse_llm_generated_tokens_total', "Answer tokens generated by the LLM backend")
+LLM_PROMPT_TOKENS_REUSED = REGISTRY.counter('viralpulse_llm_prompt_tokens_reused_total', "Prompt tokens already cached in the backend slot they were sent to")
+ANSWER_CACHE_HITS = REGISTRY.counter('viralpulse_answer_cache_hits_total', "Answers served from the semantic answer cache")
+RERUN_LATENCY = REGISTRY.histogram('viralpulse_rerun_seconds', "Streamlit script rerun duration")
@@ -1,8 +1,58 @@
-import random
+import threading
+import zlib
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
+from src.keyword_matcher import KeywordMatcher
+from src.geo import map_zoom_to_bin_zoom
+from src.ingest import PostBatch
+from src.meme_tracker import MemeTracker
+from src.pipeline import PartitionedPipeline
+from src.reach import hash_ids
+from src.sentiment import SentimentScorer, NEUTRAL_BAND
+from src.toxicity import ToxicityClassifier
+
+# Synthetic posts sampled per trend / per hour when scoring sentiment
+POSTS_PER_TREND = 40
+POSTS_PER_HOUR = 30
+
+# Meme waves: each topic gets one candidate wave per period, peaking at
+# roughly MEME_PEAK_POSTS posts/day; smaller top families don't count as memes
+MEME_WAVE_DAYS = 14
+MEME_PEAK_POSTS = 200
+MEME_MIN_POSTS = 50
+
+# Simulated hashtag firehose feeding the pipeline; a share of posts lands
+# on a long tail of one-off hashtags outside the tracked topics
+FIREHOSE_POSTS_PER_HOUR = 847_000
+TAIL_SHARE = 0.2
+TAIL_HASHTAGS = 10_000_000
+TAIL_SAMPLE = 2000
+# Names of the simulated tail hashtags; real hashtags are word characters
+# only, so the prefix tells the simulation's filler apart from feed tags
+TAIL_TAG_PREFIX = '~tail'
+BURSTS_PER_KEY_HOUR = 0.05
+
+# Simulated accounts per platform; most posts come from casual accounts drawn
+# uniformly, the rest from a heavy-tailed core of frequent posters
+ACCOUNTS_PER_PLATFORM = 50_000_000
+CASUAL_SHARE = 0.7
+
+# Share of posts carrying coordinates; most cluster around metros, the rest
+# are scattered. Bins report the nearest metro within METRO_LABEL_DEGREES
+# (or half the bin's width, for coarse bins).
+GEOTAGGED_SHARE = 0.25
+GEO_BACKGROUND_SHARE = 0.05
+# A trend's geographic spread is measured over tiles at this zoom (8x8, roughly continental regions)
+SPREAD_BIN_ZOOM = 3
+METRO_SCATTER_DEGREES = 0.35
+METRO_LABEL_DEGREES = 3.0
+
+# Posts sampled per (window, topic, platform) to estimate its sentiment for
+# the rollups and history, and how far back an empty history store is seeded
+HISTORY_SENTIMENT_SAMPLE = 30
+HISTORY_BACKFILL_DAYS = 90
 
 class MockDataGenerator:
     """Generate realistic mock data for social media trends and analysis"""
@@ -16,6 +66,9 @@ class MockDataGenerator:
         ]
         
         self.platforms = ["Twitter", "Reddit", "TikTok", "Instagram"]
+        self.topic_matcher = KeywordMatcher()
+        for topic in self.topics:
+            self.topic_matcher.add(topic, topic)
         
         self.sample_posts = {
             "AIethics": [
@@ -30,104 +83,562 @@ class MockDataGenerator:
             ]
         }
         
-    def generate_trending_topics(self, count: int = 20) -> List[Dict[str, Any]]:
-        """Generate trending topics with engagement metrics"""
-        trends = []
+        # Post templates by mood: 0 = positive, 1 = neutral, 2 = negative
+        self.post_templates = [
+            [
+                "Loving the progress on #{topic} this week, finally some good news",
+                "#{topic} is a huge win for everyone, really exciting times",
+                "Honestly proud of the #{topic} community, great work",
+                "The benefits of #{topic} are incredible and I'm hopeful",
+                "#{topic} could revolutionize everything, amazing",
+                "Best thread on #{topic} I've read, brilliant and fair take"
+            ],
+            [
+                "New report on #{topic} out today",
+                "Thoughts on #{topic}? This is getting interesting...",
+                "The #{topic} discussion is heating up. Here's my take:",
+                "Can we talk about #{topic} for a minute?",
+                "Live panel on #{topic} starting in 10 minutes",
+                "Reading up on #{topic} before the vote"
+            ],
+            [
+                "#{topic} is a disaster waiting to happen",
+                "Honestly sick of the #{topic} hype, it's overhyped and broken",
+                "The risks of #{topic} are being completely ignored",
+                "#{topic} is not good, this will backfire badly",
+                "Worst take on #{topic} I've seen, terrible and dangerous",
+                "Really worried about #{topic}, the concerns keep growing",
+                "Anyone still defending #{topic} is an idiot, shut up already",
+                "#{topic} fans are brain dead clowns, pathetic"
+            ]
+        ]
+        # Meme formats and the edits variants pick up as they spread
+        self.meme_templates = [
+            "Nobody: absolutely nobody: me explaining #{topic} at 3am",
+            "#{topic} be like: trust me bro it is totally fine",
+            "Me pretending to understand #{topic} so I can join the group chat",
+            "POV: your entire feed turned into #{topic} overnight",
+            "When #{topic} drops another update and your roadmap was already done"
+        ]
+        self.meme_prefixes = ["ok but", "not me", "lmao", "be honest"]
+        self.meme_suffixes = ["lol", "fr fr", "no cap", "😭", "this is so real", "who made this", "💀", "again"]
+        
+        self._templates = [t for mood in self.post_templates for t in mood]
+        self._mood_counts = np.array([len(mood) for mood in self.post_templates])
+        self._mood_offsets = np.concatenate([[0], np.cumsum(self._mood_counts)[:-1]])
+        self.scorer = SentimentScorer()
+        self._template_scores: Optional[np.ndarray] = None
+        self.toxicity = ToxicityClassifier()
+        self._template_toxicity: Optional[np.ndarray] = None
+        
+        # Hidden per (topic, platform) dynamics behind the simulated firehose
+        rng = np.random.default_rng()
+        self._stream_keys = [(topic, platform) for topic in self.topics for platform in self.platforms]
+        self._stream_index = {key: i for i, key in enumerate(self._stream_keys)}
+        self._stream_rates = rng.lognormal(0, 1, len(self._stream_keys))
+        self._stream_views = rng.lognormal(4, 0.5, len(self._stream_keys))
+        self._stream_engagement = rng.uniform(0.025, 0.15, len(self._stream_keys))
+        self._stream_controversy = rng.uniform(20, 95, len(self._stream_keys))
+        self._stream_clock: Optional[datetime] = None
+        self._stream_lock = threading.Lock()
+        self.pipeline = PartitionedPipeline(self.platforms, self.topics)
+        # Optional HistoryStore: when set, every stream micro-batch is also recorded there
+        self.history = None
+        # Thread seeding an empty history store in the background, see attach_history()
+        self.history_backfill: Optional[threading.Thread] = None
+        
+        # (city, lat, lng, relative volume); every metro leans toward some topics
+        self.metros = [
+            ("New York", 40.7128, -74.0060, 10), ("London", 51.5074, -0.1278, 8), ("Tokyo", 35.6762, 139.6503, 9),
+            ("San Francisco", 37.7749, -122.4194, 7), ("Berlin", 52.5200, 13.4050, 5), ("Sydney", -33.8688, 151.2093, 4),
+            ("Toronto", 43.6532, -79.3832, 4), ("Mumbai", 19.0760, 72.8777, 8), ("São Paulo", -23.5505, -46.6333, 7),
+            ("Dubai", 25.2048, 55.2708, 3), ("Los Angeles", 34.0522, -118.2437, 8), ("Chicago", 41.8781, -87.6298, 5),
+            ("Paris", 48.8566, 2.3522, 6), ("Madrid", 40.4168, -3.7038, 4), ("Seoul", 37.5665, 126.9780, 7),
+            ("Singapore", 1.3521, 103.8198, 4), ("Jakarta", -6.2088, 106.8456, 6), ("Lagos", 6.5244, 3.3792, 5),
+            ("Nairobi", -1.2921, 36.8219, 3), ("Mexico City", 19.4326, -99.1332, 6), ("Buenos Aires", -34.6037, -58.3816, 4),
+            ("Bangalore", 12.9716, 77.5946, 6), ("Istanbul", 41.0082, 28.9784, 5), ("Cairo", 30.0444, 31.2357, 4),
+            ("Stockholm", 59.3293, 18.0686, 2), ("Amsterdam", 52.3676, 4.9041, 3), ("Manila", 14.5995, 120.9842, 5),
+            ("Johannesburg", -26.2041, 28.0473, 3)
+        ]
+        self._metro_coords = np.array([(lat, lng) for _, lat, lng, _ in self.metros])
+        self._metro_topic_weights = (
+            np.array([volume for *_, volume in self.metros], dtype=float)[:, None]
+            * rng.lognormal(0, 0.7, (len(self.metros), len(self.topics)))
+        )
+        self._metro_topic_weights /= self._metro_topic_weights.sum(axis=0)
+    
+    def template_scores(self) -> np.ndarray:
+        """Sentiment of every post template, scored once in a single batch"""
+        if self._template_scores is None:
+            self._template_scores = self.scorer.score([t.format(topic='topic') for t in self._templates])
+        return self._template_scores
+    
+    def template_toxicity(self) -> np.ndarray:
+        """Toxicity probability of every post template, scored once in a single batch"""
+        if self._template_toxicity is None:
+            self._template_toxicity = self.toxicity.score([t.format(topic='topic') for t in self._templates])
+        return self._template_toxicity
+    
+    def _sample_templates(self, rng: np.random.Generator, shape, p_positive, p_negative) -> np.ndarray:
+        """Vectorized template draw: pick a mood per post, then a template within it
+        
+        `p_positive`/`p_negative` broadcast against `shape` (per row biases).
+        """
+        u = rng.random(shape)
+        p_positive = np.broadcast_to(p_positive, shape)
+        p_negative = np.broadcast_to(p_negative, shape)
+        mood = np.where(u < p_positive, 0, np.where(u < 1 - p_negative, 1, 2))
+        within = (rng.random(shape) * self._mood_counts[mood]).astype(np.int64)
+        return self._mood_offsets[mood] + within
+    
+    def _polarized_templates(self, rng: np.random.Generator, controversy: np.ndarray, samples: int) -> np.ndarray:
+        """Template draws per row; controversial rows draw more negative and more positive posts"""
+        polarization = np.asarray(controversy, dtype=float)[:, None] / 100
+        return self._sample_templates(
+            rng, (len(polarization), samples),
+            0.5 * (1 - polarization) + 0.2 * polarization, 0.1 + 0.5 * polarization
+        )
+    
+    def generate_posts(self, count: int, topics: Optional[Sequence[str]] = None, hours: int = 24,
+                       negativity: float = 0.3) -> List[Dict[str, Any]]:
+        """Generate synthetic posts with text, author, platform and timestamp"""
+        rng = np.random.default_rng()
+        topics = list(topics) if topics else self.topics
+        now = datetime.now()
+        
+        topic_idx = rng.integers(0, len(topics), count)
+        platform_idx = rng.integers(0, len(self.platforms), count)
+        # Heavy-tailed authorship: a few accounts post a lot
+        authors = rng.zipf(1.5, count) % 50_000
+        ages = rng.uniform(0, hours * 3600, count)
+        templates = self._sample_templates(rng, count, (1 - negativity) * 0.5, negativity)
+        
+        return [
+            {
+                'post_id': i,
+                'topic': topics[topic_idx[i]],
+                'platform': self.platforms[platform_idx[i]],
+                'author': f"user{authors[i]}",
+                'text': self._templates[templates[i]].format(topic=topics[topic_idx[i]]),
+                'timestamp': now - timedelta(seconds=float(ages[i]))
+            }
+            for i in range(count)
+        ]
+        
+    def _advance_stream(self, now: datetime) -> None:
+        """Feed the pipeline the firehose micro-batches between the last call and `now`, plus any configured feeds"""
+        rng = np.random.default_rng()
+        pipeline = self.pipeline
+        horizon = timedelta(seconds=pipeline.window_seconds * pipeline.max_windows)
+        clock = max(self._stream_clock or now - horizon, now - horizon)
+        keys = len(self._stream_keys)
         
-        for i in range(count):
-            topic = random.choice(self.topics)
-            platform = random.choice(self.platforms)
+        while clock < now:
+            # One micro-batch per pipeline window (or the part of it that has elapsed)
+            window_end = datetime.fromtimestamp(pipeline.window_start(clock.timestamp()) + pipeline.window_seconds)
+            step_end = min(window_end, now)
+            hours = (step_end - clock).total_seconds() / 3600
             
-            # Generate realistic engagement numbers
-            base_views = random.randint(10000, 5000000)
-            controversy = random.randint(20, 95)
-            sentiment = random.uniform(-1, 1)
+            # Rates drift, occasionally burst, and are renormalized to the firehose volume
+            self._stream_rates *= np.exp(rng.normal(0, 0.3 * np.sqrt(hours), keys))
+            bursts = rng.random(keys) < BURSTS_PER_KEY_HOUR * hours
+            self._stream_rates[bursts] *= rng.uniform(3, 10, int(bursts.sum()))
+            self._stream_rates /= self._stream_rates.sum()
+            self._stream_controversy = np.clip(self._stream_controversy + rng.normal(0, 10 * np.sqrt(hours), keys), 20, 95)
+            
+            posts = rng.poisson(self._stream_rates * FIREHOSE_POSTS_PER_HOUR * (1 - TAIL_SHARE) * hours)
+            # Long tail: only a sample is emitted; it never reaches the top keys anyway
+            tail_posts = min(rng.poisson(FIREHOSE_POSTS_PER_HOUR * TAIL_SHARE * hours), TAIL_SAMPLE)
+            batches = self._simulate_batches(posts, tail_posts, clock, step_end, rng)
+            for batch in batches:
+                pipeline.ingest(batch)
+            self._score_windows(clock, batches, rng)
+            clock = step_end
+        
+        pipeline.poll()
+        self._stream_clock = now
+        pipeline.advance(now)
+    
+    def _simulate_batches(self, posts: np.ndarray, tail_posts: int, start: datetime, end: datetime,
+                          rng: np.random.Generator) -> List[PostBatch]:
+        """Expand per-(topic, platform) post counts into one normalized batch per platform"""
+        platforms = len(self.platforms)
+        key_idx = np.repeat(np.arange(len(self._stream_keys)), posts)
+        topic_idx = key_idx // platforms
+        platform_idx = key_idx % platforms
+        total = len(key_idx)
+        
+        views = rng.poisson(self._stream_views[key_idx])
+        engagements = rng.binomial(views, self._stream_engagement[key_idx])
+        lat, lng = self._simulate_locations(topic_idx, rng)
+        
+        # Authors: casual accounts drawn uniformly, the rest from a heavy-tailed core
+        accounts = np.where(
+            rng.random(total) < CASUAL_SHARE,
+            rng.integers(0, ACCOUNTS_PER_PLATFORM, total),
+            rng.zipf(1.5, total) % ACCOUNTS_PER_PLATFORM
+        )
+        
+        # Long tail: untracked one-off hashtags, no coordinates
+        tail_tags = rng.integers(0, TAIL_HASHTAGS, tail_posts)
+        tail_platform = tail_tags % platforms
+        tail_views = rng.poisson(20, tail_posts)
+        
+        span = (end - start).total_seconds()
+        batches = []
+        for p, platform in enumerate(self.platforms):
+            mine, tail = platform_idx == p, tail_platform == p
+            tags, tag_idx = np.unique(tail_tags[tail], return_inverse=True)
+            n_tracked, n_tail = int(mine.sum()), int(tail.sum())
+            batches.append(PostBatch(
+                platform,
+                self.topics + [f"{TAIL_TAG_PREFIX}{tag}" for tag in tags],
+                np.concatenate([topic_idx[mine], len(self.topics) + tag_idx]),
+                np.concatenate([topic_idx[mine], np.full(n_tail, -1)]),
+                start.timestamp() + rng.uniform(0, span, n_tracked + n_tail),
+                hash_ids(np.concatenate([accounts[mine], rng.integers(0, ACCOUNTS_PER_PLATFORM, n_tail)])
+                         + p * ACCOUNTS_PER_PLATFORM),
+                np.concatenate([views[mine], tail_views[tail]]),
+                np.concatenate([engagements[mine], rng.binomial(tail_views[tail], 0.02)]),
+                np.concatenate([lat[mine], np.full(n_tail, np.nan)]),
+                np.concatenate([lng[mine], np.full(n_tail, np.nan)])
+            ))
+        return batches
+    
+    def _sample_scores(self, controversy: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Sentiment of a sample of posts per row, polarized by the row's controversy"""
+        return self.template_scores()[self._polarized_templates(rng, controversy, HISTORY_SENTIMENT_SAMPLE)]
+    
+    def _history_columns(self, timestamps: np.ndarray, topic_idx: np.ndarray, posts: np.ndarray, views: np.ndarray,
+                         engagements: np.ndarray, controversy: np.ndarray, scores: np.ndarray) -> Dict[str, Any]:
+        """History store rows, with sentiment summarized from each row's sampled post scores"""
+        return {
+            'timestamp': timestamps,
+            'topic': [self.topics[i] for i in topic_idx],
+            'posts': posts,
+            'views': views,
+            'engagements': engagements,
+            'sentiment': scores.mean(axis=1),
+            'positive_ratio': (scores > NEUTRAL_BAND).mean(axis=1),
+            'negative_ratio': (scores < -NEUTRAL_BAND).mean(axis=1),
+            'controversy': controversy
+        }
+    
+    def _score_windows(self, start: datetime, batches: List[PostBatch], rng: np.random.Generator) -> None:
+        """Sentiment and controversy per tracked topic active in this micro-batch, per platform
+        
+        Folded into the pipeline's rollups, and appended to the history store when one is attached.
+        """
+        topics, platforms = len(self.topics), len(self.platforms)
+        for p, batch in enumerate(batches):
+            tracked = batch.topic_idx >= 0
+            topic_idx = batch.topic_idx[tracked]
+            posts = np.bincount(topic_idx, minlength=topics)
+            active = np.flatnonzero(posts)
+            if not len(active):
+                continue
+            controversy = self._stream_controversy[active * platforms + p]
+            scores = self._sample_scores(controversy, rng)
+            self.pipeline.observe_sentiment(batch.platform, start.timestamp(), active, scores, controversy, posts[active])
+            if self.history is None:
+                continue
+            views = np.bincount(topic_idx, weights=batch.views[tracked], minlength=topics)[active]
+            engagements = np.bincount(topic_idx, weights=batch.engagements[tracked], minlength=topics)[active]
+            self.history.append(batch.platform, self._history_columns(
+                np.full(len(active), int(start.timestamp())), active, posts[active],
+                views.astype(np.int64), engagements.astype(np.int64), controversy, scores
+            ))
+    
+    def _history_handover(self) -> datetime:
+        """Where the live stream's own history rows begin: its clock, or the start of its first catch-up"""
+        horizon = timedelta(seconds=self.pipeline.window_seconds * self.pipeline.max_windows)
+        return self._stream_clock or datetime.now() - horizon
+    
+    def attach_history(self, store, days: int = HISTORY_BACKFILL_DAYS) -> Optional[threading.Thread]:
+        """Record the live stream into `store` from now on; an empty store is also seeded on a background thread
+        
+        Returns the seeding thread (also kept as `history_backfill`), or None
+        when the store already had data and is left as it is.
+        """
+        with self._stream_lock:
+            empty = store.latest() is None
+            end = self._history_handover()
+            self.history = store
+        if empty:
+            self.history_backfill = threading.Thread(target=self.backfill_history, args=(store, days, end),
+                                                     name='history-backfill', daemon=True)
+            self.history_backfill.start()
+        return self.history_backfill
+    
+    def backfill_history(self, store, days: int = HISTORY_BACKFILL_DAYS, end: Optional[datetime] = None) -> int:
+        """Seed `store` with hourly history up to `end`, where the live stream takes over; returns rows added
+        
+        Starts after the newest stored row before `end`, so a store kept
+        across restarts only gets the gap filled.
+        """
+        end = end or self._history_handover()
+        start = end - timedelta(days=days)
+        latest = store.latest()
+        if latest is not None and latest < end:
+            start = max(start, latest + timedelta(hours=1))
+        start = start.replace(minute=0, second=0, microsecond=0)
+        hours = int((end - start).total_seconds() // 3600)
+        if hours <= 0:
+            return 0
+        
+        # Hourly variation around the stream's current rates and controversy:
+        # a few slow cycles per key plus noise, and a day/night cycle in volume
+        rng = np.random.default_rng()
+        keys, platforms = len(self._stream_keys), len(self.platforms)
+        t = np.arange(hours)[None, :, None]
+        periods = rng.uniform(24, 24 * 14, (3, 1, keys))
+        phases = rng.uniform(0, 2 * np.pi, (3, 1, keys))
+        cycles = np.sin(2 * np.pi * t / periods + phases).sum(axis=0)
+        rates = self._stream_rates * np.exp(0.4 * cycles + rng.normal(0, 0.3, (hours, keys)))
+        rates /= rates.sum(axis=1, keepdims=True)
+        hour_starts = start.timestamp() + 3600 * np.arange(hours)
+        diurnal = 1 + 0.3 * np.sin(2 * np.pi * (np.array([datetime.fromtimestamp(t).hour for t in hour_starts]) - 6) / 24)
+        posts = rng.poisson(rates * diurnal[:, None] * FIREHOSE_POSTS_PER_HOUR * (1 - TAIL_SHARE))
+        views = rng.poisson(posts * self._stream_views)
+        engagements = rng.binomial(views, self._stream_engagement)
+        controversy = np.clip(self._stream_controversy + 8 * cycles + rng.normal(0, 5, (hours, keys)), 20, 95)
+        
+        added = 0
+        for p, platform in enumerate(self.platforms):
+            row, key = np.nonzero(posts[:, p::platforms])
+            key = key * platforms + p
+            store.append(platform, self._history_columns(
+                hour_starts[row].astype(np.int64), key // platforms, posts[row, key],
+                views[row, key], engagements[row, key], controversy[row, key],
+                self._sample_scores(controversy[row, key], rng)
+            ))
+            added += len(row)
+        store.flush()
+        return added
+    
+    def _simulate_locations(self, topic_idx: np.ndarray, rng: np.random.Generator):
+        """Coordinates for the geotagged share of posts (NaN elsewhere), clustered around metros"""
+        total = len(topic_idx)
+        lat = np.full(total, np.nan)
+        lng = np.full(total, np.nan)
+        tagged = np.flatnonzero(rng.random(total) < GEOTAGGED_SHARE)
+        if not len(tagged):
+            return lat, lng
+        
+        # Metro per post, drawn from each topic's regional mix via inverse-CDF lookup
+        cdf = np.cumsum(self._metro_topic_weights, axis=0)
+        metro = np.minimum((rng.random(len(tagged))[:, None] > cdf[:, topic_idx[tagged]].T).sum(axis=1), len(self.metros) - 1)
+        lat[tagged] = self._metro_coords[metro, 0] + rng.normal(0, METRO_SCATTER_DEGREES, len(tagged))
+        lng[tagged] = self._metro_coords[metro, 1] + rng.normal(0, METRO_SCATTER_DEGREES, len(tagged)) / np.cos(np.radians(lat[tagged]))
+        
+        background = tagged[rng.random(len(tagged)) < GEO_BACKGROUND_SHARE]
+        lat[background] = rng.uniform(-50, 65, len(background))
+        lng[background] = rng.uniform(-180, 180, len(background))
+        return lat, np.clip(lng, -180, 180)
+    
+    def restore_state(self, store) -> Dict[str, Any]:
+        """Recover the pipeline from a StateStore (snapshot plus log tail) and resume the stream where it stopped"""
+        with self._stream_lock:
+            report = store.recover(self.pipeline)
+            if self.pipeline.watermark is not None:
+                self._stream_clock = datetime.fromtimestamp(self.pipeline.watermark)
+        return report
+    
+    def unique_participants(self, topic: Optional[str] = None, platform: Optional[str] = None,
+                            hours: int = 24) -> int:
+        """Distinct accounts posting on tracked topics (optionally one topic/platform) over `hours`"""
+        now = datetime.now()
+        with self._stream_lock:
+            self._advance_stream(now)
+            return self.pipeline.unique_participants(topic, platform, hours, now)
+    
+    def rollup_metrics(self, hours: float = 1, platform: Optional[str] = None,
+                       topic: Optional[str] = None) -> Dict[str, Any]:
+        """Volume, sentiment, controversy and distinct counts over the last `hours`, from the pipeline's rollups"""
+        now = datetime.now()
+        with self._stream_lock:
+            self._advance_stream(now)
+            cell = self.pipeline.rollup(hours, platform, now)
+        return cell.summary([self.topics.index(topic)] if topic is not None else None)
+    
+    def platform_metrics(self, hours: float = 24) -> Dict[str, Dict[str, Any]]:
+        """rollup_metrics for each platform separately"""
+        now = datetime.now()
+        with self._stream_lock:
+            self._advance_stream(now)
+            cells = {platform: self.pipeline.rollup(hours, platform, now) for platform in self.platforms}
+        return {platform: cell.summary() for platform, cell in cells.items()}
+    
+    def generate_trending_topics(self, count: int = 20, platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Trending topics detected from the hashtag stream (one platform's partition, or all), with engagement metrics
+        
+        The simulated long-tail filler hashtags are left out. Geographic spread
+        comes from the platform's geo bins; hashtags outside the tracked topics
+        have no sentiment samples of their own and take their platform's
+        current controversy.
+        """
+        now = datetime.now()
+        with self._stream_lock:
+            self._advance_stream(now)
+            detected = self.pipeline.top_trends(count, platform, now,
+                                                exclude=lambda key: key.startswith(TAIL_TAG_PREFIX))
+            platforms = {d['platform'] for d in detected}
+            spread = {p: self.pipeline.geo_spread(SPREAD_BIN_ZOOM, p) for p in platforms}
+            untracked = {d['platform'] for d in detected if (d['topic'], d['platform']) not in self._stream_index}
+            platform_controversy = {p: self.pipeline.rollup(1, p, now).summary()['controversy'] for p in untracked}
+        trends = []
+        
+        # Score a sample of posts per trend in one batch; controversial trends
+        # draw more negative and more positive posts
+        controversies = np.array([
+            int(self._stream_controversy[self._stream_index[(d['topic'], d['platform'])]])
+            if (d['topic'], d['platform']) in self._stream_index
+            else int(platform_controversy[d['platform']])
+            for d in detected
+        ], dtype=int)
+        template_idx = self._polarized_templates(np.random.default_rng(), controversies, POSTS_PER_TREND)
+        sentiments = self.template_scores()[template_idx].mean(axis=1)
+        toxicity = self.template_toxicity()[template_idx].mean(axis=1)
+        
+        for i, hit in enumerate(detected):
+            topic, platform = hit['topic'], hit['platform']
+            controversy = int(controversies[i])
+            sentiment = float(sentiments[i])
+            toxicity_level = float(toxicity[i])
             
             trend = {
                 'topic': topic,
                 'platform': platform,
-                'views': base_views,
-                'engagement_rate': random.uniform(2.5, 15.0),
+                'views': hit['views'],
+                'engagement_rate': hit['engagement_rate'],
                 'controversy': controversy,
                 'sentiment_score': sentiment,
-                'growth_rate': random.uniform(-20, 300),
-                'peak_time': datetime.now() - timedelta(hours=random.randint(1, 48)),
-                'geographic_spread': random.randint(15, 85),
-                'toxicity_level': random.uniform(0, controversy/100)
+                'growth_rate': hit['growth_rate'],
+                'peak_time': hit['peak_time'],
+                'geographic_spread': int(round(spread[platform][self.topics.index(topic)])) if topic in self.topics else 0,
+                'toxicity_level': toxicity_level
             }
             
             trends.append(trend)
             
-        # Sort by engagement
-        trends.sort(key=lambda x: x['views'], reverse=True)
+        # Already ranked by views
         return trends
     
-    def generate_geographic_data(self) -> List[Dict[str, Any]]:
-        """Generate geographic trend data for heatmap"""
-        locations = [
-            {"city": "New York", "lat": 40.7128, "lng": -74.0060, "intensity": random.randint(50, 100)},
-            {"city": "London", "lat": 51.5074, "lng": -0.1278, "intensity": random.randint(40, 90)},
-            {"city": "Tokyo", "lat": 35.6762, "lng": 139.6503, "intensity": random.randint(60, 95)},
-            {"city": "San Francisco", "lat": 37.7749, "lng": -122.4194, "intensity": random.randint(70, 100)},
-            {"city": "Berlin", "lat": 52.5200, "lng": 13.4050, "intensity": random.randint(30, 80)},
-            {"city": "Sydney", "lat": -33.8688, "lng": 151.2093, "intensity": random.randint(45, 85)},
-            {"city": "Toronto", "lat": 43.6532, "lng": -79.3832, "intensity": random.randint(35, 75)},
-            {"city": "Mumbai", "lat": 19.0760, "lng": 72.8777, "intensity": random.randint(55, 90)},
-            {"city": "São Paulo", "lat": -23.5505, "lng": -46.6333, "intensity": random.randint(40, 80)},
-            {"city": "Dubai", "lat": 25.2048, "lng": 55.2708, "intensity": random.randint(25, 70)}
-        ]
+    def generate_geographic_data(self, map_zoom: int = 2, limit: int = 60,
+                                 platform: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Busiest spatial bins for a map at `map_zoom`, with their top topics"""
+        now = datetime.now()
+        with self._stream_lock:
+            self._advance_stream(now)
+            bin_zoom = map_zoom_to_bin_zoom(map_zoom)
+            bins = self.pipeline.geo_bins(bin_zoom, platform, limit=limit)
+        label_radius = max(METRO_LABEL_DEGREES, 180.0 / (1 << bin_zoom))
         
-        return locations
+        # Label bins by their nearest metro
+        if bins:
+            centroids = np.array([(b['lat'], b['lng']) for b in bins])
+            distances = np.linalg.norm(centroids[:, None, :] - self._metro_coords[None, :, :], axis=2)
+            nearest = distances.argmin(axis=1)
+            for b, metro, distance in zip(bins, nearest, distances[np.arange(len(bins)), nearest]):
+                b['city'] = self.metros[metro][0] if distance <= label_radius else f"{b['lat']:.1f}, {b['lng']:.1f}"
+        
+        return bins
     
     def generate_sentiment_timeline(self, hours: int = 24) -> pd.DataFrame:
         """Generate sentiment data over time"""
         timestamps = pd.date_range(
             start=datetime.now() - timedelta(hours=hours),
             end=datetime.now(),
-            freq='H'
+            freq='h'
         )
+        n = len(timestamps)
+        rng = np.random.default_rng()
         
-        # Generate realistic sentiment trends
-        base_sentiment = 0.1
-        sentiment_data = []
+        # Score a sample of posts for every hour at once; the mood mix drifts
+        # with a gradual trend, so the chart follows the scored posts
+        drift = 0.1 * np.sin(np.arange(n) * 0.2)[:, None] + rng.uniform(-0.1, 0.1, (n, 1))
+        template_idx = self._sample_templates(rng, (n, POSTS_PER_HOUR), 0.35 + drift, 0.25 - drift)
+        scores = self.template_scores()[template_idx]
         
-        for i, timestamp in enumerate(timestamps):
-            # Add some realistic fluctuation
-            noise = random.uniform(-0.3, 0.3)
-            trend = 0.02 * np.sin(i * 0.2)  # Gradual trend
-            sentiment = base_sentiment + trend + noise
-            
-            sentiment_data.append({
-                'timestamp': timestamp,
-                'sentiment': max(-1, min(1, sentiment)),
-                'volume': random.randint(1000, 10000),
-                'positive_ratio': max(0, min(1, 0.5 + sentiment/2)),
-                'negative_ratio': max(0, min(1, 0.5 - sentiment/2)),
-                'neutral_ratio': random.uniform(0.2, 0.4)
-            })
-        
-        return pd.DataFrame(sentiment_data)
-    
-    def generate_meme_evolution(self, trend_topic: str) -> List[Dict[str, Any]]:
-        """Generate meme evolution timeline for a topic"""
-        if random.random() < 0.3:  # Only some trends become memes
-            return []
-            
-        timeline = []
-        start_date = datetime.now() - timedelta(days=random.randint(7, 30))
+        positive_ratio = (scores > NEUTRAL_BAND).mean(axis=1)
+        negative_ratio = (scores < -NEUTRAL_BAND).mean(axis=1)
         
-        for i in range(7):
-            date = start_date + timedelta(days=i)
-            popularity = random.randint(10, 100) * (1 + np.sin(i * 0.5))
-            
-            timeline.append({
-                'date': date,
-                'popularity': max(0, int(popularity)),
-                'variant_count': random.randint(5, 50),
-                'platform_dominance': random.choice(["TikTok", "Twitter", "Reddit"])
-            })
-        
-        return timeline
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'sentiment': np.clip(scores.mean(axis=1), -1, 1),
+            'volume': rng.integers(1000, 10001, n),
+            'positive_ratio': positive_ratio,
+            'negative_ratio': negative_ratio,
+            'neutral_ratio': 1 - positive_ratio - negative_ratio
+        })
+    
+    def _meme_wave(self, topic: str, ordinal: int):
+        """Deterministic meme wave (template, peak day, height, width) for the period containing `ordinal`"""
+        period = ordinal // MEME_WAVE_DAYS
+        rng = np.random.default_rng([zlib.crc32(topic.encode('utf-8')), period])
+        template = int(rng.integers(len(self.meme_templates)))
+        peak = period * MEME_WAVE_DAYS + int(rng.integers(MEME_WAVE_DAYS))
+        # Only some waves take off
+        height = MEME_PEAK_POSTS * rng.lognormal(0, 0.8) * (rng.random() < 0.7)
+        return template, peak, height, rng.uniform(1.5, 4.0)
+    
+    def generate_meme_posts(self, topics: Sequence[str], start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """Generate meme posts (original format plus mutated variants) posted between `start` and `end`"""
+        rng = np.random.default_rng()
+        posts = []
+        
+        for topic in topics:
+            day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+            while day < end:
+                window_start, window_end = max(day, start), min(day + timedelta(days=1), end)
+                ordinal = day.toordinal()
+                template, peak, height, width = self._meme_wave(topic, ordinal)
+                rate = height * np.exp(-((ordinal - peak) / width) ** 2)
+                count = rng.poisson(rate * (window_end - window_start).total_seconds() / 86400)
+                
+                # Spreads from TikTok, peaks on Twitter, lingers on Reddit
+                stage = np.clip((ordinal - peak) / width, -1, 1)
+                platform_weights = np.array([1.0, 1.0 + 2 * (1 - abs(stage)), 1.0 + 3 * max(stage, 0), 1.0 + 3 * max(-stage, 0)])
+                platforms = rng.choice(["Instagram", "Twitter", "Reddit", "TikTok"], count, p=platform_weights / platform_weights.sum())
+                
+                base = self.meme_templates[template].format(topic=topic)
+                edits = rng.random((count, 2))
+                prefixes = rng.integers(len(self.meme_prefixes), size=count)
+                suffixes = rng.integers(len(self.meme_suffixes), size=count)
+                offsets = rng.uniform(0, (window_end - window_start).total_seconds(), count)
+                
+                for i in range(count):
+                    text = base
+                    if edits[i, 0] < 0.3:
+                        text = f"{self.meme_prefixes[prefixes[i]]} {text}"
+                    if edits[i, 1] < 0.5:
+                        text = f"{text} {self.meme_suffixes[suffixes[i]]}"
+                    posts.append({
+                        'post_id': len(posts),
+                        'topic': topic,
+                        'platform': str(platforms[i]),
+                        'author': f"user{rng.zipf(1.5) % 50_000}",
+                        'text': text,
+                        'timestamp': window_start + timedelta(seconds=float(offsets[i]))
+                    })
+                day += timedelta(days=1)
+        
+        return posts
+    
+    def generate_meme_evolution(self, trend_topic: str, days: int = 7) -> List[Dict[str, Any]]:
+        """Meme evolution timeline for a topic, from variant families clustered over its meme posts"""
+        now = datetime.now()
+        tracker = MemeTracker()
+        tracker.add_posts(self.generate_meme_posts([trend_topic], now - timedelta(days=days), now))
+        
+        families = tracker.top_families(n=1)
+        if not families or families[0].size < MEME_MIN_POSTS:
+            return []
+        return tracker.timeline(families[0], days=days)
+    
+    def tag_topics(self, text: str) -> List[str]:
+        """Topics mentioned in a post, found in a single scan of the text"""
+        return sorted(self.topic_matcher.matched_owners(text))
     
     def get_sample_posts(self, topic: str, count: int = 10) -> List[str]:
         """Get sample posts for a given topic"""
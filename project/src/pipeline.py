@@ -0,0 +1,209 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.geo import GeoIndex, rollup, topic_spread
+from src.ingest import Normalizer, PostBatch, sources_from_env
+from src.reach import HyperLogLog, ReachTracker, BUCKET_SECONDS, hash_strings
+from src.rollup import RollupCell, RollupCube
+from src.trend_detector import TrendDetector
+
+# Each partition sees roughly a quarter of the keys, so its sketches can be narrower
+PARTITION_SKETCH_WIDTH = 1024
+
+# Rollup key for posts outside the tracked topics
+OTHER_KEY = '#other'
+
+class Partition:
+    """All streaming state for one platform: trend sketches, reach sketches, geo bins and rollups"""
+    
+    def __init__(self, platform: str, topics: Sequence[str], window_seconds: int, windows: int):
+        self.platform = platform
+        self.topics = list(topics)
+        self.detector = TrendDetector(window_seconds, windows, width=PARTITION_SKETCH_WIDTH)
+        self.reach = ReachTracker()
+        self.geo = GeoIndex(topics, window_seconds, windows)
+        self.rollup = RollupCube(self.topics + [OTHER_KEY])
+        self.posts_ingested = 0
+    
+    def ingest(self, batch: PostBatch) -> None:
+        """Fold a normalized batch into this partition's sketches"""
+        if not len(batch):
+            return
+        window_seconds = self.detector.window_seconds
+        windows = batch.timestamps // window_seconds * window_seconds
+        tag_hashes = hash_strings(batch.tags)
+        rollup_keys = np.where(batch.topic_idx >= 0, batch.topic_idx, len(self.topics))
+        
+        for start in np.unique(windows):
+            in_window = windows == start
+            timestamp = datetime.fromtimestamp(start)
+            
+            # Trend sketches: per-tag totals for the window
+            tagged = in_window & (batch.tag_idx >= 0)
+            tag_idx = batch.tag_idx[tagged]
+            n = len(batch.tags)
+            posts = np.bincount(tag_idx, minlength=n)
+            present = np.flatnonzero(posts)
+            if len(present):
+                values = np.column_stack([
+                    posts,
+                    np.bincount(tag_idx, weights=batch.views[tagged], minlength=n),
+                    np.bincount(tag_idx, weights=batch.engagements[tagged], minlength=n)
+                ])[present]
+                self.detector.add([batch.tags[i] for i in present], values, timestamp)
+            
+            # Geo bins: geotagged posts on tracked topics
+            located = in_window & (batch.topic_idx >= 0) & np.isfinite(batch.lat)
+            if located.any():
+                self.geo.add(batch.lat[located], batch.lng[located], batch.topic_idx[located],
+                             batch.engagements[located], timestamp)
+            
+            # Rollups: every post, untracked ones under OTHER_KEY
+            self.rollup.add_posts(start, rollup_keys[in_window], batch.views[in_window], batch.engagements[in_window],
+                                  batch.authors[in_window], tag_hashes[np.unique(tag_idx)])
+        
+        # Reach sketches: authors per tracked topic and hour
+        tracked = batch.topic_idx >= 0
+        hours = (batch.timestamps[tracked] // BUCKET_SECONDS).astype(np.int64)
+        groups = hours * len(self.topics) + batch.topic_idx[tracked]
+        authors = batch.authors[tracked]
+        order = np.argsort(groups, kind='stable')
+        groups, authors = groups[order], authors[order]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(groups)) + 1]) if len(groups) else []
+        for begin, end in zip(starts, list(starts[1:]) + [len(groups)]):
+            hour, topic = divmod(int(groups[begin]), len(self.topics))
+            self.reach.observe(self.topics[topic], self.platform, authors[begin:end],
+                               datetime.fromtimestamp(hour * BUCKET_SECONDS))
+        
+        self.posts_ingested += len(batch)
+
+class PartitionedPipeline:
+    """Platform-partitioned streaming pipeline
+    
+    Every source (simulated firehose, file or socket feed) is normalized into
+    PostBatches and routed to its platform's partition. A platform filter is
+    therefore a partition selection: queries only touch the selected
+    partitions' sketches and merge them, never filtering rows.
+    """
+    
+    def __init__(self, platforms: Sequence[str], topics: Sequence[str], window_seconds: int = 300,
+                 windows: int = 12, sources: Optional[List] = None):
+        self.topics = list(topics)
+        self.window_seconds = window_seconds
+        self.max_windows = windows
+        self.normalizer = Normalizer(topics)
+        self.partitions = {platform: Partition(platform, topics, window_seconds, windows) for platform in platforms}
+        self.sources = sources_from_env() if sources is None else list(sources)
+        # Input is complete up to this time (epoch seconds), as of the last advance()
+        self.watermark: Optional[float] = None
+        # Optional StateStore: when set, every input is logged there before it is applied
+        self.state = None
+    
+    def window_start(self, ts: float) -> float:
+        return ts // self.window_seconds * self.window_seconds
+    
+    def select(self, platform: Optional[str] = None) -> List[Partition]:
+        """Partitions backing a platform filter (None or 'All' selects every platform)"""
+        if platform in (None, 'All'):
+            return list(self.partitions.values())
+        if platform not in self.partitions:
+            raise ValueError(f"Unknown platform: {platform}")
+        return [self.partitions[platform]]
+    
+    def ingest(self, batch: PostBatch) -> None:
+        if self.state is not None:
+            self.state.log_batch(batch)
+        self.partitions[batch.platform].ingest(batch)
+        self._snapshot_if_due()
+    
+    def _snapshot_if_due(self) -> None:
+        """Snapshot once the state store's log has grown enough; checked after each input is applied"""
+        if self.state is not None and self.state.snapshot_due():
+            self.state.snapshot(self)
+    
+    def poll(self) -> int:
+        """Drain one batch from every configured feed; returns posts ingested"""
+        ingested = 0
+        for adapter, source in self.sources:
+            lines = source.read_batch()
+            if lines:
+                batch = adapter.decode(lines, self.normalizer)
+                self.ingest(batch)
+                ingested += len(batch)
+        return ingested
+    
+    def top_trends(self, n: int = 20, platform: Optional[str] = None, now: Optional[datetime] = None,
+                   exclude: Optional[Callable[[str], bool]] = None) -> List[Dict[str, Any]]:
+        """Top keys across the selected partitions, ranked by views, skipping keys `exclude` matches
+        
+        Keys never span partitions, so the global top-n is the top-n of the
+        partitions' own top-n lists (of every candidate, when some are excluded).
+        """
+        merged = []
+        for partition in self.select(platform):
+            for hit in partition.detector.top_trends(n if exclude is None else None, now):
+                if exclude is not None and exclude(hit['key']):
+                    continue
+                hit['topic'] = hit.pop('key')
+                hit['platform'] = partition.platform
+                merged.append(hit)
+        merged.sort(key=lambda hit: hit['views'], reverse=True)
+        return merged[:n]
+    
+    def unique_participants(self, topic: Optional[str] = None, platform: Optional[str] = None,
+                            hours: int = 24, now: Optional[datetime] = None) -> int:
+        sketches = [
+            sketch for partition in self.select(platform)
+            for sketch in partition.reach.select(topic, None, hours, now)
+        ]
+        return HyperLogLog.union(sketches).count() if sketches else 0
+    
+    def geo_bins(self, zoom: int, platform: Optional[str] = None, top_n: int = 3,
+                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return rollup([partition.geo for partition in self.select(platform)], zoom, top_n, limit)
+    
+    def geo_spread(self, zoom: int, platform: Optional[str] = None) -> np.ndarray:
+        """Per tracked topic, how widely its geotagged posts spread over the tiles active at `zoom` (0-100)"""
+        return topic_spread([partition.geo for partition in self.select(platform)], zoom)
+    
+    def observe_sentiment(self, platform: str, timestamp: float, topic_idx: np.ndarray, scores: np.ndarray,
+                          controversy: np.ndarray, posts: np.ndarray) -> None:
+        """Fold sentiment samples and controversy for a platform's topics into its rollups"""
+        if self.state is not None:
+            self.state.log_sentiment(platform, timestamp, topic_idx, scores, controversy, posts)
+        self.partitions[platform].rollup.observe_scores(timestamp, topic_idx, scores, controversy, posts)
+        self._snapshot_if_due()
+    
+    def rollup(self, hours: float = 1, platform: Optional[str] = None, now: Optional[datetime] = None) -> RollupCell:
+        """Merged rollup cell for the last `hours` across the selected partitions: O(buckets), no posts touched"""
+        now = now or datetime.now()
+        cells = [
+            cell for partition in self.select(platform)
+            for cell in partition.rollup.collect(now - timedelta(hours=hours), now)
+        ]
+        return RollupCell.union(cells) or RollupCell(len(self.topics) + 1)
+    
+    def prune(self, now: Optional[datetime] = None) -> None:
+        for partition in self.partitions.values():
+            partition.reach.prune(now)
+    
+    def advance(self, now: datetime) -> None:
+        """Mark input complete up to `now`: prune expired sketches, then log the watermark and snapshot if due"""
+        self.watermark = now.timestamp()
+        self.prune(now)
+        if self.state is not None:
+            self.state.log_watermark(self.watermark)
+        self._snapshot_if_due()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            platform: {
+                'posts': partition.posts_ingested,
+                'sketch_bytes': partition.detector.stats()['sketch_bytes'] + partition.reach.stats()['sketch_bytes'],
+                'geo_tiles': partition.geo.stats()['tiles'],
+                'rollup_bytes': partition.rollup.stats()['bytes']
+            }
+            for platform, partition in self.partitions.items()
+        }
@@ -0,0 +1,139 @@
+import cProfile
+import contextlib
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from src.alert_store import DEFAULT_DATA_DIR
+
+PROFILE_DIR = os.path.join(DEFAULT_DATA_DIR, 'profiles')
+
+# Reruns kept per profiler for the history chart
+DEFAULT_HISTORY = 20
+
+# tracemalloc is process-wide; it runs while any profiler is recording
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+def _acquire_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+def _release_tracemalloc() -> None:
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+class _Frame:
+    __slots__ = ('path', 'wall_start', 'cpu_start', 'mem_start', 'peak')
+    
+    def __init__(self, path: str, mem_start: int):
+        self.path = path
+        self.mem_start = mem_start
+        # Highest traced memory seen inside this section, including finished children
+        self.peak = mem_start
+        self.wall_start = time.perf_counter_ns()
+        self.cpu_start = time.thread_time_ns()
+
+class RerunProfiler:
+    """Per-section wall time, CPU time and allocations for one script rerun at a time
+    
+    Sections nest; each is recorded under its slash-separated path so a rerun
+    reads as a flame graph (parent time includes its children). CPU time is
+    the script thread's own, so time spent waiting shows up as wall minus CPU.
+    Allocation figures come from tracemalloc: net bytes still held when the
+    section ends and the peak above its starting point.
+    """
+    
+    def __init__(self, history: int = DEFAULT_HISTORY, trace_allocations: bool = True):
+        self.trace_allocations = trace_allocations
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.sections: List[Dict[str, Any]] = []
+        self._stack: List[_Frame] = []
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._started: Optional[datetime] = None
+        self._active = False
+    
+    def _memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.trace_allocations else 0
+    
+    def _release(self) -> None:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self.trace_allocations:
+            _release_tracemalloc()
+        self._active = False
+    
+    def start_rerun(self, cprofile: bool = False) -> None:
+        if self._active:
+            # The previous rerun never finished (st.rerun/st.stop or an exception): drop it
+            self._release()
+            self._cprofile = None
+        self._active = True
+        self.sections = []
+        self._stack = []
+        self._started = datetime.now()
+        if self.trace_allocations:
+            _acquire_tracemalloc()
+            tracemalloc.reset_peak()
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+    
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and self.trace_allocations:
+            # Fold the peak reached so far into the parent before resetting it for the child
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = _Frame(f"{parent.path}/{name}" if parent else name, self._memory())
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - frame.wall_start
+            cpu = time.thread_time_ns() - frame.cpu_start
+            self._stack.pop()
+            if self.trace_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                frame.peak = max(frame.peak, peak)
+                if parent is not None:
+                    parent.peak = max(parent.peak, frame.peak)
+            else:
+                current = 0
+            self.sections.append({
+                'path': frame.path,
+                'wall_ms': wall / 1e6,
+                'cpu_ms': cpu / 1e6,
+                'alloc_kb': (current - frame.mem_start) / 1024,
+                'peak_kb': (frame.peak - frame.mem_start) / 1024
+            })
+    
+    def finish_rerun(self) -> Dict[str, Any]:
+        """Close the rerun; returns its record (sections in completion order, optional cProfile dump path)"""
+        self._release()
+        profile_path = None
+        if self._cprofile is not None:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profile_path = os.path.join(PROFILE_DIR, f"rerun-{self._started:%Y%m%d-%H%M%S-%f}.prof")
+            self._cprofile.dump_stats(profile_path)
+            self._cprofile = None
+        
+        rerun = {
+            'started': self._started,
+            'sections': self.sections,
+            'total_ms': sum(s['wall_ms'] for s in self.sections if '/' not in s['path']),
+            'cprofile_path': profile_path
+        }
+        self.history.append(rerun)
+        return rerun
@@ -0,0 +1,87 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from src.metrics import CACHE_BYTES, CACHE_HITS, CACHE_MISSES
+from src.serialization import dumps, loads
+
+class ResultCache:
+    """Process-wide store for analysis results with LRU eviction
+    
+    Results are kept as compact serialized JSON under a handle derived from
+    the request that produced them, so sessions asking for the same analysis
+    share one copy and a repeat of the request replaces it rather than adding
+    another (analyses carry random scores and timestamps, so their content
+    almost never repeats). Sessions hold only the returned handle.
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.replaced = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    def put(self, payload: Any, request: Optional[Hashable] = None) -> str:
+        """Store a result and return its handle, keyed by `request` (e.g. ('rag', query)) or else by content"""
+        data = dumps(payload)
+        key = repr(request).encode('utf-8') if request is not None else data
+        handle = hashlib.blake2b(key, digest_size=12).hexdigest()
+        
+        with self._lock:
+            previous = self.entries.pop(handle, None)
+            if previous is not None:
+                self.total_bytes -= len(previous)
+                self.replaced += 1
+            
+            self.entries[handle] = data
+            self.total_bytes += len(data)
+            
+            # Evict least recently used results until we fit the budget
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+                self.evictions += 1
+            CACHE_BYTES.set(self.total_bytes)
+        
+        return handle
+    
+    def get(self, handle: Optional[str]) -> Optional[Any]:
+        """Resolve a handle; returns None if it was never stored or has been evicted"""
+        if handle is None:
+            return None
+        
+        with self._lock:
+            data = self.entries.get(handle)
+            if data is None:
+                self.misses += 1
+                CACHE_MISSES.inc()
+                return None
+            self.entries.move_to_end(handle)
+            self.hits += 1
+        
+        CACHE_HITS.inc()
+        return loads(data)
+    
+    def size_of(self, handle: str) -> int:
+        with self._lock:
+            data = self.entries.get(handle)
+        return len(data) if data is not None else 0
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'replaced': self.replaced,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,196 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.reach import HyperLogLog
+
+# (bucket seconds, buckets kept) per tier, finest first: 5-minute buckets for
+# two hours, hourly for two days, daily for 90 days. Buckets that age out of a
+# tier are merged into the next one; the last tier drops them.
+DEFAULT_TIERS: Tuple[Tuple[int, int], ...] = ((300, 24), (3600, 48), (86400, 90))
+
+# 2^10 registers (~3.3% error) per key and bucket keeps a full cube at a few MB
+ROLLUP_PRECISION = 10
+
+def _register_updates(hashes: np.ndarray, precision: int) -> Tuple[np.ndarray, np.ndarray]:
+    """HyperLogLog register index and rank for each 64-bit hash (as in HyperLogLog.add_hashes)"""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = hashes & np.uint64((1 << (64 - precision)) - 1)
+    return index, (64 - precision - np.frexp(rest.astype(np.float64))[1] + 1).astype(np.uint8)
+
+class RollupCell:
+    """Additive measures for every key over one time bucket
+    
+    Sums and counts add, sentiment is kept as moments (n, sum, sum of
+    squares), controversy as a post-weighted sum, and distinct authors and
+    hashtags as HyperLogLog registers, so any two cells merge exactly.
+    """
+    
+    __slots__ = ('posts', 'views', 'engagements', 'sentiment_n', 'sentiment_sum', 'sentiment_sumsq',
+                 'controversy_sum', 'controversy_weight', 'authors', 'tags')
+    
+    def __init__(self, keys: int, precision: int = ROLLUP_PRECISION):
+        self.posts = np.zeros(keys, dtype=np.int64)
+        self.views = np.zeros(keys, dtype=np.int64)
+        self.engagements = np.zeros(keys, dtype=np.int64)
+        self.sentiment_n = np.zeros(keys, dtype=np.int64)
+        self.sentiment_sum = np.zeros(keys)
+        self.sentiment_sumsq = np.zeros(keys)
+        self.controversy_sum = np.zeros(keys)
+        self.controversy_weight = np.zeros(keys)
+        # Distinct authors per key; distinct hashtags across the bucket
+        self.authors = np.zeros((keys, 1 << precision), dtype=np.uint8)
+        self.tags = np.zeros(1 << precision, dtype=np.uint8)
+    
+    def merge(self, other: 'RollupCell') -> None:
+        for name in self.__slots__:
+            if name in ('authors', 'tags'):
+                np.maximum(getattr(self, name), getattr(other, name), out=getattr(self, name))
+            else:
+                getattr(self, name).__iadd__(getattr(other, name))
+    
+    @classmethod
+    def union(cls, cells: Sequence['RollupCell']) -> Optional['RollupCell']:
+        if not cells:
+            return None
+        keys, registers = cells[0].authors.shape
+        merged = cls(keys, registers.bit_length() - 1)
+        for cell in cells:
+            merged.merge(cell)
+        return merged
+    
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+    
+    def summary(self, keys: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+        """Totals over `keys` (all by default): volumes, sentiment mean/std, controversy and distinct counts"""
+        rows = slice(None) if keys is None else np.asarray(keys)
+        posts = int(self.posts[rows].sum())
+        views = int(self.views[rows].sum())
+        engagements = int(self.engagements[rows].sum())
+        n = int(self.sentiment_n[rows].sum())
+        mean = self.sentiment_sum[rows].sum() / n if n else 0.0
+        variance = max(self.sentiment_sumsq[rows].sum() / n - mean ** 2, 0.0) if n else 0.0
+        weight = self.controversy_weight[rows].sum()
+        precision = self.tags.size.bit_length() - 1
+        authors, tags = HyperLogLog(precision), HyperLogLog(precision)
+        np.maximum.reduce(self.authors[rows].reshape(-1, self.tags.size), out=authors.registers)
+        np.copyto(tags.registers, self.tags)
+        return {
+            'posts': posts,
+            'views': views,
+            'engagements': engagements,
+            'engagement_rate': engagements / views if views else 0.0,
+            'sentiment_mean': float(mean),
+            'sentiment_std': float(np.sqrt(variance)),
+            'controversy': float(self.controversy_sum[rows].sum() / weight) if weight else 0.0,
+            'unique_authors': authors.count(),
+            'distinct_tags': tags.count()
+        }
+
+class RollupCube:
+    """Incrementally maintained aggregates by (key, time bucket) in coarsening tiers
+    
+    Ingest folds each post into the finest tier's bucket; dashboard queries
+    merge the handful of buckets covering their range instead of touching
+    posts. As buckets age past their tier's retention they are compacted
+    into the enclosing bucket of the next tier, so memory stays bounded
+    while long ranges remain answerable at coarser grain. Ranges are rounded
+    out to whole buckets.
+    """
+    
+    def __init__(self, keys: Sequence[str], tiers: Sequence[Tuple[int, int]] = DEFAULT_TIERS,
+                 precision: int = ROLLUP_PRECISION):
+        self.keys = list(keys)
+        self.key_index = {key: i for i, key in enumerate(self.keys)}
+        self.tiers = list(tiers)
+        self.precision = precision
+        # One {bucket start: cell} map per tier
+        self.buckets: List[Dict[int, RollupCell]] = [{} for _ in self.tiers]
+        self.latest = 0
+        self.compactions = 0
+    
+    def _cell(self, timestamp: float) -> RollupCell:
+        """Cell of the finest tier still holding `timestamp`, created on demand"""
+        if timestamp > self.latest:
+            newest_bucket = int(timestamp) // self.tiers[0][0] > self.latest // self.tiers[0][0]
+            self.latest = int(timestamp)
+            if newest_bucket:
+                self.compact()
+        for (seconds, kept), buckets in zip(self.tiers, self.buckets):
+            start = int(timestamp) // seconds * seconds
+            if start > self.latest - kept * seconds:
+                cell = buckets.get(start)
+                if cell is None:
+                    cell = buckets[start] = RollupCell(len(self.keys), self.precision)
+                return cell
+        return RollupCell(len(self.keys), self.precision)  # older than every tier: counted nowhere
+    
+    def add_posts(self, timestamp: float, key_idx: np.ndarray, views: np.ndarray, engagements: np.ndarray,
+                  author_hashes: np.ndarray, tag_hashes: np.ndarray) -> None:
+        """Fold posts from one bucket: per-post key index, counts and 64-bit author/hashtag hashes"""
+        if not len(key_idx):
+            return
+        cell = self._cell(timestamp)
+        keys = len(self.keys)
+        cell.posts += np.bincount(key_idx, minlength=keys)
+        cell.views += np.bincount(key_idx, weights=views, minlength=keys).astype(np.int64)
+        cell.engagements += np.bincount(key_idx, weights=engagements, minlength=keys).astype(np.int64)
+        
+        # Every key's author sketch in one scatter: registers offset by key
+        index, rank = _register_updates(author_hashes, self.precision)
+        np.maximum.at(cell.authors.reshape(-1), index + key_idx.astype(np.int64) * (1 << self.precision), rank)
+        index, rank = _register_updates(tag_hashes, self.precision)
+        np.maximum.at(cell.tags, index, rank)
+    
+    def observe_scores(self, timestamp: float, key_idx: np.ndarray, scores: np.ndarray,
+                       controversy: np.ndarray, weights: np.ndarray) -> None:
+        """Fold sentiment samples (one row of scores per key) and post-weighted controversy into a bucket"""
+        if not len(key_idx):
+            return
+        cell = self._cell(timestamp)
+        np.add.at(cell.sentiment_n, key_idx, scores.shape[1])
+        np.add.at(cell.sentiment_sum, key_idx, scores.sum(axis=1))
+        np.add.at(cell.sentiment_sumsq, key_idx, (scores ** 2).sum(axis=1))
+        np.add.at(cell.controversy_sum, key_idx, controversy * weights)
+        np.add.at(cell.controversy_weight, key_idx, weights)
+    
+    def compact(self) -> int:
+        """Merge buckets past their tier's retention into the next tier (or drop them); returns buckets moved"""
+        moved = 0
+        for tier, ((seconds, kept), buckets) in enumerate(zip(self.tiers, self.buckets)):
+            cutoff = self.latest - kept * seconds
+            expired = [start for start in buckets if start <= cutoff]
+            for start in expired:
+                cell = buckets.pop(start)
+                if tier + 1 < len(self.tiers):
+                    coarse_seconds = self.tiers[tier + 1][0]
+                    coarse = self.buckets[tier + 1]
+                    target = coarse.get(start // coarse_seconds * coarse_seconds)
+                    if target is None:
+                        coarse[start // coarse_seconds * coarse_seconds] = cell
+                    else:
+                        target.merge(cell)
+                moved += 1
+        self.compactions += moved
+        return moved
+    
+    def collect(self, since: datetime, until: Optional[datetime] = None) -> List[RollupCell]:
+        """Cells of every tier overlapping [since, until)"""
+        since_ts = since.timestamp()
+        until_ts = until.timestamp() if until else float('inf')
+        return [
+            cell
+            for (seconds, _), buckets in zip(self.tiers, self.buckets)
+            for start, cell in buckets.items() if start + seconds > since_ts and start < until_ts
+        ]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'buckets': [len(buckets) for buckets in self.buckets],
+            'bytes': sum(cell.nbytes for buckets in self.buckets for cell in buckets.values()),
+            'compactions': self.compactions
+        }
@@ -0,0 +1,114 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.keyword_matcher import tokenize
+
+try:
+    from scipy import sparse
+except ImportError:  # scipy is optional; fall back to a bincount-based CSR matvec
+    sparse = None
+
+# Token weights on a -4..4 scale (VADER-style). Kept small and domain-focused:
+# social-media reactions to tech, policy and culture topics.
+LEXICON: Dict[str, float] = {
+    # positive
+    'love': 3.2, 'loving': 3.0, 'great': 3.1, 'amazing': 3.3, 'awesome': 3.2, 'excellent': 3.2,
+    'good': 1.9, 'better': 1.9, 'best': 3.2, 'win': 2.8, 'wins': 2.7, 'progress': 2.1,
+    'hope': 1.9, 'hopeful': 2.3, 'exciting': 2.6, 'excited': 2.4, 'finally': 1.2, 'cheaper': 1.3,
+    'benefits': 2.0, 'benefit': 2.0, 'support': 1.7, 'proud': 2.4, 'brilliant': 3.0,
+    'revolutionize': 2.3, 'innovation': 1.6, 'sense': 0.8, 'essential': 1.4, 'responsible': 1.3,
+    'safe': 1.9, 'fair': 1.6, 'thrilled': 3.0, 'inspiring': 2.8, 'incredible': 3.0, 'agree': 1.6,
+    # negative
+    'hate': -3.2, 'terrible': -3.1, 'awful': -3.1, 'horrible': -3.3, 'bad': -2.5, 'worse': -2.6,
+    'worst': -3.1, 'disaster': -3.1, 'fail': -2.5, 'failure': -2.6, 'scary': -2.3, 'fear': -2.2,
+    'risk': -1.5, 'risks': -1.5, 'dangerous': -2.6, 'bias': -1.8, 'problem': -1.7, 'crisis': -2.6,
+    'anxiety': -2.2, 'angry': -2.6, 'sick': -2.1, 'scam': -3.0, 'broken': -2.2, 'ignored': -1.8,
+    'backfire': -2.2, 'stifle': -1.8, 'discrimination': -2.6, 'insufficient': -1.8, 'lies': -2.6,
+    'corrupt': -3.0, 'toxic': -2.8, 'ridiculous': -2.2, 'disappointed': -2.3, 'hype': -0.9,
+    'overhyped': -1.9, 'concerns': -1.3, 'concern': -1.3, 'worried': -1.9, 'rushing': -1.2,
+    'idiot': -3.0, 'stupid': -2.8, 'pathetic': -2.9, 'clowns': -1.8, 'trash': -2.6,
+}
+
+NEGATORS = frozenset({'not', 'no', 'never', 'nobody', 'nothing', 'isn', 'aren', 'don', 'doesn', 'didn', 'won', 'cannot'})
+NEGATION_SCOPE = 3
+NEGATION_FACTOR = -0.74
+
+# Normalization constant: score = raw / sqrt(raw^2 + alpha), mapping sums onto (-1, 1)
+ALPHA = 15.0
+
+# Scores within this band count as neutral in breakdowns
+NEUTRAL_BAND = 0.05
+
+class SentimentScorer:
+    """Lexicon-based sentiment scoring over batches of posts
+    
+    A batch is turned into a sparse post x vocabulary matrix (CSR) whose
+    entries are per-occurrence multipliers (1, or NEGATION_FACTOR inside a
+    negation scope); scoring the whole batch is then one sparse
+    matrix-vector product with the lexicon weight vector.
+    """
+    
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        lexicon = lexicon or LEXICON
+        self.vocabulary: Dict[str, int] = {word: i for i, word in enumerate(lexicon)}
+        self.weights = np.array([lexicon[word] for word in self.vocabulary], dtype=np.float64)
+    
+    def featurize(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Build CSR arrays (indptr, indices, data) for a batch of texts"""
+        vocabulary = self.vocabulary
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        indices: List[int] = []
+        data: List[float] = []
+        
+        for row, text in enumerate(texts):
+            negated_until = -1
+            for position, token in enumerate(tokenize(text)):
+                if token in NEGATORS:
+                    negated_until = position + NEGATION_SCOPE
+                    continue
+                column = vocabulary.get(token)
+                if column is not None:
+                    indices.append(column)
+                    data.append(NEGATION_FACTOR if position <= negated_until else 1.0)
+            indptr[row + 1] = len(indices)
+        
+        return indptr, np.asarray(indices, dtype=np.int64), np.asarray(data, dtype=np.float64)
+    
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Sentiment in (-1, 1) for every text in the batch"""
+        if len(texts) == 0:
+            return np.zeros(0)
+        
+        # Reposts and templated posts repeat verbatim; featurize each distinct text once
+        distinct: Dict[str, int] = {}
+        inverse = np.fromiter((distinct.setdefault(text, len(distinct)) for text in texts),
+                              dtype=np.int64, count=len(texts))
+        unique_texts = list(distinct)
+        
+        indptr, indices, data = self.featurize(unique_texts)
+        if sparse is not None:
+            matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(unique_texts), len(self.weights)))
+            raw = matrix @ self.weights
+        else:
+            rows = np.repeat(np.arange(len(unique_texts)), np.diff(indptr))
+            raw = np.bincount(rows, weights=data * self.weights[indices], minlength=len(unique_texts))
+        
+        return (raw / np.sqrt(raw * raw + ALPHA))[inverse]
+    
+    @staticmethod
+    def breakdown(scores: np.ndarray, neutral_band: float = NEUTRAL_BAND) -> List[float]:
+        """[positive, neutral, negative] percentages, as shown in the RAG sentiment chart"""
+        if len(scores) == 0:
+            return [0.0, 100.0, 0.0]
+        positive = float(np.mean(scores > neutral_band))
+        negative = float(np.mean(scores < -neutral_band))
+        neutral = 1.0 - positive - negative
+        return [round(positive * 100, 1), round(neutral * 100, 1), round(negative * 100, 1)]
+    
+    @staticmethod
+    def group_mean(scores: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+        """Mean score per group id (e.g. per trend or per hour); 0 for empty groups"""
+        totals = np.bincount(groups, weights=scores, minlength=n_groups)
+        counts = np.bincount(groups, minlength=n_groups)
+        return np.divide(totals, counts, out=np.zeros(n_groups), where=counts > 0)
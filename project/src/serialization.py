@@ -0,0 +1,40 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types our engines return"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict(orient='records')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Serialize analysis payloads to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(data: Any) -> Any:
+    """Parse JSON bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,41 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+class StageTimeout(asyncio.TimeoutError):
+    """An analysis stage ran past its time budget"""
+    
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
+
+async def run_stage(stage: str, fn: Callable, *args, executor: Optional[Executor] = None,
+                    timeout: Optional[float] = None) -> Any:
+    """Run a blocking stage function on `executor` within `timeout` seconds
+    
+    On timeout or cancellation the awaiting side gives up immediately; the
+    worker thread cannot be interrupted, so it finishes in the background and
+    its result is dropped.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(executor, functools.partial(fn, *args)), timeout)
+    except asyncio.TimeoutError:
+        raise StageTimeout(stage, timeout) from None
+
+async def cancel_stages(tasks: Sequence[asyncio.Future]) -> None:
+    """Cancel unfinished stages and wait for them to settle, discarding their outcomes"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def gather_stages(*stages: Awaitable) -> List[Any]:
+    """asyncio.gather, except that one stage failing cancels the others instead of leaving them running"""
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        await cancel_stages(tasks)
+        raise
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict, defaultdict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.keyword_matcher import tokenize
+
+DEFAULT_WEIGHTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'toxicity_weights.json')
+
+# A post counts as toxic at or above this probability
+TOXIC_PROBABILITY = 0.5
+
+def _bucket(feature: str, buckets: int) -> int:
+    # crc32 is stable across processes (unlike hash()), so weights files stay valid
+    return zlib.crc32(feature.encode('utf-8')) % buckets
+
+class ToxicityClassifier:
+    """CPU-only linear toxicity model over hashed word n-grams
+    
+    Weights are loaded from a local JSON file of n-gram -> weight and hashed
+    into a dense vector once. Batches are featurized into CSR arrays and
+    scored with a single sparse matvec; scores are cached by content hash so
+    reposts and re-ingested posts are never scored twice.
+    """
+    
+    def __init__(self, weights_path: Optional[str] = None, cache_size: int = 200_000):
+        with open(weights_path or DEFAULT_WEIGHTS_PATH, encoding='utf-8') as f:
+            model = json.load(f)
+        
+        self.buckets = int(model['hash_buckets'])
+        self.min_n, self.max_n = model.get('ngram_range', [1, 2])
+        self.bias = float(model['bias'])
+        self.weights = np.zeros(self.buckets, dtype=np.float32)
+        for ngram, weight in model['weights'].items():
+            self.weights[_bucket(' '.join(tokenize(ngram)), self.buckets)] += weight
+        
+        self.cache_size = cache_size
+        # One classifier serves the generator and the RAG engine's stage threads; the
+        # lock covers cache lookups and inserts, never the scoring in between
+        self._cache_lock = threading.Lock()
+        self.cache: 'OrderedDict[bytes, float]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def _features(self, text: str) -> List[int]:
+        tokens = tokenize(text)
+        features = set()
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                features.add(_bucket(' '.join(tokens[i:i + n]), self.buckets))
+        return list(features)
+    
+    def _score_uncached(self, texts: Sequence[str]) -> np.ndarray:
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        indices: List[int] = []
+        for row, text in enumerate(texts):
+            indices.extend(self._features(text))
+            indptr[row + 1] = len(indices)
+        
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        logits = self.bias + np.bincount(rows, weights=self.weights[indices], minlength=len(texts))
+        return 1.0 / (1.0 + np.exp(-logits))
+    
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Toxicity probability for every text in the batch"""
+        keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+        scores = np.empty(len(texts))
+        missing: Dict[bytes, List[int]] = {}
+        
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self.cache.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    scores[i] = cached
+                    self.cache.move_to_end(key)
+            
+            self.cache_hits += len(texts) - sum(len(rows) for rows in missing.values())
+            self.cache_misses += len(missing)
+        
+        if missing:
+            fresh = self._score_uncached([texts[rows[0]] for rows in missing.values()])
+            for (key, rows), value in zip(missing.items(), fresh):
+                scores[rows] = value
+            with self._cache_lock:
+                for key, value in zip(missing, fresh):
+                    self.cache[key] = float(value)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+        
+        return scores
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._cache_lock:
+            hits, lookups, cached = self.cache_hits, self.cache_hits + self.cache_misses, len(self.cache)
+        return {
+            'cached_scores': cached,
+            'cache_hit_rate': hits / lookups if lookups else 0.0
+        }
+
+class RollingToxicity:
+    """Per-topic share of toxic posts over a sliding time window of fixed-size buckets"""
+    
+    def __init__(self, window_seconds: int = 3600, bucket_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        # topic -> deque of [bucket_start, toxic_count, total_count]
+        self.buckets: Dict[str, Deque[List[float]]] = defaultdict(deque)
+    
+    def observe(self, topics: Sequence[str], scores: np.ndarray, timestamps: Sequence[datetime]) -> None:
+        """Fold a scored batch into the per-topic windows"""
+        toxic = scores >= TOXIC_PROBABILITY
+        grouped: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        for topic, is_toxic, ts in zip(topics, toxic, timestamps):
+            counts = grouped[(topic, int(ts.timestamp()) // self.bucket_seconds * self.bucket_seconds)]
+            counts[0] += int(is_toxic)
+            counts[1] += 1
+        
+        for (topic, start), (toxic_count, total) in sorted(grouped.items(), key=lambda item: item[0][1]):
+            window = self.buckets[topic]
+            if window and window[-1][0] == start:
+                window[-1][1] += toxic_count
+                window[-1][2] += total
+            elif not window or start > window[-1][0]:
+                window.append([start, toxic_count, total])
+            else:
+                # Late data for an older bucket
+                for bucket in window:
+                    if bucket[0] == start:
+                        bucket[1] += toxic_count
+                        bucket[2] += total
+                        break
+    
+    def level(self, topic: str, now: Optional[datetime] = None) -> float:
+        """Share of toxic posts for `topic` within the window (0 if no posts)"""
+        window = self.buckets.get(topic)
+        if not window:
+            return 0.0
+        horizon = (now or datetime.now()).timestamp() - self.window_seconds
+        while window and window[0][0] + self.bucket_seconds <= horizon:
+            window.popleft()
+        total = sum(bucket[2] for bucket in window)
+        return sum(bucket[1] for bucket in window) / total if total else 0.0
+    
+    def levels(self, now: Optional[datetime] = None) -> Dict[str, float]:
+        return {topic: self.level(topic, now) for topic in list(self.buckets)}
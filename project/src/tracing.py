@@ -0,0 +1,148 @@
+import threading
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Sequence
+
+# HDR-style bucketing: 64 linear sub-buckets per power of two keeps every
+# recorded value within 1/64 (~1.6%) of its bucket's midpoint
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# Values above ~18 minutes are clamped into the top bucket
+MAX_TRACKABLE_NS = (1 << 40) - 1
+
+DEFAULT_PERCENTILES = (50.0, 95.0, 99.0)
+
+def _bucket_index(value: int) -> int:
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKETS + (value >> shift)
+
+_BUCKETS = _bucket_index(MAX_TRACKABLE_NS) + 1
+
+def _bucket_value(index: int) -> int:
+    """Midpoint of the values that map to `index`"""
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift, sub = divmod(index, SUB_BUCKETS)
+    shift -= 1
+    sub += SUB_BUCKETS
+    return (sub << shift) + (1 << shift) // 2
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with HDR-style log-linear buckets
+    
+    Recording is a bit_length and a list increment; count, mean, max and
+    percentiles are all read back from the ~2k buckets, so any two histograms
+    merge by adding counts.
+    """
+    
+    __slots__ = ('counts',)
+    
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+    
+    def record(self, value_ns: int) -> None:
+        self.counts[_bucket_index(min(value_ns, MAX_TRACKABLE_NS))] += 1
+    
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+    
+    def percentiles(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> List[int]:
+        """Recorded values (ns) at each percentile, in one pass over the buckets"""
+        total = self.total
+        if not total:
+            return [0] * len(percentiles)
+        targets = sorted((max(1, -(-p * total // 100)), i) for i, p in enumerate(percentiles))
+        results = [0] * len(percentiles)
+        seen, t = 0, 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while t < len(targets) and seen >= targets[t][0]:
+                results[targets[t][1]] = _bucket_value(index)
+                t += 1
+            if t == len(targets):
+                break
+        return results
+    
+    def mean_ns(self) -> float:
+        total = self.total
+        return sum(_bucket_value(i) * c for i, c in enumerate(self.counts) if c) / total if total else 0.0
+    
+    def max_ns(self) -> int:
+        return next((_bucket_value(i) for i in range(_BUCKETS - 1, -1, -1) if self.counts[i]), 0)
+    
+    def merge(self, other: 'LatencyHistogram') -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+class Span:
+    """Times one stage from __enter__ to __exit__; `duration_ns` is set on exit
+    
+    On exit the duration is also stored in `last` under `stage`, so "last run"
+    readouts only ever see completed spans.
+    """
+    
+    __slots__ = ('counts', 'stage', 'last', 'start', 'duration_ns')
+    
+    def __init__(self, histogram: LatencyHistogram, stage: str, last: Dict[str, int]):
+        self.counts = histogram.counts
+        self.stage = stage
+        self.last = last
+    
+    def __enter__(self) -> 'Span':
+        self.start = perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_ns = duration = perf_counter_ns() - self.start
+        self.last[self.stage] = duration
+        # LatencyHistogram.record inlined: this is the per-span hot path
+        if duration > MAX_TRACKABLE_NS:
+            duration = MAX_TRACKABLE_NS
+        shift = duration.bit_length() - SUB_BUCKET_BITS - 1
+        self.counts[shift * SUB_BUCKETS + (duration >> shift) if shift > 0 else duration] += 1
+
+class Tracer:
+    """Named-stage spans aggregated into one latency histogram per stage
+    
+    Histograms are created on first use and never locked on the hot path: a
+    span costs two perf_counter_ns calls and a bucket increment. Concurrent
+    reruns can at worst lose an increment, which only nudges a percentile.
+    Each stage also remembers its latest completed duration for "last run"
+    readouts.
+    """
+    
+    def __init__(self, stages: Sequence[str] = ()):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in stages}
+        self.last: Dict[str, int] = {}
+    
+    def histogram(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+    
+    def span(self, stage: str) -> Span:
+        histogram = self.histograms.get(stage)
+        return Span(histogram if histogram is not None else self.histogram(stage), stage, self.last)
+    
+    def summary(self, stages: Optional[Sequence[str]] = None,
+                percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, Any]]:
+        """Per-stage count, mean, last and percentile latencies, in milliseconds"""
+        summary = {}
+        for stage in stages or list(self.histograms):
+            histogram = self.histogram(stage)
+            values = histogram.percentiles(percentiles)
+            summary[stage] = {
+                'count': histogram.total,
+                'mean_ms': histogram.mean_ns() / 1e6,
+                'last_ms': self.last.get(stage, 0) / 1e6,
+                'max_ms': histogram.max_ns() / 1e6,
+                **{f"p{p:g}_ms": value / 1e6 for p, value in zip(percentiles, values)}
+            }
+        return summary
@@ -0,0 +1,230 @@
+import heapq
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Channels tracked per key in every window sketch
+POSTS, VIEWS, ENGAGEMENTS = 0, 1, 2
+CHANNELS = 3
+
+# Growth is capped so a key appearing from nothing doesn't report infinity
+MAX_GROWTH_RATE = 300.0
+
+# Below this much elapsed time the current window is too noisy to extrapolate
+MIN_WINDOW_FRACTION = 0.1
+
+class CountMinSketch:
+    """Count-Min sketch with several value channels sharing the same hash rows
+    
+    Estimates never undercount; overcount is bounded by total / width with
+    probability 1 - exp(-depth). Sketches with equal shape and seed merge by
+    addition.
+    """
+    
+    def __init__(self, width: int = 2048, depth: int = 4, channels: int = 1, seed: int = 0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = np.zeros((channels, depth, width), dtype=np.int64)
+        self._salts = np.arange(depth, dtype=np.int64)
+    
+    def _columns(self, keys: Sequence[str]) -> np.ndarray:
+        # Double hashing: h1 + i * h2 gives `depth` independent-enough rows from two crc32s
+        encoded = [key.encode('utf-8') for key in keys]
+        h1 = np.fromiter((zlib.crc32(k, self.seed) for k in encoded), dtype=np.int64, count=len(keys))
+        h2 = np.fromiter((zlib.crc32(k, self.seed + 0x9E3779B9) | 1 for k in encoded), dtype=np.int64, count=len(keys))
+        return (h1[None, :] + self._salts[:, None] * h2[None, :]) % self.width
+    
+    def add(self, keys: Sequence[str], values: np.ndarray) -> None:
+        """Add `values` (n x channels) for `keys` in one vectorized update"""
+        columns = self._columns(keys)
+        values = np.asarray(values, dtype=np.int64).reshape(len(keys), -1)
+        rows = np.broadcast_to(np.arange(self.depth)[:, None], columns.shape)
+        for channel in range(values.shape[1]):
+            np.add.at(self.table[channel], (rows, columns), values[:, channel])
+    
+    def estimate(self, keys: Sequence[str]) -> np.ndarray:
+        """Estimated totals (n x channels) for `keys`"""
+        if not keys:
+            return np.zeros((0, self.table.shape[0]), dtype=np.int64)
+        columns = self._columns(keys)
+        rows = np.arange(self.depth)[:, None]
+        return self.table[:, rows, columns].min(axis=1).T
+    
+    def merge(self, other: 'CountMinSketch') -> None:
+        self.table += other.table
+    
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+class SpaceSaving:
+    """Space-Saving heavy hitters: at most `k` counters, weighted updates
+    
+    A new key evicts the smallest counter and inherits its count as error,
+    so any key whose true count exceeds total / k is guaranteed to be kept.
+    """
+    
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        # Lazy min-heap of (count, key); stale entries are skipped on pop
+        self._heap: List[Tuple[int, Hashable]] = []
+    
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return key, count
+    
+    def add(self, key: Hashable, count: int = 1) -> None:
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.k:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            evicted, floor = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[key] = floor + count
+            self.errors[key] = floor
+        heapq.heappush(self._heap, (self.counts[key], key))
+        
+        # Keep the lazy heap from growing without bound
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lazy heap is derived from the counters and rebuilt on restore
+        return {'k': self.k, 'counts': self.counts, 'errors': self.errors}
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+    
+    def top(self, n: Optional[int] = None) -> List[Tuple[Hashable, int, int]]:
+        """(key, count, max overcount) for the largest counters"""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+class _Window:
+    def __init__(self, start: float, sketch: CountMinSketch, heavy: SpaceSaving):
+        self.start = start
+        self.sketch = sketch
+        self.heavy = heavy
+
+class TrendDetector:
+    """Sliding-window trend detection over an unbounded hashtag stream in fixed memory
+    
+    Each window holds a Count-Min sketch of posts, views and engagements per
+    key and a Space-Saving summary of its heaviest keys. Candidates are the
+    union of the windows' heavy hitters; their horizon totals, growth between
+    the two latest windows and peak window are read back from the sketches.
+    """
+    
+    def __init__(self, window_seconds: int = 300, windows: int = 12, width: int = 2048,
+                 depth: int = 4, top_k: int = 256, seed: int = 0):
+        self.window_seconds = window_seconds
+        self.max_windows = windows
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.seed = seed
+        self.windows: Deque[_Window] = deque()
+    
+    def window_start(self, ts: float) -> float:
+        return ts // self.window_seconds * self.window_seconds
+    
+    def _advance(self, ts: float) -> None:
+        start = self.window_start(ts)
+        if self.windows and start <= self.windows[-1].start:
+            return
+        
+        # Open every window up to `start`, so quiet windows count as zero rather than vanish
+        first = start - (self.max_windows - 1) * self.window_seconds
+        if self.windows:
+            first = max(first, self.windows[-1].start + self.window_seconds)
+        for window_start in np.arange(first, start + 1, self.window_seconds):
+            self.windows.append(_Window(
+                float(window_start),
+                CountMinSketch(self.width, self.depth, CHANNELS, self.seed),
+                SpaceSaving(self.top_k)
+            ))
+        while len(self.windows) > self.max_windows:
+            self.windows.popleft()
+    
+    def add(self, keys: Sequence[str], values: np.ndarray, timestamp: datetime) -> None:
+        """Ingest a micro-batch: per-key (posts, views, engagements) observed at `timestamp`"""
+        ts = timestamp.timestamp()
+        self._advance(ts)
+        window = self.windows[-1]
+        if ts < window.start:
+            # Late batch: credit the window it belongs to, if still retained
+            window = next((w for w in self.windows if w.start == self.window_start(ts)), None)
+            if window is None:
+                return
+        
+        values = np.asarray(values, dtype=np.int64).reshape(len(keys), CHANNELS)
+        window.sketch.add(keys, values)
+        for key, posts in zip(keys, values[:, POSTS]):
+            if posts:
+                window.heavy.add(key, int(posts))
+    
+    def top_trends(self, n: Optional[int] = 20, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Heaviest keys over the retained windows, ranked by views (every candidate when `n` is None)"""
+        if not self.windows:
+            return []
+        now_ts = (now or datetime.now()).timestamp()
+        self._advance(now_ts)
+        
+        candidates = list({key for window in self.windows for key, _, _ in window.heavy.top()})
+        if not candidates:
+            return []
+        
+        # windows x candidates x channels
+        per_window = np.stack([window.sketch.estimate(candidates) for window in self.windows])
+        totals = per_window.sum(axis=0)
+        
+        # Growth: current window's rate (extrapolated from elapsed time) vs the previous window
+        current, previous = per_window[-1, :, POSTS].astype(float), None
+        elapsed = (now_ts - self.windows[-1].start) / self.window_seconds
+        if len(self.windows) > 1:
+            previous = per_window[-2, :, POSTS].astype(float)
+            if elapsed < MIN_WINDOW_FRACTION and len(self.windows) > 2:
+                current, previous, elapsed = previous, per_window[-3, :, POSTS].astype(float), 1.0
+        if previous is None:
+            growth = np.zeros(len(candidates))
+        else:
+            rate = current / max(elapsed, MIN_WINDOW_FRACTION)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                growth = np.where(previous > 0, (rate / previous - 1) * 100, MAX_GROWTH_RATE)
+            growth = np.clip(growth, -100.0, MAX_GROWTH_RATE)
+        
+        peaks = per_window[:, :, POSTS].argmax(axis=0)
+        order = np.argsort(-totals[:, VIEWS])[:n]
+        
+        return [
+            {
+                'key': candidates[i],
+                'posts': int(totals[i, POSTS]),
+                'views': int(totals[i, VIEWS]),
+                'engagement_rate': float(totals[i, ENGAGEMENTS] / totals[i, VIEWS] * 100) if totals[i, VIEWS] else 0.0,
+                'growth_rate': float(growth[i]),
+                'peak_time': datetime.fromtimestamp(min(self.windows[peaks[i]].start + self.window_seconds / 2, now_ts))
+            }
+            for i in order
+        ]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'windows': len(self.windows),
+            'sketch_bytes': sum(window.sketch.nbytes for window in self.windows),
+            'heavy_hitters': sum(len(window.heavy.counts) for window in self.windows)
+        }
@@ -6,15 +6,20 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
+from typing import Any, Dict, Optional
 from src.mock_data import MockDataGenerator
 
-def create_heatmap():
-    """Create global trend heatmap using Folium"""
+def create_heatmap(locations=None, zoom=2, center=None):
+    """Create global trend heatmap using Folium
+    
+    `locations` are spatial bins from `generate_geographic_data(zoom)`; pass
+    the map's current zoom/center so bins match what is on screen.
+    """
     
     # Initialize map centered on world
     m = folium.Map(
-        location=[20, 0],
-        zoom_start=2,
+        location=center or [20, 0],
+        zoom_start=zoom,
         tiles=None
     )
     
@@ -27,8 +32,8 @@ def create_heatmap():
     ).add_to(m)
     
     # Generate location data
-    mock_gen = MockDataGenerator()
-    locations = mock_gen.generate_geographic_data()
+    if locations is None:
+        locations = MockDataGenerator().generate_geographic_data(zoom)
     
     # Add heatmap points
     for location in locations:
@@ -50,8 +55,9 @@ def create_heatmap():
             <div style='font-family: Arial; min-width: 200px;'>
                 <h4 style='color: #333; margin-bottom: 10px;'>{location['city']}</h4>
                 <p><strong>Trend Intensity:</strong> {location['intensity']}/100</p>
-                <p><strong>Active Topics:</strong> #{random.choice(['AIethics', 'ClimateAction', 'TechDebate'])}</p>
-                <p><strong>Engagement:</strong> {random.randint(10, 500)}K interactions</p>
+                <p><strong>Active Topics:</strong> {', '.join('#' + topic for topic in location['top_topics'])}</p>
+                <p><strong>Posts:</strong> {location['posts']:,} in the last hour</p>
+                <p><strong>Engagement:</strong> {location['engagement'] / 1000:,.1f}K interactions</p>
             </div>
             """,
             color=color,
@@ -134,11 +140,16 @@ def create_trend_radar(trends_data):
     
     return fig
 
-def create_sentiment_chart():
-    """Create real-time sentiment flow chart"""
+def create_sentiment_chart(history=None, hours: int = 12, platform: Optional[str] = None):
+    """Create real-time sentiment flow chart, from the history store when one is given"""
     
-    mock_gen = MockDataGenerator()
-    sentiment_data = mock_gen.generate_sentiment_timeline(hours=12)
+    sentiment_data = None
+    if history is not None:
+        now = datetime.now()
+        sentiment_data = history.timeline(now - timedelta(hours=hours), now, platform=platform)
+    if sentiment_data is None or sentiment_data.empty:
+        mock_gen = MockDataGenerator()
+        sentiment_data = mock_gen.generate_sentiment_timeline(hours=hours)
     
     fig = go.Figure()
     
@@ -199,34 +210,44 @@ def create_sentiment_chart():
     
     return fig
 
-def create_controversy_timeline(trend_topic: str):
-    """Create controversy evolution timeline"""
+def controversy_timeline_data(hours: int = 48, freq: str = '2h') -> pd.DataFrame:
+    """Generate controversy evolution data as whole columns"""
     
-    # Generate timeline data
-    hours = 48
     timestamps = pd.date_range(
         start=datetime.now() - timedelta(hours=hours),
         end=datetime.now(),
-        freq='2H'
+        freq=freq
     )
-    
-    controversy_scores = []
+    n = len(timestamps)
+    rng = np.random.default_rng()
     base_controversy = random.randint(40, 80)
     
-    for i, timestamp in enumerate(timestamps):
-        # Simulate controversy evolution with some events
-        noise = random.uniform(-10, 10)
-        
-        # Add some "events" that spike controversy
-        if i == len(timestamps) // 3:  # Event 1
-            spike = 20
-        elif i == 2 * len(timestamps) // 3:  # Event 2
-            spike = 15
-        else:
-            spike = 0
-        
-        score = min(100, max(0, base_controversy + noise + spike))
-        controversy_scores.append(score)
+    # Simulate controversy evolution with some "events" that spike controversy
+    noise = rng.uniform(-10, 10, n)
+    spikes = np.zeros(n)
+    # An empty range (hours <= 0) has no events; the frame keeps its columns
+    if n:
+        spikes[2 * n // 3] = 15  # Event 2
+        spikes[n // 3] = 20  # Event 1
+    
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'controversy': np.clip(base_controversy + noise + spikes, 0, 100)
+    })
+
+def create_controversy_timeline(trend_topic: str, hours: int = 48, history=None, platform: Optional[str] = None):
+    """Create controversy evolution timeline, from the history store when one is given"""
+    
+    timeline = None
+    if history is not None:
+        # About 24-48 points whatever the range
+        now = datetime.now()
+        timeline = history.timeline(now - timedelta(hours=hours), now, freq_hours=max(2, hours // 48),
+                                    topic=trend_topic, platform=platform)
+    if timeline is None or timeline.empty:
+        timeline = controversy_timeline_data(hours=hours)
+    timestamps = timeline['timestamp']
+    controversy_scores = timeline['controversy']
     
     fig = go.Figure()
     
@@ -268,22 +289,35 @@ def create_controversy_timeline(trend_topic: str):
     
     return fig
 
-def create_platform_comparison():
-    """Create platform engagement comparison"""
+def create_platform_comparison(platform_stats: Optional[Dict[str, Dict[str, Any]]] = None):
+    """Create platform engagement comparison, from per-platform rollup summaries when given"""
     
     platforms = ['Twitter', 'Reddit', 'TikTok', 'Instagram']
     metrics = ['Reach', 'Engagement', 'Controversy', 'Sentiment']
     
-    # Generate data
     data = []
-    for platform in platforms:
-        for metric in metrics:
-            value = random.randint(30, 95)
-            data.append({
-                'Platform': platform,
-                'Metric': metric,
-                'Value': value
-            })
+    if platform_stats:
+        # Everything on a 0-100 scale: reach and engagement rate relative to the leading platform
+        max_reach = max(stats['unique_authors'] for stats in platform_stats.values()) or 1
+        max_rate = max(stats['engagement_rate'] for stats in platform_stats.values()) or 1
+        for platform, stats in platform_stats.items():
+            values = {
+                'Reach': stats['unique_authors'] / max_reach * 100,
+                'Engagement': stats['engagement_rate'] / max_rate * 100,
+                'Controversy': stats['controversy'],
+                'Sentiment': (stats['sentiment_mean'] + 1) * 50
+            }
+            data.extend({'Platform': platform, 'Metric': metric, 'Value': round(values[metric], 1)} for metric in metrics)
+    else:
+        # Generate data
+        for platform in platforms:
+            for metric in metrics:
+                value = random.randint(30, 95)
+                data.append({
+                    'Platform': platform,
+                    'Metric': metric,
+                    'Value': value
+                })
     
     df = pd.DataFrame(data)
     
@@ -0,0 +1,38 @@
+import importlib
+from typing import Dict, List
+
+# Page registry: slug -> (menu label, bootstrap icon, module implementing render())
+# Page modules are imported only when selected, so a page never pays for
+# another page's heavy imports (plotly, folium, pandas, ...).
+PAGES: Dict[str, tuple] = {
+    'war-room': ("🌍 War Room", 'globe', 'views.war_room'),
+    'conflict': ("⚔️ Conflict Detector", 'lightning-charge', 'views.conflict_detector'),
+    'rag': ("🧠 RAG Engine", 'cpu', 'views.rag_engine'),
+    'alerts': ("🔔 Alert Center", 'bell', 'views.alert_center'),
+    'technical': ("⚙️ Technical", 'gear', 'views.technical')
+}
+
+
+def page_labels() -> List[str]:
+    """Menu labels in navigation order"""
+    return [label for label, _, _ in PAGES.values()]
+
+
+def page_icons() -> List[str]:
+    """Menu icons in navigation order"""
+    return [icon for _, icon, _ in PAGES.values()]
+
+
+def page_index(slug: str) -> int:
+    """Navigation index for a page slug, falling back to the first page"""
+    slugs = list(PAGES)
+    return slugs.index(slug) if slug in PAGES else 0
+
+
+def render_page(label: str) -> None:
+    """Import the selected page module on demand and render it"""
+    for page_label, _, module_name in PAGES.values():
+        if page_label == label:
+            importlib.import_module(module_name).render()
+            return
+    raise KeyError(f"Unknown page: {label}")
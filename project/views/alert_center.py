@@ -0,0 +1,94 @@
+from datetime import datetime
+import streamlit as st
+from views.components import get_alert_service, get_mock_generator
+
+# Alerts are stored durably and shared; this dashboard has a single owner
+ALERT_OWNER = 'default'
+MAX_NOTIFICATIONS_SHOWN = 50
+
+def _time_ago(moment: datetime) -> str:
+    seconds = int((datetime.now() - moment).total_seconds())
+    if seconds < 60:
+        return "Just now"
+    if seconds < 3600:
+        return f"{seconds // 60} minutes ago"
+    return f"{seconds // 3600} hours ago"
+
+def render():
+    st.markdown("## 🔔 Pro Alert System")
+    st.markdown("*Custom triggers and real-time notifications*")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### ➕ Create New Alert")
+        
+        alert_type = st.selectbox("Alert Type:", ["Controversy Score", "Sentiment Shift", "Viral Threshold", "Keyword Detection"])
+        trigger_value = st.slider("Trigger Value:", 0, 100, 80)
+        keywords = st.text_input("Keywords (comma-separated):", placeholder="AIethics, controversy, debate")
+        notification_method = st.multiselect("Notification Method:", ["Email", "SMS", "In-App", "Slack"])
+        
+        if st.button("🔔 Create Alert", type="primary"):
+            try:
+                get_alert_service().create_alert({
+                    'type': alert_type,
+                    'trigger': trigger_value,
+                    'keywords': keywords,
+                    'methods': notification_method,
+                    'status': 'Active',
+                    'created': datetime.now()
+                }, owner=ALERT_OWNER)
+                st.success("Alert created successfully!")
+            except ValueError as e:
+                st.warning(f"{e}. Delete an alert to create a new one.")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 📱 Notifications")
+        
+        # Evaluate the current trend feed against all active alerts; fired
+        # notifications are stored and handed to the delivery workers
+        service = get_alert_service()
+        service.process(get_mock_generator().generate_trending_topics())
+        notifications = service.recent_notifications(MAX_NOTIFICATIONS_SHOWN, owner=ALERT_OWNER)
+        if not notifications:
+            st.markdown("<small>No alerts have fired yet. Create an alert to start monitoring.</small>", unsafe_allow_html=True)
+        
+        for notif in notifications:
+            icon = '🚨' if notif['severity'] == 'danger' else '📈' if notif['severity'] == 'success' else '📊'
+            
+            st.markdown(f"""
+            <div class="alert-card">
+                <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
+                    <span style="font-size: 1.2rem; margin-right: 0.5rem;">{icon}</span>
+                    <span style="font-weight: 600; color: #e0e7ff;">{notif['title']}</span>
+                </div>
+                <div style="color: #94a3b8; margin-bottom: 0.5rem;">{notif['message']}</div>
+                <div style="color: #6b7280; font-size: 0.8rem;">{_time_ago(notif['time'])}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Active alerts
+    alerts = get_alert_service().list_alerts(owner=ALERT_OWNER)
+    if alerts:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### ⚡ Active Alerts")
+        
+        for alert in alerts:
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                st.markdown(f"**{alert['type']}** - {alert['keywords']}")
+                st.markdown(f"<small>Trigger: {alert['trigger']:g}% | Created: {alert['created'].strftime('%H:%M')}</small>", unsafe_allow_html=True)
+            with col2:
+                st.markdown(f"<span class='success'>● {alert['status']}</span>", unsafe_allow_html=True)
+            with col3:
+                if st.button("🗑️", key=f"delete_{alert['id']}"):
+                    get_alert_service().delete_alert(alert['id'])
+                    st.rerun()
+        
+        st.markdown('</div>', unsafe_allow_html=True)
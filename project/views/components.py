@@ -0,0 +1,97 @@
+import atexit
+import logging
+import os
+import re
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# Shared engines are created per page on first use and cached for the process.
+# The src imports live inside the factories so pages that don't need an engine
+# never import it (or its numpy/pandas dependencies).
+
+@st.cache_resource
+def get_mock_generator():
+    from src.mock_data import MockDataGenerator
+    mock_gen = MockDataGenerator()
+    mock_gen.restore_state(get_state_store())
+    return mock_gen
+
+@st.cache_resource
+def get_state_store():
+    """Write-ahead log and snapshots of the streaming pipeline, so a restart resumes instead of starting cold"""
+    from src.checkpoint import StateStore
+    store = StateStore()
+    atexit.register(store.close)
+    return store
+
+@st.cache_resource
+def get_conflict_detector():
+    from src.conflict_detector import ConflictDetector
+    return ConflictDetector(get_mock_generator())
+
+@st.cache_resource
+def get_rag_engine():
+    from src.rag_engine import RAGEngine
+    return RAGEngine(get_mock_generator())
+
+@st.cache_resource
+def get_metrics_server():
+    """This process's own Prometheus endpoint, when VIRALPULSE_METRICS_PORT is set; None otherwise, or if the bind fails (logged once)"""
+    from src.metrics import METRICS_PORT_ENV, REGISTRY, start_metrics_server
+    port = os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    try:
+        return start_metrics_server(REGISTRY, int(port))
+    except (OSError, ValueError) as e:
+        logger.warning("Not serving metrics on %s=%s: %s", METRICS_PORT_ENV, port, e)
+        return None
+
+@st.cache_resource
+def get_result_cache():
+    from src.result_cache import ResultCache
+    return ResultCache()
+
+@st.cache_resource
+def get_history_store():
+    """Parquet history fed by the live stream; an empty one is seeded in the background (see history_warming_up)"""
+    from src.history import HistoryStore
+    store = HistoryStore()
+    get_mock_generator().attach_history(store)
+    atexit.register(store.flush)
+    return store
+
+def history_warming_up() -> bool:
+    """True while an empty history store is still being seeded, so history charts are partial"""
+    get_history_store()
+    backfill = get_mock_generator().history_backfill
+    return backfill is not None and backfill.is_alive()
+
+@st.cache_resource
+def get_alert_service():
+    from src.alert_store import AlertStore
+    from src.alerting import AlertService
+    from src.dispatch import Dispatcher
+    store = AlertStore()
+    return AlertService(store, Dispatcher(store).start())
+
+def selected_platform():
+    """Sidebar platform filter as a pipeline partition name (None selects every platform)"""
+    platform = st.session_state.get('selected_platform', 'All')
+    return None if platform == 'All' else platform
+
+@st.cache_resource
+def get_css() -> str:
+    """Read and minify the theme stylesheet once per process"""
+    path = os.path.join(os.path.dirname(__file__), 'theme.css')
+    with open(path, encoding='utf-8') as f:
+        css = f.read()
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};:,])\s*', r'\1', css)
+    return f"<style>{css.strip()}</style>"
+
+def load_css():
+    """Inject the theme; Streamlit needs it on every rerun, but the string is built once"""
+    st.markdown(get_css(), unsafe_allow_html=True)
@@ -0,0 +1,120 @@
+import streamlit as st
+from src.visualizations import create_controversy_timeline
+from views.components import get_mock_generator, get_conflict_detector, get_history_store, history_warming_up, selected_platform
+from views.session import store_result, load_result
+
+# Controversy history ranges offered on the analysis, in hours
+HISTORY_WINDOWS = {"48 hours": 48, "7 days": 24 * 7, "30 days": 24 * 30, "90 days": 24 * 90}
+
+def render():
+    mock_gen = get_mock_generator()
+    conflict_detector = get_conflict_detector()
+    
+    st.markdown("## ⚔️ Conflict Detector™")
+    st.markdown("*Analyze opposing viewpoints and controversy patterns in real-time*")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 🎯 Select Trend")
+        
+        trends = mock_gen.generate_trending_topics(platform=selected_platform())
+        selected_trend = st.selectbox(
+            "Choose a trend to analyze:",
+            options=[f"#{trend['topic']}" for trend in trends],
+            key="conflict_trend"
+        )
+        
+        if st.button("🔍 Analyze Conflict", type="primary"):
+            trend_name = selected_trend.replace("#", "")
+            conflict_data = conflict_detector.analyze_conflict(trend_name)
+            store_result('conflict_analysis', conflict_data, request=('conflict', trend_name))
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        data = load_result('conflict_analysis')
+        if data is not None:
+            
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 📊 Opposition Analysis")
+            
+            # Viewpoint split
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"""
+                <div style="text-align: center; padding: 1rem; background: rgba(16, 185, 129, 0.1); border-radius: 8px; border: 1px solid rgba(16, 185, 129, 0.3);">
+                    <div style="font-size: 2rem; color: #10b981;">✅ {data['pro_percentage']}%</div>
+                    <div style="color: #94a3b8;">Supporting</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown(f"""
+                <div style="text-align: center; padding: 1rem; background: rgba(239, 68, 68, 0.1); border-radius: 8px; border: 1px solid rgba(239, 68, 68, 0.3);">
+                    <div style="font-size: 2rem; color: #ef4444;">❌ {data['con_percentage']}%</div>
+                    <div style="color: #94a3b8;">Opposing</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Controversy history from the Parquet store
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 📈 Controversy Evolution")
+            window = st.radio("History window", list(HISTORY_WINDOWS), horizontal=True, key="conflict_history_window")
+            timeline = create_controversy_timeline(data['topic'], hours=HISTORY_WINDOWS[window],
+                                                   history=get_history_store(), platform=selected_platform())
+            st.plotly_chart(timeline, use_container_width=True)
+            if history_warming_up():
+                st.caption("History is warming up: older days are still being seeded in the background.")
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Key quotes
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 💬 Key Influencer Quotes")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**🟢 Pro Viewpoint:**")
+                for quote in data['pro_quotes']:
+                    credibility_color = "success" if quote['credibility'] > 80 else "warning" if quote['credibility'] > 60 else "danger"
+                    st.markdown(f"""
+                    <div style="background: rgba(16, 185, 129, 0.1); padding: 1rem; border-radius: 8px; margin: 0.5rem 0;">
+                        <div style="font-style: italic;">"{quote['text']}"</div>
+                        <div style="margin-top: 0.5rem; font-size: 0.9rem;">
+                            <span style="color: #94a3b8;">@{quote['author']}</span>
+                            <span class="{credibility_color}" style="float: right;">🎯 {quote['credibility']}% credible</span>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+            
+            with col2:
+                st.markdown("**🔴 Con Viewpoint:**")
+                for quote in data['con_quotes']:
+                    credibility_color = "success" if quote['credibility'] > 80 else "warning" if quote['credibility'] > 60 else "danger"
+                    st.markdown(f"""
+                    <div style="background: rgba(239, 68, 68, 0.1); padding: 1rem; border-radius: 8px; margin: 0.5rem 0;">
+                        <div style="font-style: italic;">"{quote['text']}"</div>
+                        <div style="margin-top: 0.5rem; font-size: 0.9rem;">
+                            <span style="color: #94a3b8;">@{quote['author']}</span>
+                            <span class="{credibility_color}" style="float: right;">🎯 {quote['credibility']}% credible</span>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Historical parallels
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 📜 Historical Parallels")
+            for parallel in data['historical_parallels']:
+                st.markdown(f"""
+                <div style="background: rgba(139, 92, 246, 0.1); padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 4px solid #8b5cf6;">
+                    <div style="font-weight: 600; color: #e0e7ff;">{parallel['event']}</div>
+                    <div style="color: #94a3b8; font-size: 0.9rem; margin-top: 0.5rem;">{parallel['description']}</div>
+                    <div style="color: #8b5cf6; font-size: 0.9rem; margin-top: 0.5rem;">Similarity: {parallel['similarity']}%</div>
+                </div>
+                """, unsafe_allow_html=True)
+            st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,80 @@
+import contextlib
+import os
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+# Opt-in: VIRALPULSE_PROFILE=1 for every session, or ?profile=1 for one
+PROFILE_ENV = 'VIRALPULSE_PROFILE'
+PROFILER_KEY = '_rerun_profiler'
+
+def profiling_enabled() -> bool:
+    return os.environ.get(PROFILE_ENV) == '1' or st.query_params.get('profile') == '1'
+
+def begin_rerun() -> None:
+    """Start profiling this rerun if profiling is on for the session"""
+    if not profiling_enabled():
+        st.session_state.pop(PROFILER_KEY, None)
+        return
+    from src.profiling import RerunProfiler
+    profiler = st.session_state.get(PROFILER_KEY)
+    if profiler is None:
+        profiler = st.session_state[PROFILER_KEY] = RerunProfiler()
+    profiler.start_rerun(cprofile=st.session_state.pop('profile_cprofile_next', False))
+
+def section(name: str):
+    """Profile a block of the page as `name` (nested under any enclosing section); no-op when off"""
+    profiler = st.session_state.get(PROFILER_KEY)
+    return profiler.section(name) if profiler is not None else contextlib.nullcontext()
+
+def end_rerun() -> Optional[Dict[str, Any]]:
+    profiler = st.session_state.get(PROFILER_KEY)
+    return profiler.finish_rerun() if profiler is not None else None
+
+def render_panel(rerun: Dict[str, Any]) -> None:
+    """Debug sidebar panel: flame-style breakdown of the rerun that just finished"""
+    import plotly.graph_objects as go
+    
+    # Aggregate repeated sections by path; the rerun itself is the root
+    totals: Dict[str, Dict[str, float]] = {}
+    for s in rerun['sections']:
+        row = totals.setdefault(s['path'], {'wall_ms': 0.0, 'cpu_ms': 0.0, 'alloc_kb': 0.0, 'peak_kb': 0.0})
+        row['wall_ms'] += s['wall_ms']
+        row['cpu_ms'] += s['cpu_ms']
+        row['alloc_kb'] += s['alloc_kb']
+        row['peak_kb'] = max(row['peak_kb'], s['peak_kb'])
+    
+    paths = sorted(totals)
+    flame = go.Figure(go.Icicle(
+        ids=['rerun'] + paths,
+        labels=['rerun'] + [path.rsplit('/', 1)[-1] for path in paths],
+        parents=[''] + [path.rsplit('/', 1)[0] if '/' in path else 'rerun' for path in paths],
+        values=[rerun['total_ms']] + [totals[path]['wall_ms'] for path in paths],
+        branchvalues='total',
+        tiling=dict(orientation='v'),
+        hovertemplate='%{id}<br>%{value:.1f} ms wall<extra></extra>'
+    ))
+    flame.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(t=10, l=0, r=0, b=0),
+        height=320
+    )
+    
+    with st.sidebar.expander(f"🐞 Rerun Profile • {rerun['total_ms']:.0f} ms", expanded=True):
+        st.plotly_chart(flame, use_container_width=True)
+        st.dataframe(
+            [{'section': path, **{k: round(v, 1) for k, v in totals[path].items()}} for path in paths],
+            hide_index=True, use_container_width=True
+        )
+        
+        history = list(st.session_state[PROFILER_KEY].history)
+        if len(history) > 1:
+            st.caption("Recent reruns (ms): " + " · ".join(f"{r['total_ms']:.0f}" for r in history[-10:]))
+        
+        st.checkbox("Capture cProfile on next rerun", key='profile_cprofile_next')
+        if rerun['cprofile_path']:
+            with open(rerun['cprofile_path'], 'rb') as f:
+                st.download_button("⬇️ Download cProfile stats", f.read(),
+                                   file_name=os.path.basename(rerun['cprofile_path']))
+            st.caption(f"Saved to {rerun['cprofile_path']} • open with `python -m pstats` or snakeviz")
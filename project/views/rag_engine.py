@@ -0,0 +1,150 @@
+import asyncio
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+from views.components import get_rag_engine
+from views.session import store_result, load_result
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+def _generation_caption(stats) -> str:
+    if 'error' in stats:
+        return f"⚠️ No answer: {stats['error']}"
+    if stats['source'] == 'answer cache':
+        return (f"♻️ Reused the answer to a near-duplicate query (similarity {stats['similarity']:.2f}): "
+                f"“{stats['cached_query']}”")
+    return (f"⚡ {_ms(stats['ttft_seconds'])} to first token · {stats['tokens']} tokens at "
+            f"{stats['tokens_per_second']:.1f} tok/s · {stats['cached_tokens']}/{stats['prompt_tokens']} "
+            f"prompt tokens already cached · {stats['source']}")
+
+def render():
+    rag_engine = get_rag_engine()
+    
+    st.markdown("## 🧠 RAG Deep Dive Engine")
+    st.markdown("*Advanced retrieval-augmented generation for trend analysis*")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 🔍 Query Interface")
+        
+        query = st.text_input("Enter your analysis query:", placeholder="e.g., Analyze the cultural impact of #AIethics")
+        
+        if st.button("🚀 Generate Analysis", type="primary") and query:
+            from src.stages import StageTimeout
+            with st.spinner("Processing RAG pipeline..."):
+                try:
+                    analysis = asyncio.run(rag_engine.analyze_trend_async(query))
+                except StageTimeout as e:
+                    st.error(f"Analysis abandoned: {e}")
+                else:
+                    store_result('rag_analysis', analysis, request=('rag', query))
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Pipeline visualization
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### ⚙️ Pipeline Status")
+        
+        # Measured stage latencies across every analysis this process has run
+        pipeline = rag_engine.simulate_processing_pipeline()
+        for step in pipeline['steps']:
+            status = "✅" if step['status'] == 'completed' else "⏸️"
+            st.markdown(f"""
+            <div style="display: flex; justify-content: space-between; padding: 0.5rem; background: rgba(6, 182, 212, 0.1); border-radius: 6px; margin: 0.3rem 0;">
+                <span title="{step['details']}">{status} {step['name']}</span>
+                <span style="color: #06b6d4;">{_ms(step['p50'])} · {_ms(step['p95'])} · {_ms(step['p99'])}</span>
+            </div>
+            """, unsafe_allow_html=True)
+        st.markdown(f"<small>p50 · p95 · p99 over {pipeline['runs']} runs</small>", unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        analysis = load_result('rag_analysis')
+        if analysis is not None:
+            # Filled in after the other cards so they render while the answer streams
+            answer_card = st.container()
+            
+            # Step 1: Retrieved chunks
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 📚 Retrieved Chunks (Step 1)")
+            
+            for i, chunk in enumerate(analysis['chunks'][:5]):
+                st.markdown(f"""
+                <div style="background: rgba(30, 41, 59, 0.6); padding: 1rem; border-radius: 8px; margin: 0.5rem 0; border-left: 3px solid #6366f1;">
+                    <div style="display: flex; justify-content: between; align-items: center; margin-bottom: 0.5rem;">
+                        <span style="font-weight: 600; color: #e0e7ff;">Chunk {i+1}</span>
+                        <span style="color: #06b6d4; font-size: 0.9rem;">Relevance: {chunk['relevance']:.3f}</span>
+                    </div>
+                    <div style="color: #94a3b8; font-size: 0.9rem;">{chunk['text']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Step 2: Analysis
+            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+            st.markdown("### 🎯 Cultural Analysis (Step 2)")
+            
+            st.markdown(f"**Origin Summary:** {analysis['cultural_origin']}")
+            if analysis.get('degraded'):
+                st.caption(f"⏱️ Timed out and left at defaults: {', '.join(analysis['degraded'])}")
+            
+            # Sentiment pie chart
+            sentiment_fig = go.Figure(data=[go.Pie(
+                labels=['Positive', 'Neutral', 'Negative'],
+                values=analysis['sentiment_breakdown'],
+                marker_colors=['#10b981', '#6b7280', '#ef4444']
+            )])
+            sentiment_fig.update_layout(
+                template="plotly_dark",
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                title="Sentiment Distribution"
+            )
+            st.plotly_chart(sentiment_fig, use_container_width=True)
+            
+            if analysis['toxicity_alert']:
+                st.markdown(f"""
+                <div class="alert-card">
+                    ⚠️ <strong>Toxicity Alert:</strong> High levels of toxic content detected in discussions
+                    of {', '.join('#' + topic for topic in analysis['toxic_topics'])}.
+                </div>
+                """, unsafe_allow_html=True)
+            
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Step 3: Meme evolution (if applicable)
+            if analysis['meme_evolution']:
+                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                st.markdown("### 🎭 Meme Evolution Timeline (Step 3)")
+                
+                timeline_data = pd.DataFrame(analysis['meme_evolution'])
+                fig = px.line(timeline_data, x='date', y='popularity', 
+                             title="Meme Popularity Over Time",
+                             color_discrete_sequence=['#06b6d4'])
+                fig.update_layout(template="plotly_dark", paper_bgcolor='rgba(0,0,0,0)')
+                st.plotly_chart(fig, use_container_width=True)
+                
+                st.markdown('</div>', unsafe_allow_html=True)
+            
+            with answer_card:
+                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                st.markdown("### 💬 Answer")
+                if 'answer' in analysis:
+                    if analysis['answer']:
+                        st.markdown(analysis['answer'])
+                else:
+                    from src.generation import GenerationError
+                    try:
+                        st.write_stream(rag_engine.stream_answer(analysis))
+                    except GenerationError:
+                        pass
+                    # Keep the answer (or the failure) so reruns don't generate again
+                    store_result('rag_analysis', analysis, request=('rag', analysis['query']))
+                st.caption(_generation_caption(analysis['generation']))
+                st.markdown('</div>', unsafe_allow_html=True)
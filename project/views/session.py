@@ -0,0 +1,95 @@
+import sys
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional
+
+import streamlit as st
+
+from views.components import get_result_cache
+from views.profiler import PROFILER_KEY
+
+# Per-session memory budget. Analysis payloads live in the shared result cache
+# and alerts in the alert store; a session keeps only handles and selections.
+SESSION_BUDGET_BYTES = 256 * 1024
+
+# Result handle keys this session holds, oldest first
+RESULT_ORDER_KEY = '_result_order'
+
+# Selections a session gives up once its handles are gone and it is still over
+# budget; the pages fall back to their defaults
+EVICTABLE_SELECTIONS = ('map_center', 'map_zoom')
+
+def store_result(key: str, payload: Dict[str, Any], request: Optional[Hashable] = None) -> None:
+    """Put an analysis result in the shared cache and keep only its handle in the session
+    
+    `request` identifies what produced the result, so sessions repeating the
+    same request share one cached copy.
+    """
+    handle_key = f"{key}_handle"
+    st.session_state[handle_key] = get_result_cache().put(payload, request)
+    st.session_state[RESULT_ORDER_KEY] = [
+        k for k in st.session_state.get(RESULT_ORDER_KEY, []) if k != handle_key
+    ] + [handle_key]
+    enforce_budget(keep=handle_key)
+
+def enforce_budget(keep: Optional[str] = None) -> List[str]:
+    """Drop this session's oldest result handles, then optional selections, until it fits its budget
+    
+    The handle in `keep` (the result just stored) is never dropped. Returns
+    the session keys that were removed.
+    """
+    order = st.session_state.get(RESULT_ORDER_KEY, [])
+    dropped = []
+    for key in [k for k in order if k != keep] + list(EVICTABLE_SELECTIONS):
+        if not session_memory()['over_budget']:
+            break
+        if key in st.session_state:
+            del st.session_state[key]
+            dropped.append(key)
+    if dropped:
+        st.session_state[RESULT_ORDER_KEY] = [k for k in order if k not in dropped]
+    return dropped
+
+def load_result(key: str) -> Optional[Dict[str, Any]]:
+    """Resolve a session's result handle; None if absent or evicted"""
+    handle = st.session_state.get(f"{key}_handle")
+    result = get_result_cache().get(handle)
+    if handle is not None and result is None:
+        # Evicted from the shared cache: drop the dangling handle
+        del st.session_state[f"{key}_handle"]
+    return result
+
+def _deep_size(obj: Any, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+def session_memory() -> Dict[str, Any]:
+    """Approximate bytes held by this session, plus the shared bytes its handles point at
+    
+    Both count toward the budget. The opt-in rerun profiler is left out: it is
+    a debugging aid, not something the session should be trimmed for.
+    """
+    seen = set()
+    own_bytes = sum(
+        _deep_size(value, seen) for key, value in st.session_state.to_dict().items() if key != PROFILER_KEY
+    )
+    
+    cache = get_result_cache()
+    referenced_bytes = sum(
+        cache.size_of(value)
+        for key, value in st.session_state.to_dict().items()
+        if key.endswith('_handle') and isinstance(value, str)
+    )
+    
+    return {
+        'session_bytes': own_bytes,
+        'referenced_bytes': referenced_bytes,
+        'budget_bytes': SESSION_BUDGET_BYTES,
+        'over_budget': own_bytes + referenced_bytes > SESSION_BUDGET_BYTES
+    }
@@ -0,0 +1,241 @@
+import os
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import pandas as pd
+from datetime import datetime
+from src.metrics import (REGISTRY, RAG_LATENCY, RAG_QUERIES, CONFLICT_LATENCY, CONFLICT_ANALYSES,
+                         CACHE_HITS, CACHE_MISSES, RERUN_LATENCY, STATE_RECOVERY_SECONDS, STATE_WAL_BYTES,
+                         STATE_SNAPSHOTS, STATE_SNAPSHOT_SECONDS, LLM_FIRST_TOKEN, METRICS_PORT_ENV)
+from views.components import get_metrics_server, get_result_cache
+from views.session import session_memory
+
+# Live charts cover this much recent history, in one-minute bins
+PERFORMANCE_WINDOW_MINUTES = 60
+
+def _series(metric, since: float) -> pd.Series:
+    """A metric's recent ring-buffer samples as a local-time series"""
+    timestamps, values = metric.recent.samples(since)
+    return pd.Series(values, index=pd.DatetimeIndex([datetime.fromtimestamp(t) for t in timestamps]), dtype=float)
+
+def _per_minute(metric, since: float) -> pd.Series:
+    return _series(metric, since).resample('1min').sum()
+
+def _uptime(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}h {rest // 60}m" if hours else f"{rest // 60}m {rest % 60}s"
+
+def render():
+    st.markdown("## ⚙️ Technical Showcase")
+    st.markdown("*Performance metrics and system architecture*")
+    
+    # Benchmark dashboard
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        rag_p50 = RAG_LATENCY.quantiles((0.5,))[0.5]
+        st.markdown(f"""
+        <div class="tech-metric">
+            <div class="metric-value">{f"{rag_p50:.2f}s" if RAG_LATENCY.count else "–"}</div>
+            <div class="metric-label">RAG p50 Latency</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        lookups = CACHE_HITS.value + CACHE_MISSES.value
+        st.markdown(f"""
+        <div class="tech-metric">
+            <div class="metric-value">{f"{CACHE_HITS.value / lookups:.0%}" if lookups else "–"}</div>
+            <div class="metric-label">Result Cache Hit Rate</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        first_token_p50 = LLM_FIRST_TOKEN.quantiles((0.5,))[0.5]
+        st.markdown(f"""
+        <div class="tech-metric">
+            <div class="metric-value">{f"{first_token_p50:.2f}s" if LLM_FIRST_TOKEN.count else "–"}</div>
+            <div class="metric-label">First Token p50</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="tech-metric">
+            <div class="metric-value">{_uptime(REGISTRY.uptime())}</div>
+            <div class="metric-label">Uptime</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Architecture diagram
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 🏗️ System Architecture")
+    
+    # Create a technical flow diagram
+    flow_fig = go.Figure()
+    
+    # Add nodes
+    nodes = [
+        {"name": "Social Media APIs", "x": 1, "y": 4, "color": "#6366f1"},
+        {"name": "Data Ingestion", "x": 2, "y": 4, "color": "#8b5cf6"},
+        {"name": "Sentence Transformer", "x": 3, "y": 4, "color": "#06b6d4"},
+        {"name": "Chroma DB", "x": 4, "y": 4, "color": "#10b981"},
+        {"name": "RAG Pipeline", "x": 3, "y": 3, "color": "#f59e0b"},
+        {"name": "Conflict Detector", "x": 2, "y": 2, "color": "#ef4444"},
+        {"name": "Streamlit UI", "x": 3, "y": 1, "color": "#8b5cf6"}
+    ]
+    
+    for node in nodes:
+        flow_fig.add_trace(go.Scatter(
+            x=[node["x"]], y=[node["y"]], 
+            mode="markers+text",
+            marker=dict(size=40, color=node["color"]),
+            text=node["name"],
+            textposition="middle center",
+            showlegend=False
+        ))
+    
+    # Add connections
+    connections = [
+        (1, 4, 2, 4), (2, 4, 3, 4), (3, 4, 4, 4),
+        (3, 4, 3, 3), (3, 3, 2, 2), (3, 3, 3, 1), (2, 2, 3, 1)
+    ]
+    
+    for conn in connections:
+        flow_fig.add_trace(go.Scatter(
+            x=[conn[0], conn[2]], y=[conn[1], conn[3]],
+            mode="lines",
+            line=dict(color="rgba(148, 163, 184, 0.5)", width=2),
+            showlegend=False
+        ))
+    
+    flow_fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        xaxis=dict(visible=False),
+        yaxis=dict(visible=False),
+        height=300,
+        title="Data Flow Architecture"
+    )
+    
+    st.plotly_chart(flow_fig, use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Code snippet
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 💻 Conflict Detection Algorithm")
+    
+    code = """
+def detect_conflict(trend):
+    # Get embeddings for all posts
+    cluster_embeddings = sentence_transformer(posts)
+    
+    # Use DBSCAN for density-based opposition grouping
+    pro, con = dbscan_clustering(cluster_embeddings)
+    
+    # Calculate controversy score
+    controversy_score = (len(con) / (len(pro) + 1e-9)) * sentiment_variance(pro, con)
+    
+    # Extract key quotes from each cluster
+    key_quotes_pro = extract_representative_quotes(pro)
+    key_quotes_con = extract_representative_quotes(con)
+    
+    return {
+        'controversy_score': controversy_score,
+        'pro_quotes': key_quotes_pro,
+        'con_quotes': key_quotes_con,
+        'pro_percentage': len(pro) / (len(pro) + len(con)) * 100,
+        'con_percentage': len(con) / (len(pro) + len(con)) * 100
+    }
+    """
+    
+    st.code(code, language="python")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Performance over time
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 📈 Performance Metrics")
+    
+    # Live data from the in-process metrics registry
+    since = datetime.now().timestamp() - PERFORMANCE_WINDOW_MINUTES * 60
+    fig = make_subplots(
+        rows=3, cols=1,
+        subplot_titles=('Latency (seconds)', 'Cache Hit Rate', 'Throughput (requests/min)'),
+        vertical_spacing=0.1
+    )
+    
+    for metric, name, color in ((RERUN_LATENCY, 'Rerun', '#8b5cf6'), (RAG_LATENCY, 'RAG query', '#6366f1'),
+                                (CONFLICT_LATENCY, 'Conflict analysis', '#ef4444')):
+        latency = _series(metric, since)
+        fig.add_trace(go.Scatter(x=latency.index, y=latency.values, name=name, mode='markers',
+                                 marker_color=color), row=1, col=1)
+    
+    hits, misses = _per_minute(CACHE_HITS, since), _per_minute(CACHE_MISSES, since)
+    lookups = hits.add(misses, fill_value=0)
+    hit_rate = hits.reindex(lookups.index, fill_value=0) / lookups.where(lookups > 0)
+    fig.add_trace(go.Scatter(x=hit_rate.index, y=hit_rate.values, name='Hit rate',
+                             line_color='#10b981'), row=2, col=1)
+    
+    for metric, name, color in ((RAG_QUERIES, 'RAG queries', '#06b6d4'), (CONFLICT_ANALYSES, 'Conflict analyses', '#f59e0b')):
+        throughput = _per_minute(metric, since)
+        fig.add_trace(go.Bar(x=throughput.index, y=throughput.values, name=name, marker_color=color), row=3, col=1)
+    
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=500,
+        barmode='stack'
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    # Each process has its own registry: the API's /metrics doesn't include the dashboard's
+    metrics_server = get_metrics_server()
+    exposition = (
+        f"Prometheus: GET http://{metrics_server.server_address[0]}:{metrics_server.server_address[1]}/metrics"
+        if metrics_server is not None
+        else f"{METRICS_PORT_ENV}={os.environ[METRICS_PORT_ENV]} could not be bound, see the server log"
+        if os.environ.get(METRICS_PORT_ENV)
+        else "set VIRALPULSE_METRICS_PORT to expose these to Prometheus (the API's /metrics covers only the API process)"
+    )
+    st.caption(
+        f"Last {PERFORMANCE_WINDOW_MINUTES} minutes of this server process • "
+        f"{int(RAG_QUERIES.value)} RAG queries, {int(CONFLICT_ANALYSES.value)} conflict analyses, "
+        f"{RERUN_LATENCY.count} reruns • {exposition}"
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Durability of the streaming pipeline's in-memory state
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 💾 Engine State")
+    if STATE_RECOVERY_SECONDS.recent.written:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Startup Recovery", f"{STATE_RECOVERY_SECONDS.value * 1000:.0f} ms")
+        col2.metric("Log Since Snapshot", f"{STATE_WAL_BYTES.value / 1024 ** 2:.1f} MB")
+        col3.metric("Snapshots Written", f"{int(STATE_SNAPSHOTS.value)}")
+        if STATE_SNAPSHOT_SECONDS.count:
+            st.caption(f"Snapshot capture and write p95: {STATE_SNAPSHOT_SECONDS.quantiles((0.95,))[0.95] * 1000:.0f} ms")
+    else:
+        st.caption("The streaming pipeline hasn't been started in this process yet")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Session and shared result-cache memory
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown("### 🧠 Session Memory")
+    
+    memory = session_memory()
+    cache_stats = get_result_cache().stats()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("This Session", f"{(memory['session_bytes'] + memory['referenced_bytes']) / 1024:.1f} KB",
+                delta="over budget" if memory['over_budget'] else None, delta_color="inverse")
+    col2.metric("Session Budget", f"{memory['budget_bytes'] / 1024:.0f} KB")
+    col3.metric("Shared Results", f"{cache_stats['entries']} / {cache_stats['bytes'] / 1024:.1f} KB")
+    col4.metric("Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    
+    st.caption(
+        f"Referenced by this session: {memory['referenced_bytes'] / 1024:.1f} KB • "
+        f"Repeat requests sharing an entry: {cache_stats['replaced']} • Evictions: {cache_stats['evictions']}"
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,123 @@
+import streamlit as st
+from streamlit_folium import st_folium
+from src.visualizations import create_heatmap, create_trend_radar, create_sentiment_chart, create_platform_comparison
+from views.components import get_history_store, get_mock_generator, history_warming_up, selected_platform
+from views.profiler import section
+
+def _compact(n: int) -> str:
+    for divisor, suffix in ((1_000_000_000, 'B'), (1_000_000, 'M'), (1_000, 'K')):
+        if n >= divisor:
+            return f"{n / divisor:.1f}{suffix}"
+    return str(n)
+
+def render():
+    mock_gen = get_mock_generator()
+    platform = selected_platform()
+    
+    st.markdown("## 🌍 Live Social Media War Room")
+    
+    # Top metrics row
+    with section('metrics'):
+        col1, col2, col3, col4 = st.columns(4)
+        # Last hour's distinct hashtags and post-weighted controversy, from the pipeline's rollups
+        rollup = mock_gen.rollup_metrics(hours=1, platform=platform)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{rollup['distinct_tags']:,}</div>
+                <div class="metric-label">Active Trends</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{rollup['controversy']:.0f}%</div>
+                <div class="metric-label">Controversy Score</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            reach = mock_gen.unique_participants(platform=platform)
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-value">{_compact(reach)}</div>
+                <div class="metric-label">Unique Reach (24h)</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col4:
+            st.markdown("""
+            <div class="metric-card">
+                <div class="metric-value pulse-animation">🔴 LIVE</div>
+                <div class="metric-label">Status</div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Main dashboard
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 🗺️ Global Trend Heatmap")
+        
+        with section('heatmap'):
+            # Create and display heatmap; bins follow the zoom the user last left the map at
+            zoom = st.session_state.get('map_zoom', 2)
+            center = st.session_state.get('map_center')
+            heatmap = create_heatmap(mock_gen.generate_geographic_data(zoom, platform=platform), zoom, center)
+            map_state = st_folium(heatmap, height=400, width=700, returned_objects=["zoom", "center"])
+            if map_state and map_state.get('zoom') and map_state['zoom'] != zoom:
+                st.session_state.map_zoom = map_state['zoom']
+                st.session_state.map_center = [map_state['center']['lat'], map_state['center']['lng']]
+                st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Trend DNA Radar
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 🧬 Trend DNA Radar")
+        with section('radar'):
+            trends_data = mock_gen.generate_trending_topics(platform=platform)
+            radar_chart = create_trend_radar(trends_data)
+            st.plotly_chart(radar_chart, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 🔥 Trending Now")
+        
+        with section('trending_cards'):
+            trends = mock_gen.generate_trending_topics(platform=platform)
+            for i, trend in enumerate(trends[:10]):
+                controversy_class = "controversy-high" if trend['controversy'] > 70 else "controversy-medium" if trend['controversy'] > 40 else "controversy-low"
+                platform_class = f"{trend['platform'].lower()}-theme"
+                
+                st.markdown(f"""
+                <div class="trend-card {platform_class}">
+                    <div class="trend-title">#{trend['topic']}</div>
+                    <div class="trend-stats">
+                        <span>👁️ {trend['views']:,}</span>
+                        <span class="{controversy_class}">🔥 {trend['controversy']}%</span>
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Real-time sentiment
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 😊 Sentiment Flow")
+        with section('sentiment_chart'):
+            sentiment_chart = create_sentiment_chart(get_history_store(), platform=platform)
+            st.plotly_chart(sentiment_chart, use_container_width=True)
+            if history_warming_up():
+                st.caption("History is warming up: older hours are still being seeded in the background.")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Platforms side by side over the last day
+        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+        st.markdown("### 📊 Cross-Platform Performance")
+        with section('platform_comparison'):
+            st.plotly_chart(create_platform_comparison(mock_gen.platform_metrics()), use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)